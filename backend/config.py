@@ -15,6 +15,25 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
     CLOUDINARY_UPLOAD_FOLDER: str = "fast_bites/restaurants"
+    # Delivery pricing (services/delivery_pricing.py). Fee curve is "km:fee" points,
+    # linear in between and continuing at the last segment's slope past the end.
+    DELIVERY_FEE_CURVE: str = "0:700,2:1000,5:1500,10:2500"
+    DELIVERY_FEE_STEP: float = 50.0
+    DELIVERY_FEE_FALLBACK: float = 1500.0  # when the customer or restaurant has no coordinates
+    DELIVERY_ROUTE_FACTOR: float = 1.3  # road distance / straight-line distance
+    DELIVERY_SPEED_KMH: float = 18.0
+    DELIVERY_DEFAULT_PREP_MINUTES: int = 15
+    DELIVERY_FALLBACK_TRAVEL_MINUTES: int = 10
+    # Cart storage (services/cart_store.py): "postgres" writes every change through;
+    # "memory" keeps active carts in process and writes them behind every
+    # CART_FLUSH_SECONDS. The memory store needs a single worker process: with
+    # WEB_CONCURRENCY (gunicorn's / uvicorn's worker count) above 1 it falls back to postgres.
+    CART_STORE: str = "postgres"
+    CART_FLUSH_SECONDS: float = 2.0
+    WEB_CONCURRENCY: int = 1
+    # Days of history kept in the catalog_changes log (services/catalog_changes.py);
+    # /menu/changes tokens older than this get 410 and sync again from a snapshot.
+    CATALOG_CHANGES_RETENTION_DAYS: int = 7
     # Set to "production" to disable localhost origins
     ENVIRONMENT: str = "development"
     
@@ -14,6 +14,8 @@ from routers import (
 )
 from database import init_db
 from config import settings
+from services.cart_store import cart_store
+from services.catalog_changes import catalog_change_pruner
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 log = logging.getLogger(__name__)
@@ -22,8 +24,12 @@ log = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     log.info("Starting Fast Bites API")
     init_db()
+    await cart_store.start()
+    await catalog_change_pruner.start()
     yield
     log.info("Shutting down")
+    await catalog_change_pruner.close()
+    await cart_store.close()
 
 app = FastAPI(title="Fast Bites API", lifespan=lifespan)
 
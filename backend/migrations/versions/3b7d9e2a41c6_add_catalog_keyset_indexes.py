@@ -0,0 +1,34 @@
+"""add (name, id) indexes for keyset paging of the catalog
+
+Revision ID: 3b7d9e2a41c6
+Revises: f1a8c2d4e6b0
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "3b7d9e2a41c6"
+down_revision: Union[str, None] = "f1a8c2d4e6b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_restaurants_name_id ON restaurants (name, id);
+
+    CREATE INDEX IF NOT EXISTS idx_menu_items_available_name_id
+      ON menu_items (name, id) WHERE is_available = true;
+    CREATE INDEX IF NOT EXISTS idx_menu_items_restaurant_available_name_id
+      ON menu_items (restaurant_id, name, id) WHERE is_available = true;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS idx_menu_items_restaurant_available_name_id;
+    DROP INDEX IF EXISTS idx_menu_items_available_name_id;
+    DROP INDEX IF EXISTS idx_restaurants_name_id;
+    """)
@@ -0,0 +1,31 @@
+"""covering index on restaurant_hours for SQL-side open-now filtering
+
+Revision ID: 5d1f3a7c9b24
+Revises: 8c2e4f6a1d93
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "5d1f3a7c9b24"
+down_revision: Union[str, None] = "8c2e4f6a1d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # open_now / sort=open_first probe today's row per restaurant; INCLUDE lets the
+    # window check (including overnight close <= open rows) run as an index-only scan.
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_restaurant_hours_open_lookup
+      ON restaurant_hours (restaurant_id, day_of_week)
+      INCLUDE (open_time, close_time, is_closed);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS idx_restaurant_hours_open_lookup;
+    """)
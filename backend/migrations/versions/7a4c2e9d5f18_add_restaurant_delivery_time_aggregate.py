@@ -0,0 +1,69 @@
+"""maintain per-restaurant delivery time sum/count from available menu items
+
+Revision ID: 7a4c2e9d5f18
+Revises: 5d1f3a7c9b24
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "7a4c2e9d5f18"
+down_revision: Union[str, None] = "5d1f3a7c9b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS delivery_time_sum bigint NOT NULL DEFAULT 0;
+    ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS delivery_time_count integer NOT NULL DEFAULT 0;
+
+    -- An item counts toward its restaurant's average while it is available and has a delivery_time.
+    CREATE OR REPLACE FUNCTION menu_items_delivery_time_aggregate() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP IN ('UPDATE', 'DELETE')
+         AND OLD.restaurant_id IS NOT NULL AND OLD.is_available IS TRUE AND OLD.delivery_time IS NOT NULL THEN
+        UPDATE restaurants
+          SET delivery_time_sum = delivery_time_sum - OLD.delivery_time,
+              delivery_time_count = delivery_time_count - 1
+          WHERE id = OLD.restaurant_id;
+      END IF;
+      IF TG_OP IN ('INSERT', 'UPDATE')
+         AND NEW.restaurant_id IS NOT NULL AND NEW.is_available IS TRUE AND NEW.delivery_time IS NOT NULL THEN
+        UPDATE restaurants
+          SET delivery_time_sum = delivery_time_sum + NEW.delivery_time,
+              delivery_time_count = delivery_time_count + 1
+          WHERE id = NEW.restaurant_id;
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS trg_menu_items_delivery_time_aggregate ON menu_items;
+    CREATE TRIGGER trg_menu_items_delivery_time_aggregate
+      AFTER INSERT OR DELETE OR UPDATE OF restaurant_id, is_available, delivery_time ON menu_items
+      FOR EACH ROW EXECUTE FUNCTION menu_items_delivery_time_aggregate();
+
+    UPDATE restaurants r
+      SET delivery_time_sum = coalesce(agg.total, 0),
+          delivery_time_count = coalesce(agg.n, 0)
+      FROM (
+        SELECT rr.id, sum(mi.delivery_time) AS total, count(mi.delivery_time) AS n
+        FROM restaurants rr
+        LEFT JOIN menu_items mi
+          ON mi.restaurant_id = rr.id AND mi.is_available IS TRUE AND mi.delivery_time IS NOT NULL
+        GROUP BY rr.id
+      ) agg
+      WHERE agg.id = r.id;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TRIGGER IF EXISTS trg_menu_items_delivery_time_aggregate ON menu_items;
+    DROP FUNCTION IF EXISTS menu_items_delivery_time_aggregate();
+    ALTER TABLE restaurants DROP COLUMN IF EXISTS delivery_time_count;
+    ALTER TABLE restaurants DROP COLUMN IF EXISTS delivery_time_sum;
+    """)
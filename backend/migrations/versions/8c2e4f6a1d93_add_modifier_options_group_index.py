@@ -0,0 +1,28 @@
+"""index menu_modifier_options by group for single-query modifier loading
+
+Revision ID: 8c2e4f6a1d93
+Revises: 3b7d9e2a41c6
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "8c2e4f6a1d93"
+down_revision: Union[str, None] = "3b7d9e2a41c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_modifier_options_group
+      ON menu_modifier_options (group_id, sort_order);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS idx_modifier_options_group;
+    """)
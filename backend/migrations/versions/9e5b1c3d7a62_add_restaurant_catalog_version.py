@@ -0,0 +1,134 @@
+"""per-restaurant catalog version bumped by menu, hours and restaurant writes
+
+Revision ID: 9e5b1c3d7a62
+Revises: 7a4c2e9d5f18
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "9e5b1c3d7a62"
+down_revision: Union[str, None] = "7a4c2e9d5f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Versions come from one sequence, so they only ever increase (also across
+    # restaurants) and a value is never reused after a rollback.
+    op.execute("""
+    CREATE SEQUENCE IF NOT EXISTS catalog_version_seq;
+    ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS catalog_version bigint NOT NULL
+      DEFAULT nextval('catalog_version_seq');
+
+    CREATE OR REPLACE FUNCTION bump_catalog_version(rid uuid) RETURNS void AS $$
+    BEGIN
+      IF rid IS NOT NULL THEN
+        UPDATE restaurants SET catalog_version = nextval('catalog_version_seq') WHERE id = rid;
+      END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    -- Direct edits of the restaurant row
+    CREATE OR REPLACE FUNCTION restaurants_catalog_version() RETURNS trigger AS $$
+    BEGIN
+      IF NEW.catalog_version IS NOT DISTINCT FROM OLD.catalog_version THEN
+        NEW.catalog_version := nextval('catalog_version_seq');
+      END IF;
+      RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION menu_items_catalog_version() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_catalog_version(OLD.restaurant_id);
+      END IF;
+      IF TG_OP = 'INSERT'
+         OR (TG_OP = 'UPDATE' AND NEW.restaurant_id IS DISTINCT FROM OLD.restaurant_id) THEN
+        PERFORM bump_catalog_version(NEW.restaurant_id);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION restaurant_hours_catalog_version() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_catalog_version(OLD.restaurant_id);
+      END IF;
+      IF TG_OP = 'INSERT'
+         OR (TG_OP = 'UPDATE' AND NEW.restaurant_id IS DISTINCT FROM OLD.restaurant_id) THEN
+        PERFORM bump_catalog_version(NEW.restaurant_id);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION menu_modifier_groups_catalog_version() RETURNS trigger AS $$
+    DECLARE
+      item_id uuid := CASE WHEN TG_OP = 'DELETE' THEN OLD.menu_item_id ELSE NEW.menu_item_id END;
+    BEGIN
+      PERFORM bump_catalog_version((SELECT restaurant_id FROM menu_items WHERE id = item_id));
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION menu_modifier_options_catalog_version() RETURNS trigger AS $$
+    DECLARE
+      gid uuid := CASE WHEN TG_OP = 'DELETE' THEN OLD.group_id ELSE NEW.group_id END;
+    BEGIN
+      PERFORM bump_catalog_version((
+        SELECT mi.restaurant_id
+        FROM menu_modifier_groups g JOIN menu_items mi ON mi.id = g.menu_item_id
+        WHERE g.id = gid
+      ));
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS trg_restaurants_catalog_version ON restaurants;
+    CREATE TRIGGER trg_restaurants_catalog_version
+      BEFORE UPDATE ON restaurants
+      FOR EACH ROW EXECUTE FUNCTION restaurants_catalog_version();
+
+    DROP TRIGGER IF EXISTS trg_menu_items_catalog_version ON menu_items;
+    CREATE TRIGGER trg_menu_items_catalog_version
+      AFTER INSERT OR UPDATE OR DELETE ON menu_items
+      FOR EACH ROW EXECUTE FUNCTION menu_items_catalog_version();
+
+    DROP TRIGGER IF EXISTS trg_restaurant_hours_catalog_version ON restaurant_hours;
+    CREATE TRIGGER trg_restaurant_hours_catalog_version
+      AFTER INSERT OR UPDATE OR DELETE ON restaurant_hours
+      FOR EACH ROW EXECUTE FUNCTION restaurant_hours_catalog_version();
+
+    DROP TRIGGER IF EXISTS trg_menu_modifier_groups_catalog_version ON menu_modifier_groups;
+    CREATE TRIGGER trg_menu_modifier_groups_catalog_version
+      AFTER INSERT OR UPDATE OR DELETE ON menu_modifier_groups
+      FOR EACH ROW EXECUTE FUNCTION menu_modifier_groups_catalog_version();
+
+    DROP TRIGGER IF EXISTS trg_menu_modifier_options_catalog_version ON menu_modifier_options;
+    CREATE TRIGGER trg_menu_modifier_options_catalog_version
+      AFTER INSERT OR UPDATE OR DELETE ON menu_modifier_options
+      FOR EACH ROW EXECUTE FUNCTION menu_modifier_options_catalog_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TRIGGER IF EXISTS trg_menu_modifier_options_catalog_version ON menu_modifier_options;
+    DROP TRIGGER IF EXISTS trg_menu_modifier_groups_catalog_version ON menu_modifier_groups;
+    DROP TRIGGER IF EXISTS trg_restaurant_hours_catalog_version ON restaurant_hours;
+    DROP TRIGGER IF EXISTS trg_menu_items_catalog_version ON menu_items;
+    DROP TRIGGER IF EXISTS trg_restaurants_catalog_version ON restaurants;
+    DROP FUNCTION IF EXISTS menu_modifier_options_catalog_version();
+    DROP FUNCTION IF EXISTS menu_modifier_groups_catalog_version();
+    DROP FUNCTION IF EXISTS restaurant_hours_catalog_version();
+    DROP FUNCTION IF EXISTS menu_items_catalog_version();
+    DROP FUNCTION IF EXISTS restaurants_catalog_version();
+    DROP FUNCTION IF EXISTS bump_catalog_version(uuid);
+    ALTER TABLE restaurants DROP COLUMN IF EXISTS catalog_version;
+    DROP SEQUENCE IF EXISTS catalog_version_seq;
+    """)
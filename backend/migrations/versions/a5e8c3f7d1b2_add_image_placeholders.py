@@ -0,0 +1,87 @@
+"""image placeholders (blurhash + dominant color) for restaurant and menu images
+
+Revision ID: a5e8c3f7d1b2
+Revises: f4d1b6c8e3a9
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "a5e8c3f7d1b2"
+down_revision: Union[str, None] = "f4d1b6c8e3a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Placeholders are computed after upload, keyed by the delivered URL, and copied onto
+    # the rows using that URL: by the worker for rows that already point at it, and by
+    # these triggers for rows that start pointing at it later. Catalog reads never join.
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS image_placeholders (
+      image_url text PRIMARY KEY,
+      blurhash text NOT NULL,
+      color text NOT NULL,
+      created_at timestamptz DEFAULT now()
+    );
+    ALTER TABLE image_placeholders ENABLE ROW LEVEL SECURITY;
+    DROP POLICY IF EXISTS image_placeholders_read ON image_placeholders;
+    CREATE POLICY image_placeholders_read ON image_placeholders FOR SELECT TO authenticated
+      USING (true);
+
+    ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS image_placeholder jsonb;
+    ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS logo_placeholder jsonb;
+    ALTER TABLE menu_items ADD COLUMN IF NOT EXISTS image_placeholder jsonb;
+
+    CREATE OR REPLACE FUNCTION image_placeholder_for(url text) RETURNS jsonb AS $$
+      SELECT jsonb_build_object('blurhash', p.blurhash, 'color', p.color)
+      FROM image_placeholders p WHERE p.image_url = url;
+    $$ LANGUAGE sql STABLE;
+
+    CREATE OR REPLACE FUNCTION restaurants_image_placeholders() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' OR NEW.image_url IS DISTINCT FROM OLD.image_url THEN
+        NEW.image_placeholder := image_placeholder_for(NEW.image_url);
+      END IF;
+      IF TG_OP = 'INSERT' OR NEW.logo_url IS DISTINCT FROM OLD.logo_url THEN
+        NEW.logo_placeholder := image_placeholder_for(NEW.logo_url);
+      END IF;
+      RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION menu_items_image_placeholder() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' OR NEW.image_url IS DISTINCT FROM OLD.image_url THEN
+        NEW.image_placeholder := image_placeholder_for(NEW.image_url);
+      END IF;
+      RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS trg_restaurants_image_placeholders ON restaurants;
+    CREATE TRIGGER trg_restaurants_image_placeholders
+      BEFORE INSERT OR UPDATE OF image_url, logo_url ON restaurants
+      FOR EACH ROW EXECUTE FUNCTION restaurants_image_placeholders();
+
+    DROP TRIGGER IF EXISTS trg_menu_items_image_placeholder ON menu_items;
+    CREATE TRIGGER trg_menu_items_image_placeholder
+      BEFORE INSERT OR UPDATE OF image_url ON menu_items
+      FOR EACH ROW EXECUTE FUNCTION menu_items_image_placeholder();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TRIGGER IF EXISTS trg_menu_items_image_placeholder ON menu_items;
+    DROP TRIGGER IF EXISTS trg_restaurants_image_placeholders ON restaurants;
+    DROP FUNCTION IF EXISTS menu_items_image_placeholder();
+    DROP FUNCTION IF EXISTS restaurants_image_placeholders();
+    DROP FUNCTION IF EXISTS image_placeholder_for(text);
+    ALTER TABLE menu_items DROP COLUMN IF EXISTS image_placeholder;
+    ALTER TABLE restaurants DROP COLUMN IF EXISTS logo_placeholder;
+    ALTER TABLE restaurants DROP COLUMN IF EXISTS image_placeholder;
+    DROP TABLE IF EXISTS image_placeholders;
+    """)
@@ -0,0 +1,63 @@
+"""cart_items options_hash with a unique line key for upserts
+
+Revision ID: b6f9d4e2a8c5
+Revises: a5e8c3f7d1b2
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "b6f9d4e2a8c5"
+down_revision: Union[str, None] = "a5e8c3f7d1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jsonb::text is canonical (sorted keys, fixed spacing), so equal options hash equally.
+    # Special instructions are part of the line: the same dish with different notes stays
+    # a separate line. Lines without menu_item_id never conflict (NULLs are distinct).
+    # Sauce and extras of servings are charged once per line, so adding to the quantity
+    # of such a line would drop a set of them: their options_hash is NULL, so every add
+    # of one inserts a new line, and existing ones are left out of the merge below.
+    op.execute("""
+    ALTER TABLE cart_items ADD COLUMN IF NOT EXISTS options_hash text
+      GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(options_json -> 'servings') = 'array'
+                  AND options_json -> 'servings' <> '[]'::jsonb THEN NULL
+             ELSE md5(options_json::text || '|' || coalesce(special_instructions, '')) END
+      ) STORED;
+
+    -- Merge existing duplicate lines into the oldest one before adding the unique index
+    UPDATE cart_items c SET quantity = d.total
+    FROM (
+      SELECT id, row_number() OVER w AS rn, sum(quantity) OVER w AS total
+      FROM cart_items
+      WHERE menu_item_id IS NOT NULL AND options_hash IS NOT NULL
+      WINDOW w AS (PARTITION BY user_id, restaurant_id, menu_item_id, options_hash
+                   ORDER BY created_at, id ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    ) d
+    WHERE c.id = d.id AND d.rn = 1 AND c.quantity <> d.total;
+
+    DELETE FROM cart_items c
+    USING (
+      SELECT id, row_number() OVER (
+               PARTITION BY user_id, restaurant_id, menu_item_id, options_hash ORDER BY created_at, id
+             ) AS rn
+      FROM cart_items
+      WHERE menu_item_id IS NOT NULL AND options_hash IS NOT NULL
+    ) d
+    WHERE c.id = d.id AND d.rn > 1;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_cart_items_line
+      ON cart_items (user_id, restaurant_id, menu_item_id, options_hash);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS uq_cart_items_line;
+    ALTER TABLE cart_items DROP COLUMN IF EXISTS options_hash;
+    """)
@@ -0,0 +1,81 @@
+"""catalog change log for /menu/changes incremental sync
+
+Revision ID: c4a7e1f9b350
+Revises: 9e5b1c3d7a62
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c4a7e1f9b350"
+down_revision: Union[str, None] = "9e5b1c3d7a62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per write: which entity changed, not what changed. The feed reads the
+    # current state of the touched entities, so repeated writes collapse naturally.
+    # txid lets the feed stop at the oldest in-flight transaction, so a change that
+    # commits late is never skipped by a client that has already synced past its id.
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS catalog_changes (
+      id bigserial PRIMARY KEY,
+      txid bigint NOT NULL DEFAULT (pg_current_xact_id()::text::bigint),
+      entity text NOT NULL,
+      entity_id uuid NOT NULL,
+      changed_at timestamptz NOT NULL DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS ix_catalog_changes_txid_id ON catalog_changes (txid, id);
+    -- Written by triggers and read by the backend only; no client policies
+    ALTER TABLE catalog_changes ENABLE ROW LEVEL SECURITY;
+
+    CREATE OR REPLACE FUNCTION log_catalog_change() RETURNS trigger AS $$
+    DECLARE
+      entity_col text := TG_ARGV[1];
+    BEGIN
+      IF TG_OP = 'UPDATE' AND TG_TABLE_NAME = 'restaurants'
+         AND (to_jsonb(NEW) - 'catalog_version') = (to_jsonb(OLD) - 'catalog_version') THEN
+        RETURN NULL;  -- only the version counter moved
+      END IF;
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(OLD) ->> entity_col)::uuid);
+      END IF;
+      IF TG_OP = 'INSERT'
+         OR (TG_OP = 'UPDATE' AND (to_jsonb(NEW) ->> entity_col) IS DISTINCT FROM (to_jsonb(OLD) ->> entity_col)) THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(NEW) ->> entity_col)::uuid);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS trg_restaurants_catalog_change ON restaurants;
+    CREATE TRIGGER trg_restaurants_catalog_change
+      AFTER INSERT OR UPDATE OR DELETE ON restaurants
+      FOR EACH ROW EXECUTE FUNCTION log_catalog_change('restaurant', 'id');
+
+    DROP TRIGGER IF EXISTS trg_menu_items_catalog_change ON menu_items;
+    CREATE TRIGGER trg_menu_items_catalog_change
+      AFTER INSERT OR UPDATE OR DELETE ON menu_items
+      FOR EACH ROW EXECUTE FUNCTION log_catalog_change('menu_item', 'id');
+
+    -- Hours are synced per restaurant (the whole week is replaced)
+    DROP TRIGGER IF EXISTS trg_restaurant_hours_catalog_change ON restaurant_hours;
+    CREATE TRIGGER trg_restaurant_hours_catalog_change
+      AFTER INSERT OR UPDATE OR DELETE ON restaurant_hours
+      FOR EACH ROW EXECUTE FUNCTION log_catalog_change('hours', 'restaurant_id');
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TRIGGER IF EXISTS trg_restaurant_hours_catalog_change ON restaurant_hours;
+    DROP TRIGGER IF EXISTS trg_menu_items_catalog_change ON menu_items;
+    DROP TRIGGER IF EXISTS trg_restaurants_catalog_change ON restaurants;
+    DROP FUNCTION IF EXISTS log_catalog_change();
+    DROP TABLE IF EXISTS catalog_changes;
+    """)
@@ -0,0 +1,32 @@
+"""GiST index on restaurant coordinates for radius search
+
+Revision ID: d2b8f4a6c1e7
+Revises: c4a7e1f9b350
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d2b8f4a6c1e7"
+down_revision: Union[str, None] = "c4a7e1f9b350"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /menu/restaurants/nearby filters on point(longitude, latitude) <@ box(...) before
+    # computing exact distances. Built-in point_ops, so no PostGIS/earthdistance needed;
+    # the expression must stay in step with services.geo.point_expr.
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_restaurants_location
+      ON restaurants USING gist (point(longitude, latitude))
+      WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS idx_restaurants_location;
+    """)
@@ -0,0 +1,81 @@
+"""catalog change log retention; skip derived restaurant columns
+
+Revision ID: d5a9c3e7b2f6
+Revises: b6f9d4e2a8c5
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d5a9c3e7b2f6"
+down_revision: Union[str, None] = "b6f9d4e2a8c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Old log rows are pruned (services.catalog_changes.prune_catalog_changes); the
+    # position of the newest pruned row is kept so readers behind it know to start over.
+    # Restaurant updates that only move columns kept by other triggers (catalog_version,
+    # and the delivery time aggregate on every menu item write) are not logged: the menu
+    # item write that caused them is.
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS catalog_change_log_state (
+      id boolean PRIMARY KEY DEFAULT true CHECK (id),
+      pruned_txid bigint NOT NULL DEFAULT 0,
+      pruned_id bigint NOT NULL DEFAULT 0
+    );
+    INSERT INTO catalog_change_log_state DEFAULT VALUES ON CONFLICT DO NOTHING;
+    ALTER TABLE catalog_change_log_state ENABLE ROW LEVEL SECURITY;
+
+    CREATE OR REPLACE FUNCTION log_catalog_change() RETURNS trigger AS $$
+    DECLARE
+      entity_col text := TG_ARGV[1];
+    BEGIN
+      IF TG_OP = 'UPDATE' AND TG_TABLE_NAME = 'restaurants'
+         AND (to_jsonb(NEW) - 'catalog_version' - 'delivery_time_sum' - 'delivery_time_count')
+           = (to_jsonb(OLD) - 'catalog_version' - 'delivery_time_sum' - 'delivery_time_count') THEN
+        RETURN NULL;  -- only derived columns moved
+      END IF;
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(OLD) ->> entity_col)::uuid);
+      END IF;
+      IF TG_OP = 'INSERT'
+         OR (TG_OP = 'UPDATE' AND (to_jsonb(NEW) ->> entity_col) IS DISTINCT FROM (to_jsonb(OLD) ->> entity_col)) THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(NEW) ->> entity_col)::uuid);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION log_catalog_change() RETURNS trigger AS $$
+    DECLARE
+      entity_col text := TG_ARGV[1];
+    BEGIN
+      IF TG_OP = 'UPDATE' AND TG_TABLE_NAME = 'restaurants'
+         AND (to_jsonb(NEW) - 'catalog_version') = (to_jsonb(OLD) - 'catalog_version') THEN
+        RETURN NULL;  -- only the version counter moved
+      END IF;
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(OLD) ->> entity_col)::uuid);
+      END IF;
+      IF TG_OP = 'INSERT'
+         OR (TG_OP = 'UPDATE' AND (to_jsonb(NEW) ->> entity_col) IS DISTINCT FROM (to_jsonb(OLD) ->> entity_col)) THEN
+        INSERT INTO catalog_changes (entity, entity_id)
+        VALUES (TG_ARGV[0], (to_jsonb(NEW) ->> entity_col)::uuid);
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TABLE IF EXISTS catalog_change_log_state;
+    """)
@@ -0,0 +1,30 @@
+"""index orders by restaurant and time for delivery prep-time estimates
+
+Revision ID: e3c9a5b7d2f4
+Revises: d2b8f4a6c1e7
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "e3c9a5b7d2f4"
+down_revision: Union[str, None] = "d2b8f4a6c1e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # services.delivery_pricing reads each restaurant's orders from the last few weeks
+    # (also used by the /menu/suggest popularity counts).
+    op.execute("""
+    CREATE INDEX IF NOT EXISTS idx_orders_restaurant_created
+      ON orders (restaurant_id, created_at DESC);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP INDEX IF EXISTS idx_orders_restaurant_created;
+    """)
@@ -0,0 +1,46 @@
+"""restaurant delivery zones with a GiST index for point lookups
+
+Revision ID: f4d1b6c8e3a9
+Revises: e3c9a5b7d2f4
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "f4d1b6c8e3a9"
+down_revision: Union[str, None] = "e3c9a5b7d2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Vertices are (x = longitude, y = latitude). A restaurant with no zones delivers
+    # everywhere. Lookups test area @> a zero-size polygon at the customer's location,
+    # which the GiST (R-tree over bounding boxes) index serves; polygon @> point is not
+    # indexable.
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS restaurant_delivery_zones (
+      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+      restaurant_id uuid NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE,
+      name text,
+      area polygon NOT NULL,
+      created_at timestamptz DEFAULT now()
+    );
+    CREATE INDEX IF NOT EXISTS idx_restaurant_delivery_zones_area
+      ON restaurant_delivery_zones USING gist (area);
+    CREATE INDEX IF NOT EXISTS idx_restaurant_delivery_zones_restaurant
+      ON restaurant_delivery_zones (restaurant_id);
+
+    ALTER TABLE restaurant_delivery_zones ENABLE ROW LEVEL SECURITY;
+    DROP POLICY IF EXISTS restaurant_delivery_zones_read ON restaurant_delivery_zones;
+    CREATE POLICY restaurant_delivery_zones_read ON restaurant_delivery_zones FOR SELECT TO authenticated
+      USING (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TABLE IF EXISTS restaurant_delivery_zones;
+    """)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Integer, Text
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Numeric, Integer, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from database import Base
 import uuid
@@ -19,5 +19,16 @@ class CartItem(Base):
     section = Column(String(16), nullable=True)
     options_json = Column(JSONB, nullable=False, server_default="{}")
     special_instructions = Column(Text, nullable=True)
+    # Line key with (user_id, restaurant_id, menu_item_id); unique, so adds upsert.
+    # NULL (never conflicts) for lines with servings, which are charged per line.
+    options_hash = Column(
+        Text,
+        Computed(
+            "CASE WHEN jsonb_typeof(options_json -> 'servings') = 'array'"
+            " AND options_json -> 'servings' <> '[]'::jsonb THEN NULL"
+            " ELSE md5(options_json::text || '|' || coalesce(special_instructions, '')) END",
+            persisted=True,
+        ),
+    )
     created_at = Column(DateTime(timezone=True), nullable=False)
     updated_at = Column(DateTime(timezone=True), nullable=False)
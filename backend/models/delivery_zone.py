@@ -0,0 +1,39 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import UserDefinedType
+from database import Base
+import uuid
+
+
+class Polygon(UserDefinedType):
+    """Postgres polygon; Python side is a list of (lat, lng) vertices (stored as x=lng, y=lat)."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "POLYGON"
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            return [(lng, lat) for lat, lng in value]
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None:
+                return None
+            return [(point[1], point[0]) for point in value]
+        return process
+
+
+class RestaurantDeliveryZone(Base):
+    __tablename__ = "restaurant_delivery_zones"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    restaurant_id = Column(UUID(as_uuid=True), ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False)
+    name = Column(Text, nullable=True)
+    # GiST-indexed; see services.delivery_zones for the point lookup
+    area = Column(Polygon, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Text, Float, Boolean, DateTime, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from database import Base
 import uuid
@@ -19,4 +19,6 @@ class MenuItem(Base):
     created_at = Column(DateTime(timezone=True), nullable=True)
     delivery_time = Column(Integer, nullable=True)  # in minutes
     category = Column(String(32), nullable=True)  # food | drinks
+    # {blurhash, color} for image_url, copied from image_placeholders by a trigger
+    image_placeholder = Column(JSONB, nullable=True)
 
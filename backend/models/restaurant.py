@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Text, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Float, Boolean, DateTime, ForeignKey, Integer, BigInteger, Sequence, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from database import Base
 import uuid
 
 
+catalog_version_seq = Sequence("catalog_version_seq", metadata=Base.metadata)
+
+
 class Restaurant(Base):
     __tablename__ = "restaurants"
 
@@ -31,3 +34,14 @@ class Restaurant(Base):
     business_verified = Column(Boolean, default=False, nullable=False)
     verification_submitted_at = Column(DateTime(timezone=True), nullable=True)
     verification_documents = Column(JSONB, nullable=True)
+
+    # {blurhash, color} for image_url / logo_url, copied from image_placeholders by a trigger
+    image_placeholder = Column(JSONB, nullable=True)
+    logo_placeholder = Column(JSONB, nullable=True)
+
+    # Maintained by a menu_items trigger: available items with a delivery_time
+    delivery_time_sum = Column(BigInteger, nullable=False, server_default=text("0"))
+    delivery_time_count = Column(Integer, nullable=False, server_default=text("0"))
+
+    # Bumped by triggers on any write to the restaurant, its menu, modifiers or hours
+    catalog_version = Column(BigInteger, nullable=False, server_default=catalog_version_seq.next_value())
@@ -4,37 +4,84 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from models.cart import CartItem
-from models.restaurant import Restaurant
 from schemas.cart import (
     CartListResponse,
-    RestaurantCartGroup,
     CartItemResponse,
     CartItemCreate,
     CartItemQuantityUpdate,
+    CartOpsRequest,
 )
+from services.cart_pricing import price_cart
+from services.cart_store import cart_store
+from services.cloudinary_storage import image_variants
+from services.delivery_pricing import quote_deliveries
+from services.fast_json import trusted_json_response
 from services.jwt_auth import get_current_user
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/cart", tags=["cart"])
 
 
+def item_payload(row: CartItem) -> dict:
+    """CartItemResponse fields as a plain dict (see services.fast_json)."""
+    return {
+        "id": str(row.id),
+        "name": row.name,
+        "description": row.description,
+        "price": float(row.unit_price),
+        "quantity": int(row.quantity),
+        "image": row.image_url,
+        "section": row.section,
+        "menu_item_id": str(row.menu_item_id) if row.menu_item_id else None,
+        "options_json": row.options_json or {},
+        "image_variants": image_variants(row.image_url),
+    }
+
+
 def item_to_response(row: CartItem) -> CartItemResponse:
-    return CartItemResponse(
-        id=str(row.id),
-        name=row.name,
-        description=row.description,
-        price=float(row.unit_price),
-        quantity=int(row.quantity),
-        image=row.image_url,
-        section=row.section,
-        menu_item_id=str(row.menu_item_id) if row.menu_item_id else None,
-        options_json=row.options_json or {},
+    return CartItemResponse(**item_payload(row))
+
+
+async def _cart_payload(db: AsyncSession, user_id: UUID) -> dict:
+    """CartListResponse-shaped dict; encoded without re-validation."""
+    rows = await cart_store.rows(db, user_id)
+    pricing = await price_cart(
+        db,
+        [row[0] for row in rows],
+        {row[0].restaurant_id: row[4] for row in rows},
     )
+    groups: dict[str, dict] = {}
+    for cart_row, rest_name, rest_logo, rest_image, _ in rows:
+        rid = str(cart_row.restaurant_id)
+        if rid not in groups:
+            groups[rid] = {
+                "id": rid,
+                "name": rest_name or "Restaurant",
+                "logo": rest_logo or rest_image,
+                "logo_variants": image_variants(rest_logo or rest_image),
+                "items": [],
+                "subtotal": pricing.subtotals[cart_row.restaurant_id],
+            }
+        line = pricing.lines[cart_row.id]
+        groups[rid]["items"].append(
+            {
+                **item_payload(cart_row),
+                "current_price": line.unit_price,
+                "price_status": line.status,
+            }
+        )
+    # One quote call for every restaurant in the cart
+    quotes = await quote_deliveries(db, user_id, (UUID(rid) for rid in groups))
+    for quote in quotes.values():
+        group = groups[str(quote.restaurant_id)]
+        group["delivery_fee"] = quote.fee
+        group["estimated_delivery_minutes"] = quote.minutes
+        group["serviceable"] = quote.serviceable
+    return {"orders": list(groups.values())}
 
 
 @router.get("", response_model=CartListResponse)
@@ -44,25 +91,7 @@ async def list_cart(
 ):
     try:
         user_id = UUID(current_user["id"])
-        result = await db.execute(
-            select(CartItem, Restaurant.name, Restaurant.logo_url, Restaurant.image_url)
-            .join(Restaurant, CartItem.restaurant_id == Restaurant.id)
-            .where(CartItem.user_id == user_id)
-            .order_by(CartItem.restaurant_id, CartItem.created_at)
-        )
-        rows = result.all()
-        groups: dict[str, RestaurantCartGroup] = {}
-        for cart_row, rest_name, rest_logo, rest_image in rows:
-            rid = str(cart_row.restaurant_id)
-            if rid not in groups:
-                groups[rid] = RestaurantCartGroup(
-                    id=rid,
-                    name=rest_name or "Restaurant",
-                    logo=rest_logo or rest_image,
-                    items=[],
-                )
-            groups[rid].items.append(item_to_response(cart_row))
-        return CartListResponse(orders=list(groups.values()))
+        return trusted_json_response(await _cart_payload(db, user_id))
     except Exception as e:
         log.error("List cart failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to load cart")
@@ -74,33 +103,37 @@ async def add_cart_item(
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """Add to the cart; the same item with the same options and notes adds to that line."""
     try:
         user_id = UUID(current_user["id"])
-        now = datetime.now(timezone.utc)
-        item = CartItem(
-            user_id=user_id,
-            restaurant_id=UUID(body.restaurant_id),
-            menu_item_id=UUID(body.menu_item_id) if body.menu_item_id else None,
-            name=body.name,
-            description=body.description,
-            unit_price=body.unit_price,
-            quantity=body.quantity,
-            image_url=body.image_url,
-            section=body.section,
-            options_json=body.options_json,
-            special_instructions=body.special_instructions,
-            created_at=now,
-            updated_at=now,
-        )
-        db.add(item)
-        await db.commit()
-        await db.refresh(item)
+        item = await cart_store.add(db, user_id, body, datetime.now(timezone.utc))
         return item_to_response(item)
     except Exception as e:
         log.error("Add cart item failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to add to cart")
 
 
+@router.post("/ops", response_model=CartListResponse)
+async def apply_cart_operations(
+    body: CartOpsRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Apply an ordered batch of add / set_quantity / remove ops in one transaction and
+    return the resulting cart, so clients can debounce +/- taps into one request.
+    """
+    try:
+        user_id = UUID(current_user["id"])
+        await cart_store.apply_ops(db, user_id, body.ops, datetime.now(timezone.utc))
+        return trusted_json_response(await _cart_payload(db, user_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        log.error("Cart ops failed: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to update cart")
+
+
 @router.patch("/items/{item_id}", response_model=CartItemResponse)
 async def update_cart_quantity(
     item_id: UUID,
@@ -110,16 +143,11 @@ async def update_cart_quantity(
 ):
     try:
         user_id = UUID(current_user["id"])
-        result = await db.execute(
-            select(CartItem).where(CartItem.id == item_id, CartItem.user_id == user_id)
+        item = await cart_store.set_quantity(
+            db, user_id, item_id, body.quantity, datetime.now(timezone.utc)
         )
-        item = result.scalar_one_or_none()
         if not item:
             raise HTTPException(status_code=404, detail="Cart item not found")
-        item.quantity = body.quantity
-        item.updated_at = datetime.now(timezone.utc)
-        await db.commit()
-        await db.refresh(item)
         return item_to_response(item)
     except HTTPException:
         raise
@@ -137,21 +165,11 @@ async def remove_one_menu_item_from_cart(
     """Remove one unit from the most recently added cart line for this menu item."""
     try:
         user_id = UUID(current_user["id"])
-        result = await db.execute(
-            select(CartItem)
-            .where(CartItem.user_id == user_id, CartItem.menu_item_id == menu_item_id)
-            .order_by(CartItem.updated_at.desc())
-            .limit(1)
+        removed = await cart_store.remove_unit(
+            db, user_id, menu_item_id, datetime.now(timezone.utc)
         )
-        item = result.scalar_one_or_none()
-        if not item:
+        if not removed:
             raise HTTPException(status_code=404, detail="Item not in cart")
-        if item.quantity > 1:
-            item.quantity -= 1
-            item.updated_at = datetime.now(timezone.utc)
-        else:
-            await db.delete(item)
-        await db.commit()
         return {"ok": True}
     except HTTPException:
         raise
@@ -168,12 +186,8 @@ async def delete_cart_item(
 ):
     try:
         user_id = UUID(current_user["id"])
-        result = await db.execute(
-            delete(CartItem).where(CartItem.id == item_id, CartItem.user_id == user_id)
-        )
-        if result.rowcount == 0:
+        if not await cart_store.remove_line(db, user_id, item_id):
             raise HTTPException(status_code=404, detail="Cart item not found")
-        await db.commit()
         return {"ok": True}
     except HTTPException:
         raise
@@ -190,13 +204,7 @@ async def delete_cart_restaurant(
 ):
     try:
         user_id = UUID(current_user["id"])
-        await db.execute(
-            delete(CartItem).where(
-                CartItem.user_id == user_id,
-                CartItem.restaurant_id == restaurant_id,
-            )
-        )
-        await db.commit()
+        await cart_store.remove_restaurant(db, user_id, restaurant_id)
         return {"ok": True}
     except Exception as e:
         log.error("Delete cart restaurant failed: %s", e)
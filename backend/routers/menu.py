@@ -1,27 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text, func
-from typing import List, Optional
+from sqlalchemy import and_, any_, bindparam, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, JSONB, UUID as PG_UUID
+from typing import List, Optional, Union
 from uuid import UUID
 from collections import defaultdict
+from datetime import datetime, time
+import zlib
 
 from database import get_db
 from models.restaurant import Restaurant
 from models.menu_item import MenuItem
 from models.restaurant_hours import RestaurantHours
-from schemas.menu import RestaurantResponse, MenuItemResponse, MenuItemWithRestaurant
+from schemas.menu import (
+    RestaurantResponse,
+    MenuItemResponse,
+    MenuItemWithRestaurant,
+    RestaurantPage,
+    MenuItemPage,
+    NearbyRestaurant,
+    NearbyRestaurantPage,
+)
 from schemas.menu_extras import (
     RestaurantHoursResponse,
     RestaurantHoursDay,
     MenuItemCategoryResponse,
     MenuItemModifiersResponse,
+    BulkModifiersResponse,
+    RestaurantStorefrontResponse,
     ModifierGroupResponse,
     ModifierOptionResponse,
+    CatalogChangesResponse,
+    MenuItemBatchResponse,
+    CatalogDeletions,
+    RestaurantHoursChange,
+    MenuSearchResponse,
+    MenuSuggestResponse,
+)
+from services.catalog_cache import (
+    CATALOG_VERSION_TTL_SECONDS,
+    LIST_TAG,
+    MENU_TTL_SECONDS,
+    RESTAURANT_TTL_SECONDS,
+    catalog_cache,
+    menu_item_cache,
+    restaurant_tag,
+)
+from services.catalog_changes import (
+    CatalogPositionExpired,
+    current_catalog_position,
+    read_catalog_changes,
+    read_catalog_snapshot,
+)
+from services.catalog_paging import decode_cursor, encode_cursor
+from services.cloudinary_storage import image_variants
+from services.delivery_zones import serves_location_clause
+from services.fast_json import encode_trusted, json_bytes_response, trusted_json_response
+from services.geo import bounding_boxes, distance_km_expr, within_box_clause
+from services.menu_search import menu_search
+from services.menu_suggest import menu_suggest
+from services.restaurant_hours_util import (
+    HoursRow,
+    ScheduleBatch,
+    compute_hours_display,
+    parse_hhmm,
+    to_app_tz,
 )
-from services.restaurant_hours_util import HoursRow, compute_hours_display
 
 router = APIRouter(prefix="/menu", tags=["menu"])
 
+MAX_BULK_IDS = 200
+MAX_BATCH_ITEMS = 300
+MAX_NEARBY_RADIUS_KM = 50
+MAX_NEARBY_PAGE = 100
+# Clients may keep catalog responses but must revalidate them (If-None-Match) before reuse
+CATALOG_CACHE_CONTROL = "no-cache"
+
 
 def _hours_rows_from_db(rows: list[RestaurantHours]) -> list[HoursRow]:
     return [
@@ -35,60 +89,194 @@ def _hours_rows_from_db(rows: list[RestaurantHours]) -> list[HoursRow]:
     ]
 
 
-async def _load_hours_by_restaurant(
-    db: AsyncSession, restaurant_ids: list[UUID]
-) -> dict[UUID, list[HoursRow]]:
-    if not restaurant_ids:
-        return {}
-    result = await db.execute(
-        select(RestaurantHours).where(RestaurantHours.restaurant_id.in_(restaurant_ids))
-    )
-    grouped: dict[UUID, list[HoursRow]] = defaultdict(list)
-    for h in result.scalars().all():
-        grouped[h.restaurant_id].append(
-            HoursRow(
-                day_of_week=h.day_of_week,
-                open_time=h.open_time,
-                close_time=h.close_time,
-                is_closed=bool(h.is_closed),
+def _hours_column():
+    """
+    The restaurant's hours as a JSON array of [day_of_week, open, close, is_closed],
+    correlated to Restaurant so it rides along in the same statement as the restaurant
+    rows (one round trip instead of a second query keyed on the ids).
+    """
+    h = RestaurantHours
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(func.json_build_array(h.day_of_week, h.open_time, h.close_time, h.is_closed)),
+                literal_column("'[]'::json"),
+                type_=JSON,
             )
         )
-    return grouped
+        .where(h.restaurant_id == Restaurant.id)
+        .scalar_subquery()
+        .label("hours")
+    )
 
 
-async def _load_avg_delivery_by_restaurant(
-    db: AsyncSession, restaurant_ids: list[UUID]
-) -> dict[UUID, int]:
-    if not restaurant_ids:
-        return {}
+def _hours_rows_from_json(days: list) -> list[HoursRow]:
+    return [
+        HoursRow(
+            day_of_week=day_of_week,
+            open_time=time.fromisoformat(open_time) if open_time else None,
+            close_time=time.fromisoformat(close_time) if close_time else None,
+            is_closed=bool(is_closed),
+        )
+        for day_of_week, open_time, close_time, is_closed in days
+    ]
+
+
+def _avg_delivery_minutes(r: Restaurant) -> Optional[int]:
+    if not r.delivery_time_count:
+        return None
+    return int(round(r.delivery_time_sum / r.delivery_time_count))
+
+
+async def _catalog_version(db: AsyncSession, restaurant_id: UUID) -> Optional[int]:
+    """restaurants.catalog_version, cached briefly so conditional requests skip the DB. None if unknown."""
+    version = catalog_cache.get(("catalog_version", restaurant_id))
+    if version is not None:
+        return version
     result = await db.execute(
-        select(
-            MenuItem.restaurant_id,
-            func.avg(MenuItem.delivery_time),
+        select(Restaurant.catalog_version).where(Restaurant.id == restaurant_id)
+    )
+    version = result.scalar_one_or_none()
+    _remember_catalog_version(restaurant_id, version)
+    return version
+
+
+def _remember_catalog_version(restaurant_id: UUID, version: Optional[int]) -> None:
+    if version is not None:
+        catalog_cache.set(
+            ("catalog_version", restaurant_id),
+            version,
+            ttl=CATALOG_VERSION_TTL_SECONDS,
+            tags=[restaurant_tag(restaurant_id)],
         )
+
+
+def _catalog_etag(restaurant_id: UUID, version: int, *extra) -> str:
+    """
+    Weak ETag for a restaurant-scoped response. `extra` carries parts of the payload that
+    change without a catalog write (open/closed status).
+    """
+    tag = f"{restaurant_id}-{version}"
+    if extra:
+        tag += "-" + format(zlib.crc32("|".join(map(str, extra)).encode()), "08x")
+    return f'W/"{tag}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == opaque for t in header.split(","))
+
+
+def _etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    response.headers.update(_etag_headers(etag))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_etag_headers(etag))
+
+
+def _keyset_mode(paging: str, cursor: Optional[str]) -> bool:
+    mode = paging.lower()
+    if mode not in ("offset", "cursor"):
+        raise HTTPException(status_code=400, detail="paging must be offset or cursor")
+    return mode == "cursor" or cursor is not None
+
+
+def _decode_name_id_cursor(cursor: str, size: int) -> list:
+    try:
+        values = decode_cursor(cursor, size)
+        if not isinstance(values[-2], str):
+            raise ValueError("Invalid cursor")
+        values[-1] = UUID(values[-1])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _after_cursor(query, name_col, id_col, cursor: Optional[str], open_expr=None):
+    """
+    Restrict query to rows sorting after the position encoded in cursor:
+    (name, id), or (is_open, name, id) when open restaurants are ordered first.
+    """
+    if not cursor:
+        return query
+    if open_expr is None:
+        last_name, last_id = _decode_name_id_cursor(cursor, 2)
+        return query.where(tuple_(name_col, id_col) > (last_name, last_id))
+
+    was_open, last_name, last_id = _decode_name_id_cursor(cursor, 3)
+    if not isinstance(was_open, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    after_in_group = tuple_(name_col, id_col) > (last_name, last_id)
+    if was_open:
+        return query.where(or_(~open_expr, and_(open_expr, after_in_group)))
+    return query.where(and_(~open_expr, after_in_group))
+
+
+def _open_now_clause(at: datetime):
+    """
+    SQL version of the open-now check in CompiledSchedule, for one APP_TZ instant.
+
+    Matches today's restaurant_hours row through the (restaurant_id, day_of_week)
+    index; overnight rows (close <= open) are open after open_time or before
+    close_time. Restaurants without any hours rows fall back to is_open; a NULL is_open
+    counts as closed, so the result is never NULL (it is sorted and negated for cursors).
+    """
+    now_t = at.time().replace(microsecond=0)
+    h = RestaurantHours
+    open_today = (
+        select(h.id)
         .where(
-            MenuItem.restaurant_id.in_(restaurant_ids),
-            MenuItem.delivery_time.isnot(None),
-            MenuItem.is_available == True,
+            h.restaurant_id == Restaurant.id,
+            h.day_of_week == at.weekday(),
+            h.is_closed == False,
+            h.open_time.isnot(None),
+            h.close_time.isnot(None),
+            or_(
+                and_(h.close_time > h.open_time, h.open_time <= now_t, h.close_time > now_t),
+                and_(h.close_time <= h.open_time, or_(h.open_time <= now_t, h.close_time > now_t)),
+            ),
         )
-        .group_by(MenuItem.restaurant_id)
+        .exists()
     )
-    out: dict[UUID, int] = {}
-    for rid, avg_val in result.all():
-        if rid is not None and avg_val is not None:
-            out[rid] = int(round(float(avg_val)))
-    return out
+    has_hours = select(h.id).where(h.restaurant_id == Restaurant.id).exists()
+    return or_(open_today, and_(~has_hours, Restaurant.is_open.is_(True)))
 
 
 def _to_restaurant_response(
     r: Restaurant,
     hours_rows: list[HoursRow],
-    avg_delivery: Optional[int],
+    now: Optional[datetime] = None,
 ) -> RestaurantResponse:
-    is_open_now, hours_status, operating_text = compute_hours_display(
-        hours_rows,
-        fallback_is_open=r.is_open,
+    display = compute_hours_display(hours_rows, fallback_is_open=r.is_open, now=now)
+    return _restaurant_response(r, display)
+
+
+def _to_restaurant_responses(rows, now: datetime) -> list[RestaurantResponse]:
+    """
+    Responses for (restaurant, hours json) rows of a listing; open status is evaluated
+    for the whole page at one clock reading (see ScheduleBatch).
+    """
+    batch = ScheduleBatch(
+        [_hours_rows_from_json(row[1]) for row in rows],
+        [row[0].is_open for row in rows],
     )
+    return [_restaurant_response(row[0], display) for row, display in zip(rows, batch.display(now))]
+
+
+def _restaurant_response(
+    r: Restaurant, display: tuple[Optional[bool], str, str]
+) -> RestaurantResponse:
+    is_open_now, hours_status, operating_text = display
     return RestaurantResponse(
         id=r.id,
         name=r.name,
@@ -96,72 +284,246 @@ def _to_restaurant_response(
         latitude=r.latitude,
         longitude=r.longitude,
         image_url=r.image_url,
+        logo_url=r.logo_url,
+        image_variants=image_variants(r.image_url),
+        logo_variants=image_variants(r.logo_url),
+        image_placeholder=r.image_placeholder,
+        logo_placeholder=r.logo_placeholder,
         rating=r.rating,
         is_open=r.is_open,
         created_at=r.created_at,
         is_open_now=is_open_now,
         hours_status=hours_status,
         operating_hours_text=operating_text,
-        avg_delivery_minutes=avg_delivery,
+        avg_delivery_minutes=_avg_delivery_minutes(r),
     )
 
 
-@router.get("/restaurants", response_model=List[RestaurantResponse])
+@router.get("/restaurants", response_model=Union[List[RestaurantResponse], RestaurantPage])
 async def get_restaurants(
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    paging: str = "offset",
+    open_now: bool = False,
+    sort: str = "name",
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all restaurants with live open/closed status from restaurant_hours."""
-    result = await db.execute(
-        select(Restaurant)
-        .order_by(Restaurant.name)
-        .limit(limit)
-        .offset(offset)
-    )
-    restaurants = result.scalars().all()
-    ids = [r.id for r in restaurants]
-    hours_map = await _load_hours_by_restaurant(db, ids)
-    delivery_map = await _load_avg_delivery_by_restaurant(db, ids)
-    return [
-        _to_restaurant_response(
-            r,
-            hours_map.get(r.id, []),
-            delivery_map.get(r.id),
+    """
+    Get all restaurants with live open/closed status from restaurant_hours.
+
+    paging=offset (legacy default) returns a plain list paged with limit/offset.
+    paging=cursor, or any ?cursor=, returns a RestaurantPage keyed on (name, id),
+    so every page is an index range scan no matter how deep.
+
+    open_now=true keeps only restaurants open right now; sort=open_first lists open
+    restaurants before closed ones. Both are evaluated in SQL so paging stays exact.
+
+    lat/lng (the delivery address) hide restaurants whose delivery zones exclude it.
+    """
+    if sort not in ("name", "open_first"):
+        raise HTTPException(status_code=400, detail="sort must be name or open_first")
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be given together")
+    keyset = _keyset_mode(paging, cursor)
+    cache_key = ("restaurants", limit, cursor if keyset else offset, keyset, open_now, sort, lat, lng)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    now = to_app_tz()
+    is_open_expr = _open_now_clause(now)
+    open_first = sort == "open_first" and not open_now
+    query = select(Restaurant, _hours_column())
+    if lat is not None:
+        query = query.where(serves_location_clause(Restaurant.id, lat, lng))
+    if open_now:
+        query = query.where(is_open_expr)
+    if open_first:
+        query = query.order_by(is_open_expr.desc(), Restaurant.name, Restaurant.id)
+    else:
+        query = query.order_by(Restaurant.name, Restaurant.id)
+    if keyset:
+        query = _after_cursor(
+            query,
+            Restaurant.name,
+            Restaurant.id,
+            cursor,
+            open_expr=is_open_expr if open_first else None,
+        ).limit(limit + 1)
+    else:
+        query = query.limit(limit).offset(offset)
+    result = await db.execute(query)
+    response = _to_restaurant_responses(result.all(), now)
+    if keyset:
+        next_cursor = None
+        if limit > 0 and len(response) > limit:
+            response = response[:limit]
+            last = response[-1]
+            if open_first:
+                next_cursor = encode_cursor(bool(last.is_open_now), last.name, last.id)
+            else:
+                next_cursor = encode_cursor(last.name, last.id)
+        response = RestaurantPage(items=response, next_cursor=next_cursor)
+    catalog_cache.set(cache_key, response, ttl=RESTAURANT_TTL_SECONDS, tags=[LIST_TAG])
+    return response
+
+
+def _decode_distance_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        distance, last_id = decode_cursor(cursor, 2)
+        if isinstance(distance, bool) or not isinstance(distance, (int, float)):
+            raise ValueError("Invalid cursor")
+        return float(distance), UUID(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Declared before /restaurants/{restaurant_id} so "nearby" is not parsed as an id
+@router.get("/restaurants/nearby", response_model=NearbyRestaurantPage)
+async def get_nearby_restaurants(
+    lat: float,
+    lng: float,
+    radius_km: float = 5,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Restaurants within radius_km of (lat, lng), nearest first, keyset paged on
+    (distance, id). The bounding box of the circle is matched through the GiST index
+    on restaurant coordinates; exact haversine distances are only computed for the
+    restaurants inside it. Restaurants without coordinates, or whose delivery zones
+    exclude (lat, lng), are not returned.
+    """
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        raise HTTPException(status_code=400, detail="lat must be in [-90, 90] and lng in [-180, 180]")
+    if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+        raise HTTPException(status_code=400, detail=f"radius_km must be in (0, {MAX_NEARBY_RADIUS_KM}]")
+    if not 1 <= limit <= MAX_NEARBY_PAGE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_NEARBY_PAGE}")
+
+    now = to_app_tz()
+    distance = distance_km_expr(Restaurant.latitude, Restaurant.longitude, lat, lng)
+    in_boxes = [
+        within_box_clause(Restaurant.latitude, Restaurant.longitude, box)
+        for box in bounding_boxes(lat, lng, radius_km)
+    ]
+    query = (
+        select(Restaurant, _hours_column(), distance.label("distance_km"))
+        .where(
+            Restaurant.latitude.isnot(None),
+            Restaurant.longitude.isnot(None),
+            or_(*in_boxes),
+            distance <= radius_km,
+            serves_location_clause(Restaurant.id, lat, lng),
         )
-        for r in restaurants
+        .order_by(distance, Restaurant.id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_distance, last_id = _decode_distance_cursor(cursor)
+        query = query.where(tuple_(distance, Restaurant.id) > (last_distance, last_id))
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.distance_km, last[0].id)
+    items = [
+        NearbyRestaurant(**restaurant.model_dump(), distance_km=round(row.distance_km, 3))
+        for row, restaurant in zip(rows, _to_restaurant_responses(rows, now))
     ]
+    return NearbyRestaurantPage(items=items, next_cursor=next_cursor)
 
 
 @router.get("/restaurants/{restaurant_id}", response_model=RestaurantResponse)
 async def get_restaurant(
     restaurant_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific restaurant by ID"""
+    # The version is read in the same statement as the restaurant when not cached
+    version = catalog_cache.get(("catalog_version", restaurant_id))
+    restaurant_response = None
+    if version is not None:
+        restaurant_response = catalog_cache.get(("restaurant", restaurant_id, version))
+    if restaurant_response is None:
+        version, restaurant_response = await _build_restaurant_response(db, restaurant_id)
+    etag = _catalog_etag(
+        restaurant_id,
+        version,
+        restaurant_response.is_open_now,
+        restaurant_response.hours_status,
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    _set_etag(response, etag)
+    return restaurant_response
+
+
+async def _build_restaurant_response(
+    db: AsyncSession, restaurant_id: UUID
+) -> tuple[int, RestaurantResponse]:
     result = await db.execute(
-        select(Restaurant).where(Restaurant.id == restaurant_id)
+        select(Restaurant, _hours_column()).where(Restaurant.id == restaurant_id)
     )
-    restaurant = result.scalar_one_or_none()
-    if not restaurant:
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Restaurant not found")
-    hours_map = await _load_hours_by_restaurant(db, [restaurant_id])
-    delivery_map = await _load_avg_delivery_by_restaurant(db, [restaurant_id])
-    return _to_restaurant_response(
-        restaurant,
-        hours_map.get(restaurant_id, []),
-        delivery_map.get(restaurant_id),
+    restaurant, hours = row
+    version = restaurant.catalog_version
+    response = _to_restaurant_response(restaurant, _hours_rows_from_json(hours))
+    _remember_catalog_version(restaurant_id, version)
+    catalog_cache.set(
+        ("restaurant", restaurant_id, version),
+        response,
+        ttl=RESTAURANT_TTL_SECONDS,
+        tags=[restaurant_tag(restaurant_id)],
     )
+    return version, response
 
 
-@router.get("/items", response_model=List[MenuItemWithRestaurant])
+@router.get("/items", response_model=Union[List[MenuItemWithRestaurant], MenuItemPage])
 async def get_menu_items(
+    request: Request,
     limit: int = 100,  # Default to 100 to get more items
     offset: int = 0,
     restaurant_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    paging: str = "offset",
     db: AsyncSession = Depends(get_db)
 ):
-    """Get menu items with restaurant names"""
+    """
+    Get menu items with restaurant names.
+
+    Paging works like /restaurants: legacy limit/offset list by default,
+    MenuItemPage with next_cursor for paging=cursor or ?cursor=.
+    With restaurant_id the response carries an ETag from the restaurant's catalog version.
+
+    Rows are trusted, so the body is encoded straight from the DB values (see
+    services.fast_json) and the encoded bytes are what gets cached.
+    """
+    keyset = _keyset_mode(paging, cursor)
+    headers = None
+    version = None
+    if restaurant_id:
+        version = await _catalog_version(db, restaurant_id)
+        if version is not None:
+            etag = _catalog_etag(restaurant_id, version)
+            if _etag_matches(request, etag):
+                return _not_modified(etag)
+            headers = _etag_headers(etag)
+    cache_key = ("items", limit, cursor if keyset else offset, keyset, restaurant_id, version)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return json_bytes_response(cached, headers)
+
     query = (
         select(
             MenuItem.id,
@@ -172,6 +534,7 @@ async def get_menu_items(
             MenuItem.is_available,
             MenuItem.restaurant_id,
             MenuItem.delivery_time,
+            MenuItem.image_placeholder,
             Restaurant.name.label("restaurant_name")
         )
         .outerjoin(Restaurant, MenuItem.restaurant_id == Restaurant.id)
@@ -181,27 +544,40 @@ async def get_menu_items(
     if restaurant_id:
         query = query.where(MenuItem.restaurant_id == restaurant_id)
     
-    query = query.order_by(MenuItem.name).limit(limit).offset(offset)
+    query = query.order_by(MenuItem.name, MenuItem.id)
+    if keyset:
+        query = _after_cursor(query, MenuItem.name, MenuItem.id, cursor).limit(limit + 1)
+    else:
+        query = query.limit(limit).offset(offset)
     
     result = await db.execute(query)
     rows = result.all()
+    next_cursor = None
+    if keyset and limit > 0 and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].name, rows[-1].id)
     
-    # Convert to list of dicts
-    items = []
-    for row in rows:
-        items.append({
+    # MenuItemWithRestaurant-shaped dicts
+    items = [
+        {
             "id": row.id,
             "name": row.name,
             "description": row.description,
-            "price": row.price,
+            "price": float(row.price),
             "image_url": row.image_url,
             "is_available": row.is_available,
-            "restaurant_id": row.restaurant_id,
             "restaurant_name": row.restaurant_name,
-            "delivery_time": row.delivery_time
-        })
-    
-    return items
+            "restaurant_id": row.restaurant_id,
+            "delivery_time": row.delivery_time,
+            "image_variants": image_variants(row.image_url),
+            "image_placeholder": row.image_placeholder,
+        }
+        for row in rows
+    ]
+    body = encode_trusted({"items": items, "next_cursor": next_cursor} if keyset else items)
+    tags = [restaurant_tag(restaurant_id)] if restaurant_id else [LIST_TAG]
+    catalog_cache.set(cache_key, body, ttl=MENU_TTL_SECONDS, tags=tags)
+    return json_bytes_response(body, headers)
 
 
 @router.get("/items/{item_id}", response_model=MenuItemWithRestaurant)
@@ -220,6 +596,7 @@ async def get_menu_item(
             MenuItem.is_available,
             MenuItem.restaurant_id,
             MenuItem.delivery_time,
+            MenuItem.image_placeholder,
             Restaurant.name.label("restaurant_name")
         )
         .outerjoin(Restaurant, MenuItem.restaurant_id == Restaurant.id)
@@ -239,19 +616,105 @@ async def get_menu_item(
         "is_available": row.is_available,
         "restaurant_id": row.restaurant_id,
         "restaurant_name": row.restaurant_name,
-        "delivery_time": row.delivery_time
+        "delivery_time": row.delivery_time,
+        "image_variants": image_variants(row.image_url),
+        "image_placeholder": row.image_placeholder,
     }
 
 
+@router.get("/items:batch", response_model=MenuItemBatchResponse)
+async def get_menu_items_batch(
+    ids: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Details for a known set of menu items (?ids=a,b,c), e.g. cart, order history or
+    favorites, including unavailable ones. Cached per item and checked against the
+    restaurant's cached catalog version, so a warm batch makes no queries; the rest are
+    loaded with one WHERE id = ANY(:ids).
+    """
+    item_ids = _parse_id_list(ids, MAX_BATCH_ITEMS)
+    payloads: dict[UUID, dict] = {}
+    misses: list[UUID] = []
+    for item_id in item_ids:
+        entry = menu_item_cache.get(item_id)
+        if entry is not None:
+            version, payload = entry
+            rid = payload["restaurant_id"]
+            if rid is None or catalog_cache.get(("catalog_version", rid)) == version:
+                payloads[item_id] = payload
+                continue
+        misses.append(item_id)
+
+    if misses:
+        result = await db.execute(
+            select(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.description,
+                MenuItem.price,
+                MenuItem.image_url,
+                MenuItem.is_available,
+                MenuItem.restaurant_id,
+                MenuItem.delivery_time,
+                MenuItem.image_placeholder,
+                Restaurant.name.label("restaurant_name"),
+                Restaurant.catalog_version,
+            )
+            .outerjoin(Restaurant, MenuItem.restaurant_id == Restaurant.id)
+            .where(MenuItem.id == any_(bindparam("ids", misses, type_=ARRAY(PG_UUID(as_uuid=True)))))
+        )
+        for row in result.all():
+            # MenuItemWithRestaurant-shaped dict
+            payload = {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "price": float(row.price),
+                "image_url": row.image_url,
+                "is_available": row.is_available,
+                "restaurant_name": row.restaurant_name,
+                "restaurant_id": row.restaurant_id,
+                "delivery_time": row.delivery_time,
+                "image_variants": image_variants(row.image_url),
+                "image_placeholder": row.image_placeholder,
+            }
+            payloads[row.id] = payload
+            tags = [restaurant_tag(row.restaurant_id)] if row.restaurant_id else [LIST_TAG]
+            menu_item_cache.set(row.id, (row.catalog_version, payload), ttl=MENU_TTL_SECONDS, tags=tags)
+            if row.restaurant_id:
+                _remember_catalog_version(row.restaurant_id, row.catalog_version)
+
+    return trusted_json_response(
+        {
+            "items": [payloads[i] for i in item_ids if i in payloads],
+            "missing": [i for i in item_ids if i not in payloads],
+        }
+    )
+
+
 @router.get("/restaurants/{restaurant_id}/items", response_model=List[MenuItemCategoryResponse])
 async def get_restaurant_items_by_category(
     restaurant_id: UUID,
+    request: Request,
+    response: Response,
     category: str = "food",
     db: AsyncSession = Depends(get_db),
 ):
     cat = category.lower()
     if cat not in ("food", "drinks"):
         raise HTTPException(status_code=400, detail="category must be food or drinks")
+    version = await _catalog_version(db, restaurant_id)
+    if version is not None:
+        etag = _catalog_etag(restaurant_id, version)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        _set_etag(response, etag)
+    cache_key = ("items_by_category", restaurant_id, cat, version)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
         select(MenuItem)
         .where(
@@ -262,7 +725,7 @@ async def get_restaurant_items_by_category(
         .order_by(MenuItem.name)
     )
     items = result.scalars().all()
-    return [
+    payload = [
         MenuItemCategoryResponse(
             id=str(i.id),
             name=i.name,
@@ -270,16 +733,34 @@ async def get_restaurant_items_by_category(
             image=i.image_url,
             delivery_minutes=i.delivery_time,
             description=i.description,
+            image_variants=image_variants(i.image_url),
+            image_placeholder=i.image_placeholder,
         )
         for i in items
     ]
+    catalog_cache.set(
+        cache_key,
+        payload,
+        ttl=MENU_TTL_SECONDS,
+        tags=[restaurant_tag(restaurant_id)],
+    )
+    return payload
 
 
 @router.get("/restaurants/{restaurant_id}/hours", response_model=RestaurantHoursResponse)
 async def get_restaurant_hours(
     restaurant_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
+    version = await _catalog_version(db, restaurant_id)
+    if version is not None:
+        etag = _catalog_etag(restaurant_id, version)
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        _set_etag(response, etag)
+
     result = await db.execute(
         select(RestaurantHours)
         .where(RestaurantHours.restaurant_id == restaurant_id)
@@ -297,41 +778,409 @@ async def get_restaurant_hours(
     return RestaurantHoursResponse(days=days)
 
 
+async def _load_modifier_groups(
+    db: AsyncSession, item_ids: list[UUID]
+) -> dict[UUID, list[ModifierGroupResponse]]:
+    """Load modifier groups and their options for many items in one round trip."""
+    if not item_ids:
+        return {}
+    result = await db.execute(
+        text(
+            """
+            SELECT g.menu_item_id, g.id, g.name, o.id, o.label, o.price_delta
+            FROM menu_modifier_groups g
+            LEFT JOIN menu_modifier_options o ON o.group_id = g.id
+            WHERE g.menu_item_id = ANY(:item_ids)
+            ORDER BY g.menu_item_id, g.sort_order, g.id, o.sort_order, o.id
+            """
+        ).bindparams(bindparam("item_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+        {"item_ids": item_ids},
+    )
+    grouped: dict[UUID, list[ModifierGroupResponse]] = defaultdict(list)
+    groups_by_id: dict[UUID, ModifierGroupResponse] = {}
+    for item_id, gid, gname, oid, label, price_delta in result.all():
+        group = groups_by_id.get(gid)
+        if group is None:
+            group = ModifierGroupResponse(id=str(gid), name=gname, options=[])
+            groups_by_id[gid] = group
+            grouped[item_id].append(group)
+        if oid is not None:
+            group.options.append(
+                ModifierOptionResponse(
+                    id=str(oid),
+                    label=label,
+                    price_delta=float(price_delta or 0),
+                )
+            )
+    return grouped
+
+
+def _parse_id_list(raw: str, max_ids: int) -> list[UUID]:
+    """Parse a comma-separated list of UUIDs, de-duplicated in request order."""
+    ids: list[UUID] = []
+    seen: set[UUID] = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = UUID(part)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid id: {part}")
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one id is required")
+    if len(ids) > max_ids:
+        raise HTTPException(status_code=400, detail=f"At most {max_ids} ids per request")
+    return ids
+
+
 @router.get("/items/{item_id}/modifiers", response_model=MenuItemModifiersResponse)
 async def get_menu_item_modifiers(
     item_id: UUID,
     db: AsyncSession = Depends(get_db),
 ):
-    groups_result = await db.execute(
-        text(
-            """
-            SELECT id, name FROM menu_modifier_groups
-            WHERE menu_item_id = :item_id
-            ORDER BY sort_order
-            """
-        ),
-        {"item_id": str(item_id)},
+    groups = await _load_modifier_groups(db, [item_id])
+    return MenuItemModifiersResponse(groups=groups.get(item_id, []))
+
+
+@router.get("/modifiers", response_model=BulkModifiersResponse)
+async def get_bulk_menu_item_modifiers(
+    item_ids: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Modifiers for many menu items at once (?item_ids=a,b,c), e.g. to prefetch a restaurant page."""
+    ids = _parse_id_list(item_ids, MAX_BULK_IDS)
+    groups = await _load_modifier_groups(db, ids)
+    return BulkModifiersResponse(items={str(i): groups.get(i, []) for i in ids})
+
+
+STOREFRONT_SQL = text(
+    """
+    WITH r AS (
+      SELECT id, name, address, latitude, longitude, image_url, logo_url, rating, is_open,
+             created_at, delivery_time_sum, delivery_time_count, image_placeholder, logo_placeholder
+      FROM restaurants
+      WHERE id = :restaurant_id
+    ),
+    hours AS (
+      SELECT coalesce(json_agg(json_build_object(
+               'day_of_week', h.day_of_week,
+               'open_time', to_char(h.open_time, 'HH24:MI'),
+               'close_time', to_char(h.close_time, 'HH24:MI'),
+               'is_closed', h.is_closed
+             ) ORDER BY h.day_of_week), '[]'::json) AS days
+      FROM restaurant_hours h
+      WHERE h.restaurant_id = :restaurant_id
+    ),
+    items AS (
+      SELECT mi.id, mi.name, mi.price, mi.image_url, mi.delivery_time, mi.description, mi.category,
+             mi.image_placeholder
+      FROM menu_items mi
+      WHERE mi.restaurant_id = :restaurant_id
+        AND mi.is_available = true
+        AND mi.category IN ('food', 'drinks')
+    ),
+    item_json AS (
+      SELECT i.category, json_agg(json_build_object(
+               'id', i.id::text,
+               'name', i.name,
+               'price', i.price,
+               'image', i.image_url,
+               'delivery_minutes', i.delivery_time,
+               'description', i.description,
+               'image_placeholder', i.image_placeholder
+             ) ORDER BY i.name, i.id) AS items
+      FROM items i
+      GROUP BY i.category
+    ),
+    groups AS (
+      SELECT g.menu_item_id, json_agg(json_build_object(
+               'id', g.id::text,
+               'name', g.name,
+               'options', coalesce(o.options, '[]'::json)
+             ) ORDER BY g.sort_order, g.id) AS groups
+      FROM menu_modifier_groups g
+      JOIN items i ON i.id = g.menu_item_id
+      LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+                 'id', mo.id::text,
+                 'label', mo.label,
+                 'price_delta', mo.price_delta
+               ) ORDER BY mo.sort_order, mo.id) AS options
+        FROM menu_modifier_options mo
+        WHERE mo.group_id = g.id
+      ) o ON true
+      GROUP BY g.menu_item_id
     )
-    groups = []
-    for gid, gname in groups_result.all():
-        opts_result = await db.execute(
-            text(
-                """
-                SELECT id, label, price_delta FROM menu_modifier_options
-                WHERE group_id = :gid
-                ORDER BY sort_order
-                """
-            ),
-            {"gid": str(gid)},
+    SELECT r.*,
+           hours.days AS hours,
+           coalesce((SELECT items FROM item_json WHERE category = 'food'), '[]'::json) AS food,
+           coalesce((SELECT items FROM item_json WHERE category = 'drinks'), '[]'::json) AS drinks,
+           coalesce((SELECT json_object_agg(menu_item_id::text, groups) FROM groups), '{}'::json)
+             AS modifiers
+    FROM r CROSS JOIN hours
+    """
+).columns(
+    image_placeholder=JSONB,
+    logo_placeholder=JSONB,
+    hours=JSON,
+    food=JSON,
+    drinks=JSON,
+    modifiers=JSON,
+)
+
+
+@router.get(
+    "/restaurants/{restaurant_id}/storefront",
+    response_model=RestaurantStorefrontResponse,
+)
+async def get_restaurant_storefront(
+    restaurant_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Restaurant, hours, food and drinks items and all their modifiers in one response,
+    built from a single statement (one CTE per section, aggregated with json_agg).
+    """
+    version = await _catalog_version(db, restaurant_id)
+    cache_key = ("storefront", restaurant_id, version)
+    storefront = catalog_cache.get(cache_key)
+    if storefront is None:
+        storefront = await _build_storefront(db, restaurant_id, cache_key)
+    if version is not None:
+        etag = _catalog_etag(
+            restaurant_id,
+            version,
+            storefront.restaurant.is_open_now,
+            storefront.restaurant.hours_status,
         )
-        options = [
-            ModifierOptionResponse(
-                id=str(oid),
-                label=label,
-                price_delta=float(price_delta or 0),
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        _set_etag(response, etag)
+    return storefront
+
+
+async def _build_storefront(
+    db: AsyncSession, restaurant_id: UUID, cache_key: tuple
+) -> RestaurantStorefrontResponse:
+
+    result = await db.execute(STOREFRONT_SQL, {"restaurant_id": restaurant_id})
+    row = result.one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    hours = [RestaurantHoursDay(**day) for day in row.hours]
+    hours_rows = [
+        HoursRow(
+            day_of_week=day.day_of_week,
+            open_time=parse_hhmm(day.open_time),
+            close_time=parse_hhmm(day.close_time),
+            is_closed=day.is_closed,
+        )
+        for day in hours
+    ]
+    response = RestaurantStorefrontResponse(
+        restaurant=_to_restaurant_response(row, hours_rows),
+        hours=hours,
+        food=[{**i, "image_variants": image_variants(i["image"])} for i in row.food],
+        drinks=[{**i, "image_variants": image_variants(i["image"])} for i in row.drinks],
+        modifiers=row.modifiers,
+    )
+    catalog_cache.set(
+        cache_key,
+        response,
+        ttl=RESTAURANT_TTL_SECONDS,
+        tags=[restaurant_tag(restaurant_id)],
+    )
+    return response
+
+
+MAX_CHANGES_PAGE = 1000
+
+
+def _decode_since(since: str) -> tuple[tuple[int, int], Optional[tuple[int, UUID]]]:
+    """(log position, snapshot cursor or None) from a /menu/changes next_token."""
+    try:
+        txid, change_id = decode_cursor(since, 2)
+        return (int(txid), int(change_id)), None
+    except ValueError:
+        txid, index, last_id = decode_cursor(since, 3)
+        return (int(txid), 0), (int(index), UUID(last_id))
+
+
+@router.get("/changes", response_model=CatalogChangesResponse)
+async def get_catalog_changes(
+    since: Optional[str] = None,
+    limit: int = 500,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Incremental catalog sync. Without `since` this pages through a snapshot of the whole
+    catalog; afterwards pass the previous next_token back as ?since= to get only what
+    changed. Keep calling while has_more is true. limit bounds the rows consumed per call.
+    The change log keeps CATALOG_CHANGES_RETENTION_DAYS of history: an older token gets
+    410 and the client syncs again without since.
+    """
+    if limit < 1 or limit > MAX_CHANGES_PAGE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_CHANGES_PAGE}")
+    snapshot: Optional[tuple[int, Optional[UUID]]] = (0, None)
+    if since:
+        try:
+            position, snapshot = _decode_since(since)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid since token")
+    else:
+        # The log is replayed from here once the snapshot is done
+        position = await current_catalog_position(db)
+
+    from_log = snapshot is None
+    if from_log:
+        try:
+            changes, position, has_more = await read_catalog_changes(db, position, limit)
+        except CatalogPositionExpired:
+            raise HTTPException(status_code=410, detail="since token has expired; sync again without since")
+        next_token = encode_cursor(*position)
+    else:
+        changes, snapshot, has_more = await read_catalog_snapshot(db, snapshot, limit)
+        next_token = encode_cursor(position[0], *snapshot) if has_more else encode_cursor(*position)
+
+    changed: dict[str, dict[UUID, None]] = {"restaurant": {}, "menu_item": {}, "hours": {}}
+    for c in changes:
+        changed[c.entity][c.entity_id] = None
+    item_ids = list(changed["menu_item"])
+    hours_ids = list(changed["hours"])
+
+    items: list[dict] = []
+    if item_ids:
+        result = await db.execute(
+            select(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.description,
+                MenuItem.price,
+                MenuItem.image_url,
+                MenuItem.is_available,
+                MenuItem.restaurant_id,
+                MenuItem.delivery_time,
+                MenuItem.image_placeholder,
+                Restaurant.name.label("restaurant_name"),
             )
-            for oid, label, price_delta in opts_result.all()
+            .outerjoin(Restaurant, MenuItem.restaurant_id == Restaurant.id)
+            .where(MenuItem.id.in_(item_ids))
+        )
+        items = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "price": row.price,
+                "image_url": row.image_url,
+                "is_available": bool(row.is_available),
+                "restaurant_name": row.restaurant_name,
+                "restaurant_id": row.restaurant_id,
+                "delivery_time": row.delivery_time,
+                "image_variants": image_variants(row.image_url),
+                "image_placeholder": row.image_placeholder,
+            }
+            for row in result.all()
         ]
-        groups.append(ModifierGroupResponse(id=str(gid), name=gname, options=options))
-    return MenuItemModifiersResponse(groups=groups)
 
+    if from_log:
+        # Item writes move their restaurant's avg_delivery_minutes without logging it
+        for item in items:
+            if item["restaurant_id"] is not None:
+                changed["restaurant"].setdefault(item["restaurant_id"], None)
+    restaurant_ids = list(changed["restaurant"])
+
+    restaurants: list[RestaurantResponse] = []
+    if restaurant_ids:
+        result = await db.execute(
+            select(Restaurant, _hours_column()).where(Restaurant.id.in_(restaurant_ids))
+        )
+        restaurants = _to_restaurant_responses(result.all(), to_app_tz())
+
+    hours: list[RestaurantHoursChange] = []
+    if hours_ids:
+        result = await db.execute(
+            select(RestaurantHours)
+            .where(RestaurantHours.restaurant_id.in_(hours_ids))
+            .order_by(RestaurantHours.day_of_week)
+        )
+        days_by_restaurant: dict[UUID, list[RestaurantHoursDay]] = {rid: [] for rid in hours_ids}
+        for h in result.scalars().all():
+            days_by_restaurant[h.restaurant_id].append(
+                RestaurantHoursDay(
+                    day_of_week=h.day_of_week,
+                    open_time=h.open_time.strftime("%H:%M") if h.open_time else None,
+                    close_time=h.close_time.strftime("%H:%M") if h.close_time else None,
+                    is_closed=bool(h.is_closed),
+                )
+            )
+        hours = [
+            RestaurantHoursChange(restaurant_id=rid, days=days)
+            for rid, days in days_by_restaurant.items()
+        ]
+
+    found_restaurants = {r.id for r in restaurants}
+    found_items = {i["id"] for i in items}
+    return CatalogChangesResponse(
+        restaurants=restaurants,
+        menu_items=items,
+        hours=hours,
+        deleted=CatalogDeletions(
+            restaurants=[rid for rid in restaurant_ids if rid not in found_restaurants],
+            menu_items=[iid for iid in item_ids if iid not in found_items],
+        ),
+        next_token=next_token,
+        has_more=has_more,
+    )
+
+
+MAX_SEARCH_RESULTS = 50
+
+
+@router.get("/search", response_model=MenuSearchResponse)
+async def search_menu(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked search over available menu items by item name, description and restaurant
+    name. Tolerates typos and matches the last word as a prefix (see services.menu_search).
+    """
+    if limit < 1 or limit > MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+    total, items = await menu_search.search(db, q, limit, offset)
+    return trusted_json_response({"items": items, "total": total})
+
+
+MAX_SUGGESTIONS = 10
+
+
+@router.get("/suggest", response_model=MenuSuggestResponse)
+async def suggest_menu(
+    prefix: str,
+    limit: int = 8,
+    db: AsyncSession = Depends(get_db),
+):
+    """Type-ahead restaurant and dish names for a prefix, most popular first."""
+    if limit < 1 or limit > MAX_SUGGESTIONS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SUGGESTIONS}")
+    suggestions = await menu_suggest.suggest(db, prefix, limit)
+    return trusted_json_response(
+        {
+            "suggestions": [
+                {"type": s.kind, "text": s.text, "restaurant_id": s.restaurant_id}
+                for s in suggestions
+            ]
+        }
+    )
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from database import get_db
 from models.order import Order, OrderItem, OrderTrackingStep
 from models.restaurant import Restaurant
@@ -13,10 +14,9 @@ from schemas.orders_api import (
     CreateOrderFromCartRequest,
     CreateOrderFromCartResponse,
     OrderSummaryResponse,
-    OrderTabItemResponse,
-    OngoingOrderResponse,
-    TrackingStepResponse,
 )
+from services.cloudinary_storage import image_variants
+from services.fast_json import trusted_json_response
 from services.jwt_auth import get_current_user
 from services.order_checkout import (
     confirm_order_checkout,
@@ -49,9 +49,10 @@ async def order_summary(
         )
         orders = order_result.scalars().all()
 
-        tab_items: list[OrderTabItemResponse] = []
-        delivery_fee = 1500.0
-        ongoing: OngoingOrderResponse | None = None
+        # OrderSummaryResponse-shaped dicts; encoded without re-validation
+        tab_items: list[dict] = []
+        delivery_fee = settings.DELIVERY_FEE_FALLBACK
+        ongoing: dict | None = None
         pending_order_id: str | None = None
 
         for order in orders:
@@ -68,16 +69,17 @@ async def order_summary(
                 )
                 for oi in items_result.scalars().all():
                     tab_items.append(
-                        OrderTabItemResponse(
-                            id=str(oi.id),
-                            name=oi.name or "Item",
-                            description=oi.description,
-                            price=float(oi.unit_price or oi.price_at_order or 0),
-                            quantity=int(oi.quantity or 1),
-                            image=oi.image_url,
-                            restaurant=rest_name,
-                            options_json=oi.options_json or {},
-                        )
+                        {
+                            "id": str(oi.id),
+                            "name": oi.name or "Item",
+                            "description": oi.description,
+                            "price": float(oi.unit_price or oi.price_at_order or 0),
+                            "quantity": int(oi.quantity or 1),
+                            "image": oi.image_url,
+                            "restaurant": rest_name,
+                            "options_json": oi.options_json or {},
+                            "image_variants": image_variants(oi.image_url),
+                        }
                     )
                 if order.delivery_fee is not None:
                     delivery_fee = float(order.delivery_fee)
@@ -89,32 +91,36 @@ async def order_summary(
                     .order_by(OrderTrackingStep.step_order)
                 )
                 steps = [
-                    TrackingStepResponse(
-                        label=s.label,
-                        description=s.description,
-                        time=format_order_step_time(
+                    {
+                        "label": s.label,
+                        "description": s.description,
+                        "time": format_order_step_time(
                             s.completed_at,
                             bool(s.is_completed),
                             order_created_at=order.created_at,
                             step_order=s.step_order,
                         ),
-                        completed=bool(s.is_completed),
-                        show_view=bool(s.show_view_action),
-                    )
+                        "completed": bool(s.is_completed),
+                        "show_view": bool(s.show_view_action),
+                    }
                     for s in steps_result.scalars().all()
                 ]
-                mins = order.estimated_delivery_minutes or 20
-                ongoing = OngoingOrderResponse(
-                    order_id=str(order.id),
-                    delivery_time=f"{mins} mins",
-                    steps=steps,
+                mins = order.estimated_delivery_minutes or (
+                    settings.DELIVERY_DEFAULT_PREP_MINUTES + settings.DELIVERY_FALLBACK_TRAVEL_MINUTES
                 )
+                ongoing = {
+                    "order_id": str(order.id),
+                    "delivery_time": f"{mins} mins",
+                    "steps": steps,
+                }
 
-        return OrderSummaryResponse(
-            items=tab_items,
-            delivery_fee=delivery_fee,
-            ongoing=ongoing,
-            pending_order_id=pending_order_id,
+        return trusted_json_response(
+            {
+                "items": tab_items,
+                "delivery_fee": delivery_fee,
+                "ongoing": ongoing,
+                "pending_order_id": pending_order_id,
+            }
         )
     except Exception as e:
         log.error("Order summary failed: %s", e)
@@ -17,6 +17,7 @@ from schemas.payment import (
     DepositCreate,
     DepositResponse,
 )
+from services.db_writes import insert_returning
 from services.jwt_auth import get_current_user
 from services.wallet_deposit import ensure_deposit_account, complete_deposit
 
@@ -44,7 +45,9 @@ async def create_payment_card(
         if len(digits) < 13:
             raise HTTPException(status_code=400, detail="Invalid card number")
         last_four = digits[-4:]
-        card = PaymentCard(
+        card = await insert_returning(
+            db,
+            PaymentCard,
             user_id=user_id,
             cardholder_name=body.cardholder_name.strip(),
             last_four=last_four,
@@ -54,9 +57,7 @@ async def create_payment_card(
             save_details=body.save_details,
             is_default=False,
         )
-        db.add(card)
         await db.commit()
-        await db.refresh(card)
         return PaymentCardResponse(
             id=str(card.id),
             cardholder_name=card.cardholder_name,
@@ -118,7 +119,9 @@ async def create_deposit(
             raise HTTPException(status_code=400, detail="Amount must be greater than zero")
 
         wallet = await get_or_create_wallet(user_id, db)
-        deposit = Deposit(
+        deposit = await insert_returning(
+            db,
+            Deposit,
             user_id=user_id,
             wallet_id=wallet.id,
             method=method,
@@ -126,8 +129,6 @@ async def create_deposit(
             status="pending",
             payment_card_id=UUID(body.payment_card_id) if body.payment_card_id else None,
         )
-        db.add(deposit)
-        await db.flush()
 
         wallet = await complete_deposit(deposit, wallet, db)
 
@@ -10,6 +10,7 @@ from models.user import User
 from models.user_role import UserRole
 from models.restaurant import Restaurant
 from schemas.user import UserUpdate, UserResponse, UserRolesResponse
+from services.db_writes import insert_returning, update_returning
 from services.jwt_auth import get_current_user
 from services.supabase_admin import delete_auth_user
 
@@ -167,7 +168,9 @@ async def create_profile(
 
         await ensure_user_account(db, user_id, email, profile_data)
 
-        user_role = UserRole(
+        user_role = await insert_returning(
+            db,
+            UserRole,
             user_id=user_id,
             role=role,
             first_name=profile_data.first_name,
@@ -175,9 +178,7 @@ async def create_profile(
             phone=normalized_phone,
             dob=profile_data.dob,
         )
-        db.add(user_role)
         await db.commit()
-        await db.refresh(user_role)
 
         log.info("Role profile created: %s (%s)", email, role)
         restaurant_id, business_verified, verification_stage = await get_restaurant_vendor_context(db, user_role)
@@ -263,12 +264,16 @@ async def update_profile(
         if "phone" in update_data and normalized_phone:
             update_data["phone"] = normalized_phone
 
-        for key, value in update_data.items():
-            if hasattr(user_role, key):
-                setattr(user_role, key, value)
-
-        await db.commit()
-        await db.refresh(user_role)
+        values = {key: value for key, value in update_data.items() if hasattr(UserRole, key)}
+        if values:
+            user_role = await update_returning(
+                db,
+                UserRole,
+                UserRole.user_id == user_id,
+                UserRole.role == role,
+                **values,
+            )
+            await db.commit()
 
         log.info(f"Profile updated: {email} ({role})")
         restaurant_id, business_verified, verification_stage = await get_restaurant_vendor_context(db, user_role)
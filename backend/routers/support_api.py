@@ -15,6 +15,7 @@ from schemas.support_api import (
     SupportMessageResponse,
     SupportMessageCreate,
 )
+from services.db_writes import insert_returning
 from services.jwt_auth import get_current_user
 
 log = logging.getLogger(__name__)
@@ -57,7 +58,9 @@ async def ensure_conversation(user_id: UUID, db: AsyncSession) -> SupportConvers
     if conv:
         return conv
     now = datetime.now(timezone.utc)
-    conv = SupportConversation(
+    conv = await insert_returning(
+        db,
+        SupportConversation,
         user_id=user_id,
         last_message_preview=None,
         last_message_at=None,
@@ -65,9 +68,7 @@ async def ensure_conversation(user_id: UUID, db: AsyncSession) -> SupportConvers
         is_typing=False,
         created_at=now,
     )
-    db.add(conv)
     await db.commit()
-    await db.refresh(conv)
     return conv
 
 
@@ -162,20 +163,20 @@ async def send_message(
         if not conv or conv.user_id != user_id:
             raise HTTPException(status_code=404, detail="Conversation not found")
         now = datetime.now(timezone.utc)
-        user_msg = SupportMessage(
+        user_msg = await insert_returning(
+            db,
+            SupportMessage,
             conversation_id=conversation_id,
             sender_type="user",
             body=text,
             created_at=now,
         )
-        db.add(user_msg)
         conv.last_message_preview = text[:120]
         conv.last_message_at = now
         conv.is_typing = False
         conv.unread_count = 0
 
         await db.commit()
-        await db.refresh(user_msg)
         return SupportMessageResponse(
             id=str(user_msg.id),
             body=user_msg.body,
@@ -3,21 +3,28 @@ import re
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
+from models.delivery_zone import RestaurantDeliveryZone
 from models.restaurant import Restaurant
 from routers.profile import get_role_profile, normalize_phone_number
 from schemas.restaurant_vendor import (
     BusinessRegistrationRequest,
     BusinessRegistrationResponse,
     BusinessRegistrationSummary,
+    DeliveryZone,
+    DeliveryZonesRequest,
+    DeliveryZonesResponse,
     RestaurantImageUploadResponse,
     VerificationDocumentsRequest,
 )
+from services.catalog_cache import invalidate_restaurant
 from services.cloudinary_storage import upload_restaurant_image
+from services.db_writes import insert_returning, update_returning
+from services.delivery_zones import MAX_ZONES, validate_zone
 from services.jwt_auth import get_current_user
 from services.vendor_verification import verification_stage_for_restaurant
 
@@ -55,6 +62,7 @@ async def _get_vendor_restaurant(db: AsyncSession, user_id: UUID) -> Restaurant:
 
 @router.post("/upload-image", response_model=RestaurantImageUploadResponse)
 async def upload_image(
+    background_tasks: BackgroundTasks,
     kind: str = Form(...),
     file: UploadFile = File(...),
     document_key: str | None = Form(None),
@@ -64,7 +72,9 @@ async def upload_image(
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    result = await upload_restaurant_image(file, kind, user_id, document_key=document_key)
+    result = await upload_restaurant_image(
+        file, kind, user_id, document_key=document_key, background_tasks=background_tasks
+    )
     return RestaurantImageUploadResponse(**result)
 
 
@@ -115,39 +125,37 @@ async def submit_business_registration(
         if not restaurant:
             restaurant = await _get_owned_restaurant(db, user_id)
 
-        if not restaurant:
-            restaurant = Restaurant(
-                name=payload.business_name.strip(),
-                created_at=now,
-            )
-            db.add(restaurant)
-            await db.flush()
-
-        restaurant.name = payload.business_name.strip()
-        restaurant.owner_user_id = user_id
-        restaurant.owner_name = payload.business_owner.strip()
-        restaurant.business_type = payload.business_type.strip()
-        restaurant.logo_url = payload.logo_url
-        restaurant.image_url = payload.cover_image_url
-        restaurant.phone = normalized_phone
-        restaurant.contact_person = (payload.contact_person or "").strip() or None
-        restaurant.email = (payload.email or "").strip() or None
-        restaurant.address = (payload.address or "").strip() or None
-        restaurant.landmark = (payload.landmark or "").strip() or None
-        restaurant.latitude = payload.latitude
-        restaurant.longitude = payload.longitude
-        restaurant.bank_name = (payload.bank_name or "").strip() or None
-        restaurant.account_number = re.sub(r"\s+", "", payload.account_number or "") or None
-        restaurant.account_holder_name = (payload.account_holder_name or "").strip() or None
-        restaurant.business_verified = False
-        restaurant.verification_submitted_at = now
+        values = dict(
+            name=payload.business_name.strip(),
+            owner_user_id=user_id,
+            owner_name=payload.business_owner.strip(),
+            business_type=payload.business_type.strip(),
+            logo_url=payload.logo_url,
+            image_url=payload.cover_image_url,
+            phone=normalized_phone,
+            contact_person=(payload.contact_person or "").strip() or None,
+            email=(payload.email or "").strip() or None,
+            address=(payload.address or "").strip() or None,
+            landmark=(payload.landmark or "").strip() or None,
+            latitude=payload.latitude,
+            longitude=payload.longitude,
+            bank_name=(payload.bank_name or "").strip() or None,
+            account_number=re.sub(r"\s+", "", payload.account_number or "") or None,
+            account_holder_name=(payload.account_holder_name or "").strip() or None,
+            business_verified=False,
+            verification_submitted_at=now,
+        )
+        if restaurant:
+            restaurant = await update_returning(db, Restaurant, Restaurant.id == restaurant.id, **values)
+        else:
+            restaurant = await insert_returning(db, Restaurant, created_at=now, **values)
 
         user_role.restaurant_id = restaurant.id
         if normalized_phone:
             user_role.phone = normalized_phone
 
         await db.commit()
-        await db.refresh(restaurant)
+        invalidate_restaurant(restaurant.id)
 
         log.info("Business registration submitted for user %s (restaurant %s)", user_id, restaurant.id)
         return BusinessRegistrationResponse(
@@ -176,12 +184,14 @@ async def submit_verification_documents(
         restaurant = await _get_vendor_restaurant(db, user_id)
         now = datetime.now(timezone.utc)
 
-        restaurant.verification_documents = payload.documents
-        if not restaurant.verification_submitted_at:
-            restaurant.verification_submitted_at = now
-
+        restaurant = await update_returning(
+            db,
+            Restaurant,
+            Restaurant.id == restaurant.id,
+            verification_documents=payload.documents,
+            verification_submitted_at=func.coalesce(Restaurant.verification_submitted_at, now),
+        )
         await db.commit()
-        await db.refresh(restaurant)
 
         log.info("Verification documents submitted for user %s (restaurant %s)", user_id, restaurant.id)
         return BusinessRegistrationResponse(
@@ -197,3 +207,69 @@ async def submit_verification_documents(
         await db.rollback()
         log.error("Verification documents submission failed: %s", exc)
         raise HTTPException(status_code=500, detail="Failed to save verification documents")
+
+
+@router.get("/delivery-zones", response_model=DeliveryZonesResponse)
+async def get_delivery_zones(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    user_id = UUID(current_user["id"])
+    restaurant = await _get_vendor_restaurant(db, user_id)
+    result = await db.execute(
+        select(RestaurantDeliveryZone)
+        .where(RestaurantDeliveryZone.restaurant_id == restaurant.id)
+        .order_by(RestaurantDeliveryZone.created_at, RestaurantDeliveryZone.id)
+    )
+    return DeliveryZonesResponse(
+        restaurant_id=restaurant.id,
+        zones=[
+            DeliveryZone(name=zone.name, points=[list(point) for point in zone.area])
+            for zone in result.scalars().all()
+        ],
+    )
+
+
+@router.put("/delivery-zones", response_model=DeliveryZonesResponse)
+async def replace_delivery_zones(
+    payload: DeliveryZonesRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        user_id = UUID(current_user["id"])
+        restaurant = await _get_vendor_restaurant(db, user_id)
+        if len(payload.zones) > MAX_ZONES:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_ZONES} delivery zones")
+        try:
+            areas = [validate_zone(zone.points) for zone in payload.zones]
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        now = datetime.now(timezone.utc)
+        await db.execute(
+            delete(RestaurantDeliveryZone).where(RestaurantDeliveryZone.restaurant_id == restaurant.id)
+        )
+        db.add_all(
+            RestaurantDeliveryZone(restaurant_id=restaurant.id, name=zone.name, area=area, created_at=now)
+            for zone, area in zip(payload.zones, areas)
+        )
+        await db.commit()
+        invalidate_restaurant(restaurant.id)
+
+        log.info("Delivery zones replaced for restaurant %s (%d zones)", restaurant.id, len(areas))
+        return DeliveryZonesResponse(
+            restaurant_id=restaurant.id,
+            zones=[
+                DeliveryZone(name=zone.name, points=[list(point) for point in area])
+                for zone, area in zip(payload.zones, areas)
+            ],
+        )
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as exc:
+        await db.rollback()
+        log.error("Delivery zones update failed: %s", exc)
+        raise HTTPException(status_code=500, detail="Failed to save delivery zones")
@@ -12,6 +12,7 @@ from schemas.wallet import (
     WalletTransactionResponse,
     WalletTransactionsListResponse,
 )
+from services.db_writes import insert_returning
 from services.jwt_auth import get_current_user
 
 log = logging.getLogger(__name__)
@@ -25,10 +26,8 @@ async def get_or_create_wallet(user_id: UUID, db: AsyncSession) -> Wallet:
     wallet = result.scalar_one_or_none()
     if wallet:
         return wallet
-    wallet = Wallet(user_id=user_id, balance=0, currency="NGN")
-    db.add(wallet)
+    wallet = await insert_returning(db, Wallet, user_id=user_id, balance=0, currency="NGN")
     await db.commit()
-    await db.refresh(wallet)
     log.info("Created wallet for user %s", user_id)
     return wallet
 
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
+
+from schemas.menu import ImageVariants
 
 
 class CartItemResponse(BaseModel):
@@ -12,13 +14,22 @@ class CartItemResponse(BaseModel):
     section: Optional[str] = None
     menu_item_id: Optional[str] = None
     options_json: Dict[str, Any] = Field(default_factory=dict)
+    image_variants: Optional[ImageVariants] = None
+    # Live menu price (services.cart_pricing); price is what was stored when added
+    current_price: Optional[float] = None
+    price_status: Optional[str] = None  # ok | drifted | unavailable | invalid_options
 
 
 class RestaurantCartGroup(BaseModel):
     id: str
     name: str
     logo: Optional[str] = None
+    logo_variants: Optional[ImageVariants] = None
     items: List[CartItemResponse]
+    subtotal: Optional[float] = None  # at live prices, over items that can be ordered
+    delivery_fee: Optional[float] = None
+    estimated_delivery_minutes: Optional[int] = None
+    serviceable: Optional[bool] = None
 
 
 class CartListResponse(BaseModel):
@@ -27,7 +38,7 @@ class CartListResponse(BaseModel):
 
 class CartItemCreate(BaseModel):
     restaurant_id: str
-    menu_item_id: Optional[str] = None
+    menu_item_id: str  # lines are priced from the menu; there are no custom lines
     name: str
     description: Optional[str] = None
     unit_price: float = Field(gt=0)
@@ -40,3 +51,21 @@ class CartItemCreate(BaseModel):
 
 class CartItemQuantityUpdate(BaseModel):
     quantity: int = Field(ge=1)
+
+
+class CartOp(BaseModel):
+    """
+    One step of POST /cart/ops.
+    add: item. set_quantity: item_id and quantity (0 removes the line).
+    remove: item_id (the whole line), or menu_item_id to take quantity units (default 1)
+    off that item's most recently changed line, like DELETE /cart/menu-items/{id}.
+    """
+    op: Literal["add", "set_quantity", "remove"]
+    item: Optional[CartItemCreate] = None
+    item_id: Optional[str] = None
+    menu_item_id: Optional[str] = None
+    quantity: Optional[int] = Field(default=None, ge=0)
+
+
+class CartOpsRequest(BaseModel):
+    ops: List[CartOp] = Field(min_length=1, max_length=100)
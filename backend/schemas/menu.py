@@ -1,9 +1,23 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
 
+class ImageVariants(BaseModel):
+    """Sized Cloudinary renditions (auto format and quality) of an uploaded image."""
+    thumbnail: str
+    card: str
+    hero: str
+    srcset: str  # uncropped widths, for <img srcset>
+
+
+class ImagePlaceholder(BaseModel):
+    """Shown while the image loads: a blurhash and the image's dominant color ("#rrggbb")."""
+    blurhash: str
+    color: str
+
+
 class RestaurantResponse(BaseModel):
     id: UUID
     name: str
@@ -12,6 +26,10 @@ class RestaurantResponse(BaseModel):
     longitude: Optional[float] = None
     image_url: Optional[str] = None
     logo_url: Optional[str] = None
+    image_variants: Optional[ImageVariants] = None
+    logo_variants: Optional[ImageVariants] = None
+    image_placeholder: Optional[ImagePlaceholder] = None
+    logo_placeholder: Optional[ImagePlaceholder] = None
     rating: Optional[float] = None
     is_open: Optional[bool] = True
     created_at: Optional[datetime] = None
@@ -52,7 +70,30 @@ class MenuItemWithRestaurant(BaseModel):
     restaurant_name: Optional[str] = None
     restaurant_id: Optional[UUID] = None
     delivery_time: Optional[int] = None  # in minutes
+    image_variants: Optional[ImageVariants] = None
+    image_placeholder: Optional[ImagePlaceholder] = None
 
     class Config:
         from_attributes = True
 
+
+class RestaurantPage(BaseModel):
+    """Keyset page of restaurants; pass next_cursor back as ?cursor= for the next page."""
+    items: List[RestaurantResponse]
+    next_cursor: Optional[str] = None
+
+
+class NearbyRestaurant(RestaurantResponse):
+    distance_km: float
+
+
+class NearbyRestaurantPage(BaseModel):
+    """Restaurants nearest first; pass next_cursor back as ?cursor= (same lat/lng/radius_km)."""
+    items: List[NearbyRestaurant]
+    next_cursor: Optional[str] = None
+
+
+class MenuItemPage(BaseModel):
+    """Keyset page of menu items; pass next_cursor back as ?cursor= for the next page."""
+    items: List[MenuItemWithRestaurant]
+    next_cursor: Optional[str] = None
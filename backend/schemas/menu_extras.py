@@ -1,5 +1,8 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from schemas.menu import ImagePlaceholder, ImageVariants, MenuItemWithRestaurant, RestaurantResponse
 
 
 class RestaurantHoursDay(BaseModel):
@@ -20,6 +23,8 @@ class MenuItemCategoryResponse(BaseModel):
     image: Optional[str] = None
     delivery_minutes: Optional[int] = None
     description: Optional[str] = None
+    image_variants: Optional[ImageVariants] = None
+    image_placeholder: Optional[ImagePlaceholder] = None
 
 
 class ModifierOptionResponse(BaseModel):
@@ -36,3 +41,63 @@ class ModifierGroupResponse(BaseModel):
 
 class MenuItemModifiersResponse(BaseModel):
     groups: List[ModifierGroupResponse]
+
+
+class BulkModifiersResponse(BaseModel):
+    # menu item id -> modifier groups (empty list when the item has none)
+    items: Dict[str, List[ModifierGroupResponse]]
+
+
+class RestaurantStorefrontResponse(BaseModel):
+    """Everything the restaurant screen needs, built server-side in one round trip."""
+    restaurant: RestaurantResponse
+    hours: List[RestaurantHoursDay]
+    food: List[MenuItemCategoryResponse]
+    drinks: List[MenuItemCategoryResponse]
+    # menu item id -> modifier groups, only for items that have any
+    modifiers: Dict[str, List[ModifierGroupResponse]]
+
+
+class RestaurantHoursChange(BaseModel):
+    """Full replacement of one restaurant's weekly hours."""
+    restaurant_id: UUID
+    days: List[RestaurantHoursDay]
+
+
+class CatalogDeletions(BaseModel):
+    restaurants: List[UUID] = []
+    menu_items: List[UUID] = []
+
+
+class CatalogChangesResponse(BaseModel):
+    """
+    Current state of everything that changed after `since`. Unavailable menu items are
+    included with is_available=false; rows that no longer exist are listed in deleted.
+    """
+    restaurants: List[RestaurantResponse]
+    menu_items: List[MenuItemWithRestaurant]
+    hours: List[RestaurantHoursChange]
+    deleted: CatalogDeletions
+    next_token: str
+    has_more: bool
+
+
+class MenuItemBatchResponse(BaseModel):
+    """Requested items in request order; ids that do not exist are listed in missing."""
+    items: List[MenuItemWithRestaurant]
+    missing: List[UUID]
+
+
+class MenuSearchResponse(BaseModel):
+    items: List[MenuItemWithRestaurant]
+    total: int
+
+
+class SuggestionResponse(BaseModel):
+    type: str  # "restaurant" | "dish"
+    text: str
+    restaurant_id: Optional[UUID] = None
+
+
+class MenuSuggestResponse(BaseModel):
+    suggestions: List[SuggestionResponse]
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
 
+from schemas.menu import ImageVariants
+
 
 class OrderTabItemResponse(BaseModel):
     id: str
@@ -11,6 +13,7 @@ class OrderTabItemResponse(BaseModel):
     image: Optional[str] = None
     restaurant: str
     options_json: Dict[str, Any] = Field(default_factory=dict)
+    image_variants: Optional[ImageVariants] = None
 
 
 class TrackingStepResponse(BaseModel):
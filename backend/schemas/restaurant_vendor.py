@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -51,3 +51,18 @@ class VerificationDocumentsRequest(BaseModel):
 class RestaurantImageUploadResponse(BaseModel):
     url: str
     public_id: str
+
+
+class DeliveryZone(BaseModel):
+    name: Optional[str] = None
+    points: List[List[float]]  # [[latitude, longitude], ...]
+
+
+class DeliveryZonesRequest(BaseModel):
+    """Replaces all of the restaurant's zones; an empty list means it delivers everywhere."""
+    zones: List[DeliveryZone]
+
+
+class DeliveryZonesResponse(BaseModel):
+    restaurant_id: UUID
+    zones: List[DeliveryZone]
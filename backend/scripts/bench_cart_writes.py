@@ -0,0 +1,166 @@
+"""
+Load test for cart writes: commits per user action with the write-through store
+(CART_STORE=postgres) and the write-behind store (CART_STORE=memory).
+
+Simulated users tap add / +1 / -1 / set quantity concurrently, one session per action
+as in a request. Runs against DATABASE_URL; the synthetic users and restaurant are
+deleted at the end. Both stores must leave the same carts in cart_items.
+
+    python scripts/bench_cart_writes.py --users 200 --actions 30 --think-ms 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, text  # noqa: E402
+
+import database  # noqa: E402
+from config import settings  # noqa: E402
+from schemas.cart import CartItemCreate  # noqa: E402
+from services.cart_store import MemoryCartStore, PostgresCartStore  # noqa: E402
+
+EMAIL = "bench-cart-{}@example.com"
+
+
+async def _setup(users: int, items: int) -> tuple[list[uuid.UUID], uuid.UUID, list[tuple]]:
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    restaurant_id = uuid.uuid4()
+    menu = [(uuid.uuid4(), 1000.0 + 100 * i) for i in range(items)]
+    async with database.AsyncSessionLocal() as db:
+        await db.execute(
+            text("INSERT INTO users (id, email, first_name, last_name) VALUES (:id, :email, 'Bench', 'User')"),
+            [{"id": uid, "email": EMAIL.format(i)} for i, uid in enumerate(user_ids)],
+        )
+        await db.execute(
+            text("INSERT INTO restaurants (id, name, business_verified) VALUES (:id, 'bench cart restaurant', true)"),
+            {"id": restaurant_id},
+        )
+        await db.execute(
+            text("INSERT INTO menu_items (id, restaurant_id, name, price, is_available) VALUES (:id, :r, :n, :p, true)"),
+            [{"id": mid, "r": restaurant_id, "n": f"bench dish {i}", "p": price} for i, (mid, price) in enumerate(menu)],
+        )
+        await db.commit()
+    return user_ids, restaurant_id, menu
+
+
+async def _cleanup(user_ids: list[uuid.UUID], restaurant_id: uuid.UUID) -> None:
+    async with database.AsyncSessionLocal() as db:
+        await db.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": user_ids})
+        await db.execute(text("DELETE FROM menu_items WHERE restaurant_id = :id"), {"id": restaurant_id})
+        await db.execute(text("DELETE FROM restaurants WHERE id = :id"), {"id": restaurant_id})
+        await db.commit()
+
+
+async def _user(store, user_id, restaurant_id, menu, actions, think_ms, seed, latencies) -> None:
+    rng = random.Random(seed)
+    for _ in range(actions):
+        await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+        menu_item_id, price = rng.choice(menu)
+        k = rng.random()
+        start = time.perf_counter()
+        async with database.AsyncSessionLocal() as db:
+            now = datetime.now(timezone.utc)
+            if k < 0.5:
+                body = CartItemCreate(
+                    restaurant_id=str(restaurant_id),
+                    menu_item_id=str(menu_item_id),
+                    name="bench dish",
+                    unit_price=price,
+                    quantity=1,
+                    options_json=rng.choice([{}, {"note": "spicy"}]),
+                )
+                await store.add(db, user_id, body, now)
+            elif k < 0.8:
+                await store.remove_unit(db, user_id, menu_item_id, now)
+            else:
+                rows = await store.rows(db, user_id)
+                if rows:
+                    line = rng.choice(rows)[0]
+                    await store.set_quantity(db, user_id, line.id, rng.randint(1, 4), now)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _carts(user_ids: list[uuid.UUID]) -> list[tuple]:
+    async with database.AsyncSessionLocal() as db:
+        result = await db.execute(
+            text(
+                """
+                SELECT user_id, menu_item_id, options_json::text, quantity FROM cart_items
+                WHERE user_id = ANY(:ids) ORDER BY 1, 2, 3
+                """
+            ),
+            {"ids": user_ids},
+        )
+        rows = result.all()
+        await db.execute(text("DELETE FROM cart_items WHERE user_id = ANY(:ids)"), {"ids": user_ids})
+        await db.commit()
+    return rows
+
+
+async def _run(name, store, user_ids, restaurant_id, menu, actions, think_ms) -> list[tuple]:
+    commits = 0
+
+    def count(conn):
+        nonlocal commits
+        commits += 1
+
+    latencies: list[float] = []
+    await store.start()
+    event.listen(database.engine.sync_engine, "commit", count)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _user(store, uid, restaurant_id, menu, actions, think_ms, i, latencies)
+            for i, uid in enumerate(user_ids)
+        ))
+        await store.close()  # final flush
+    finally:
+        event.remove(database.engine.sync_engine, "commit", count)
+    elapsed = time.perf_counter() - start
+
+    n = len(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[-1] if n > 1 else latencies[0]
+    print(
+        f"{name:>10} {n:>8} {commits:>8} {commits / n:>13.3f} {n / elapsed:>10.0f}"
+        f" {statistics.median(latencies):>8.2f} {p95:>8.2f}"
+    )
+    return await _carts(user_ids)
+
+
+async def main(users: int, actions: int, items: int, think_ms: float, flush_seconds: float) -> None:
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL not set")
+    database.init_db()
+    user_ids, restaurant_id, menu = await _setup(users, items)
+    try:
+        print(f"{users} users x {actions} actions, ~{think_ms:.0f} ms between taps, flush every {flush_seconds}s")
+        print(f"{'store':>10} {'actions':>8} {'commits':>8} {'commits/act':>13} {'act/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        write_through = await _run(
+            "postgres", PostgresCartStore(), user_ids, restaurant_id, menu, actions, think_ms
+        )
+        write_behind = await _run(
+            "memory", MemoryCartStore(flush_seconds), user_ids, restaurant_id, menu, actions, think_ms
+        )
+        assert write_through == write_behind, "stores left different carts"
+    finally:
+        await _cleanup(user_ids, restaurant_id)
+        await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=30, help="cart actions per user")
+    parser.add_argument("--items", type=int, default=20, help="menu items to pick from")
+    parser.add_argument("--think-ms", type=float, default=50, help="mean pause between a user's taps")
+    parser.add_argument("--flush-seconds", type=float, default=settings.CART_FLUSH_SECONDS)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.actions, args.items, args.think_ms, args.flush_seconds))
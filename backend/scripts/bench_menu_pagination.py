@@ -0,0 +1,105 @@
+"""
+Compare legacy LIMIT/OFFSET paging with keyset (cursor) paging on /menu/items.
+
+Runs against DATABASE_URL. Synthetic menu items are inserted inside a transaction
+that is rolled back at the end, so nothing is left behind.
+
+    python scripts/bench_menu_pagination.py --items 50000 --page-size 100
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from config import settings  # noqa: E402
+from database import _build_engine_kwargs  # noqa: E402
+from models.menu_item import MenuItem  # noqa: E402
+from routers.menu import _after_cursor  # noqa: E402
+from services.catalog_paging import encode_cursor  # noqa: E402
+
+
+def _items_query():
+    return (
+        select(MenuItem.id, MenuItem.name)
+        .where(MenuItem.is_available == True)
+        .order_by(MenuItem.name, MenuItem.id)
+    )
+
+
+async def _timed(conn, query, repeat: int) -> tuple[float, list]:
+    samples = []
+    rows: list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = (await conn.execute(query)).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), rows
+
+
+async def main(items: int, page_size: int, repeat: int) -> None:
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL not set")
+    engine = create_async_engine(settings.DATABASE_URL, **_build_engine_kwargs(settings.DATABASE_URL))
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            if items:
+                await conn.execute(
+                    text(
+                        """
+                        INSERT INTO menu_items (id, name, price, is_available)
+                        SELECT gen_random_uuid(), 'bench item ' || lpad(g::text, 7, '0'), 1000, true
+                        FROM generate_series(1, :n) AS g
+                        """
+                    ),
+                    {"n": items},
+                )
+                await conn.execute(text("ANALYZE menu_items"))
+
+            total = (await conn.execute(
+                text("SELECT count(*) FROM menu_items WHERE is_available = true")
+            )).scalar_one()
+            print(f"{total} available menu items, page size {page_size}")
+            print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+
+            depths = [0, 10, 100, 250, 500]
+            for page in depths:
+                offset = page * page_size
+                if offset >= total:
+                    break
+                offset_ms, offset_rows = await _timed(
+                    conn, _items_query().limit(page_size).offset(offset), repeat
+                )
+                # The cursor for page N is the last row of page N-1.
+                cursor = None
+                if offset:
+                    prev = (await conn.execute(
+                        _items_query().limit(1).offset(offset - 1)
+                    )).one()
+                    cursor = encode_cursor(prev.name, prev.id)
+                keyset_ms, keyset_rows = await _timed(
+                    conn,
+                    _after_cursor(_items_query(), MenuItem.name, MenuItem.id, cursor).limit(page_size),
+                    repeat,
+                )
+                assert [r.id for r in offset_rows] == [r.id for r in keyset_rows]
+                print(f"{page:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50000, help="synthetic items to insert (0 = use existing data)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.page_size, args.repeat))
@@ -0,0 +1,110 @@
+"""
+Latency benchmark for the /menu/search index (services.menu_search) at catalog scale.
+
+Builds the in-process index from synthetic menu items (no DB needed), then times a mix of
+exact, multi-word, prefix and misspelled queries. Exits non-zero when p95 misses the target.
+
+    python scripts/bench_menu_search.py --items 100000 --target-ms 20
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.menu_search import MenuSearchIndex  # noqa: E402
+
+DISHES = [
+    "jollof rice", "fried rice", "ofada rice", "coconut rice", "egusi soup", "efo riro",
+    "okra soup", "banga soup", "afang soup", "pepper soup", "suya", "asun", "moi moi",
+    "akara", "puff puff", "chin chin", "amala", "pounded yam", "eba", "semo", "dodo",
+    "gizdodo", "shawarma", "burger", "pizza", "spaghetti", "chicken wings", "grilled fish",
+    "catfish", "goat meat", "beef", "turkey", "plantain", "beans", "yam porridge",
+    "zobo", "chapman", "smoothie", "milkshake", "parfait", "fruit salad", "meat pie",
+]
+ADJECTIVES = [
+    "spicy", "smoky", "party", "special", "classic", "jumbo", "mini", "native", "peppered",
+    "grilled", "fried", "stewed", "crispy", "double", "family", "signature", "local",
+]
+EXTRAS = [
+    "served with coleslaw", "with fried plantain", "and boiled egg", "topped with cheese",
+    "with assorted meat", "in tomato stew", "with chilled drink", "extra pepper", "no onions",
+]
+QUERIES = [
+    "jollof", "jollof rice", "spicy chicken", "egusi", "pounded yam egusi", "suya",
+    "shawarma", "pepper soup goat", "jolof", "sphagetti", "chiken wings", "egussi",
+    "pupf puff", "shaw", "grill", "ja", "smoo", "mama put", "grilled fish plantain",
+    "restaurant 42", "party jollof special",
+]
+
+
+def _items(n: int, restaurants: int) -> list[dict]:
+    rng = random.Random(7)
+    names = [f"Mama Put {i}" if i % 3 == 0 else f"Restaurant {i}" for i in range(restaurants)]
+    ids = [uuid.uuid4() for _ in range(restaurants)]
+    items = []
+    for i in range(n):
+        r = rng.randrange(restaurants)
+        dish = rng.choice(DISHES)
+        items.append({
+            "id": uuid.uuid4(),
+            "name": f"{rng.choice(ADJECTIVES).title()} {dish.title()}" + (f" {i % 97}" if i % 5 == 0 else ""),
+            "description": f"{dish.capitalize()} {rng.choice(EXTRAS)}, {rng.choice(ADJECTIVES)} and {rng.choice(ADJECTIVES)}",
+            "price": float(rng.randrange(500, 15000, 50)),
+            "image_url": None,
+            "is_available": True,
+            "restaurant_name": names[r],
+            "restaurant_id": ids[r],
+            "delivery_time": rng.randrange(10, 60),
+        })
+    return items
+
+
+def main(items: int, restaurants: int, repeat: int, target_ms: float) -> None:
+    rows = _items(items, restaurants)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = MenuSearchIndex.build(rows)
+    build_s = time.perf_counter() - start
+    index_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(f"{len(index)} items indexed in {build_s:.2f}s, ~{index_mb:.0f} MB")
+
+    samples = []
+    print(f"{'query':<24} {'hits':>7} {'median ms':>10}")
+    for q in QUERIES:
+        per_query = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            total, _ = index.search(q, limit=20)
+            per_query.append((time.perf_counter() - t0) * 1000)
+        samples += per_query
+        print(f"{q:<24} {total:>7} {statistics.median(per_query):>10.2f}")
+
+    update_start = time.perf_counter()
+    for row in rows[:1000]:
+        index.upsert(dict(row, name=row["name"] + " deluxe"))
+    update_ms = (time.perf_counter() - update_start) * 1000 / 1000
+
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p95 = samples[int(len(samples) * 0.95)]
+    print(f"p50 {p50:.2f} ms, p95 {p95:.2f} ms, max {samples[-1]:.2f} ms (target p95 {target_ms} ms)")
+    print(f"incremental upsert {update_ms:.3f} ms/item")
+    if p95 > target_ms:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--restaurants", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    main(args.items, args.restaurants, args.repeat, args.target_ms)
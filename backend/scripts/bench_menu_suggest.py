@@ -0,0 +1,88 @@
+"""
+Latency and memory benchmark for /menu/suggest (services.menu_suggest) at catalog scale.
+
+Builds the suggestion index from synthetic restaurants and dishes (no DB needed), then
+times every 1-8 character prefix of a sample of names plus incremental updates. Exits
+non-zero when p99 misses the target.
+
+    python scripts/bench_menu_suggest.py --items 100000 --target-ms 10
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.menu_suggest import MAX_ENTRIES, MenuSuggest, SuggestIndex, Suggestion, _restaurant_suggestion  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_menu_search import ADJECTIVES, DISHES  # noqa: E402
+
+
+class _Row:
+    def __init__(self, **kw):
+        self.__dict__.update(kw)
+
+
+def _catalog(items: int, restaurants: int):
+    rng = random.Random(11)
+    suggest = MenuSuggest()
+    for i in range(items):
+        name = f"{rng.choice(ADJECTIVES).title()} {rng.choice(DISHES).title()}"
+        if i % 4 == 0:
+            name += f" {rng.choice(['Combo', 'Platter', 'Bowl', 'Pack', 'Special'])} {i % 500}"
+        suggest._add_item(uuid.uuid4(), name, rng.randrange(0, 300))
+    rows = [
+        _Row(id=uuid.uuid4(), name=f"{rng.choice(['Mama', 'Chef', 'Iya', 'Bukka', 'The'])} {rng.choice(DISHES).title()} {i}", orders=rng.randrange(0, 2000))
+        for i in range(restaurants)
+    ]
+    suggestions = [_restaurant_suggestion(r) for r in rows]
+    suggestions += [suggest._dish_suggestion(key) for key in suggest._dish_totals]
+    return suggestions
+
+
+def main(items: int, restaurants: int, max_entries: int, target_ms: float) -> None:
+    suggestions = _catalog(items, restaurants)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SuggestIndex.build(suggestions, max_entries)
+    build_s = time.perf_counter() - start
+    index_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(f"{len(suggestions)} candidates, {len(index)} kept (cap {max_entries}), "
+          f"built in {build_s:.2f}s, ~{index_mb:.0f} MB")
+
+    rng = random.Random(5)
+    sample = rng.sample(suggestions, min(500, len(suggestions)))
+    prefixes = [s.text[:n] for s in sample for n in range(1, 9)]
+    samples = []
+    for p in prefixes:
+        t0 = time.perf_counter()
+        index.suggest(p, 8)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"{len(prefixes)} prefixes: p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {samples[-1]:.3f} ms "
+          f"(target p99 {target_ms} ms)")
+
+    start = time.perf_counter()
+    for s in sample[:200]:
+        index.upsert(Suggestion(s.key, s.kind, s.text, s.restaurant_id, s.score + rng.randrange(-50, 50)))
+    print(f"incremental update {(time.perf_counter() - start) * 1000 / 200:.3f} ms/entry")
+    if p99 > target_ms:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--restaurants", type=int, default=800)
+    parser.add_argument("--max-entries", type=int, default=MAX_ENTRIES)
+    parser.add_argument("--target-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    main(args.items, args.restaurants, args.max_entries, args.target_ms)
@@ -0,0 +1,169 @@
+"""
+Compare FastAPI's default response path with the trusted fast-JSON path (services.fast_json).
+
+Default: route returns plain dicts/models -> response_model validation -> jsonable_encoder ->
+json.dumps. Fast: schema-shaped dicts -> pydantic_core.to_json. No DB needed; rows are
+synthetic and both paths must produce the same JSON.
+
+    python scripts/bench_serialization.py --rows 100
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from schemas.cart import CartItemResponse, CartListResponse, RestaurantCartGroup  # noqa: E402
+from schemas.menu import MenuItemWithRestaurant  # noqa: E402
+from schemas.orders_api import OrderSummaryResponse, OrderTabItemResponse  # noqa: E402
+from services.cloudinary_storage import image_variants  # noqa: E402
+from services.fast_json import encode_trusted  # noqa: E402
+
+UPLOADS = "https://res.cloudinary.com/demo/image/upload/v1700000000/fast_bites/restaurants/vendors/mama-put"
+LOGO = f"{UPLOADS}/logo/logo.png"
+
+
+def _menu_rows(n: int) -> list[dict]:
+    rid = uuid.uuid4()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Item {i:04d}",
+            "description": "Grilled chicken with jollof rice and plantain",
+            "price": 2500.0 + i,
+            "image_url": f"{UPLOADS}/menu/{i}.jpg",
+            "is_available": True,
+            "restaurant_id": rid,
+            "restaurant_name": "Mama Put",
+            "delivery_time": 25,
+            "image_variants": image_variants(f"{UPLOADS}/menu/{i}.jpg"),
+            "image_placeholder": {"blurhash": "LEHV6nWB2yk8pyo0adR*.7kCMdnj", "color": "#c0392b"},
+        }
+        for i in range(n)
+    ]
+
+
+def _cart_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Item {i:04d}",
+            "description": "Extra pepper",
+            "price": 1800.0,
+            "quantity": 2,
+            "image": f"{UPLOADS}/menu/{i}.jpg",
+            "section": "food",
+            "menu_item_id": str(uuid.uuid4()),
+            "options_json": {"size": "large", "extras": ["egg", "plantain"]},
+            "image_variants": image_variants(f"{UPLOADS}/menu/{i}.jpg"),
+            "current_price": 1800.0,
+            "price_status": "ok",
+        }
+        for i in range(n)
+    ]
+
+
+def _cases(n: int):
+    """(name, response_model, default-path builder, fast-path builder) per endpoint shape."""
+    menu = _menu_rows(n)
+    cart = _cart_rows(n)
+    tab = [dict(row, restaurant="Mama Put") for row in cart]
+    for row in tab:
+        del row["section"], row["menu_item_id"], row["current_price"], row["price_status"]
+
+    group_fields = {
+        "subtotal": sum(r["current_price"] * r["quantity"] for r in cart),
+        "delivery_fee": 850.0,
+        "estimated_delivery_minutes": 35,
+        "serviceable": True,
+    }
+
+    def cart_default():
+        items = [CartItemResponse(**r) for r in cart]
+        group = RestaurantCartGroup(
+            id="r1", name="Mama Put", logo=LOGO, logo_variants=image_variants(LOGO), items=items, **group_fields
+        )
+        return CartListResponse(orders=[group])
+
+    def cart_fast():
+        return {
+            "orders": [
+                {
+                    "id": "r1",
+                    "name": "Mama Put",
+                    "logo": LOGO,
+                    "logo_variants": image_variants(LOGO),
+                    "items": [dict(r) for r in cart],
+                    **group_fields,
+                }
+            ]
+        }
+
+    def summary_default():
+        return OrderSummaryResponse(items=[OrderTabItemResponse(**r) for r in tab], delivery_fee=1500.0)
+
+    def summary_fast():
+        return {
+            "items": [dict(r) for r in tab],
+            "delivery_fee": 1500.0,
+            "ongoing": None,
+            "pending_order_id": None,
+        }
+
+    return [
+        ("menu items", List[MenuItemWithRestaurant], lambda: [dict(r) for r in menu],
+         lambda: [dict(r) for r in menu]),
+        ("cart", CartListResponse, cart_default, cart_fast),
+        ("order summary", OrderSummaryResponse, summary_default, summary_fast),
+    ]
+
+
+async def _default_path(field, build) -> bytes:
+    content = await serialize_response(field=field, response_content=build())
+    return JSONResponse(content).body
+
+
+def _median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+async def main(rows: int, repeat: int) -> None:
+    print(f"{rows} rows per response, median of {repeat} runs")
+    print(f"{'response':<15} {'default us':>11} {'fast us':>9} {'speedup':>8}")
+    for name, response_type, build_default, build_fast in _cases(rows):
+        field = create_model_field(name="Response_bench", type_=response_type, mode="serialization")
+        default_body = await _default_path(field, build_default)
+        fast_body = encode_trusted(build_fast())
+        assert json.loads(default_body) == json.loads(fast_body), name
+
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await _default_path(field, build_default)
+            samples.append((time.perf_counter() - start) * 1e6)
+        default_us = statistics.median(samples)
+        fast_us = _median_us(lambda: encode_trusted(build_fast()), repeat)
+        print(f"{name:<15} {default_us:>11.0f} {fast_us:>9.0f} {default_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
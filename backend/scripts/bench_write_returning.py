@@ -0,0 +1,124 @@
+"""
+Compare add / commit / refresh with INSERT / UPDATE ... RETURNING (services.db_writes).
+
+Runs against DATABASE_URL. Each write is one request-style transaction on payment_cards
+for a synthetic user, who is deleted (with the cards) at the end.
+
+    python scripts/bench_write_returning.py --repeat 500
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, text  # noqa: E402
+
+import database  # noqa: E402
+from config import settings  # noqa: E402
+from models.payment import PaymentCard  # noqa: E402
+from services.db_writes import insert_returning, update_returning  # noqa: E402
+
+
+def _card(user_id: uuid.UUID) -> dict:
+    return dict(
+        user_id=user_id,
+        cardholder_name="Bench User",
+        last_four="4242",
+        brand="visa",
+        exp_month=12,
+        exp_year=2030,
+        save_details=False,
+        is_default=False,
+    )
+
+
+async def insert_refresh(db, user_id, n):
+    card = PaymentCard(**_card(user_id))
+    db.add(card)
+    await db.commit()
+    await db.refresh(card)
+    return card
+
+
+async def insert_with_returning(db, user_id, n):
+    card = await insert_returning(db, PaymentCard, **_card(user_id))
+    await db.commit()
+    return card
+
+
+async def update_refresh(db, card_id, n):
+    card = await db.get(PaymentCard, card_id)
+    card.exp_month = n % 12 + 1
+    await db.commit()
+    await db.refresh(card)
+    return card
+
+
+async def update_with_returning(db, card_id, n):
+    card = await update_returning(db, PaymentCard, PaymentCard.id == card_id, exp_month=n % 12 + 1)
+    await db.commit()
+    return card
+
+
+async def _timed(write, target, repeat: int) -> tuple[float, float, float]:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    samples = []
+    event.listen(database.engine.sync_engine, "before_cursor_execute", count)
+    try:
+        for n in range(repeat):
+            async with database.AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                await write(db, target, n)
+                samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(database.engine.sync_engine, "before_cursor_execute", count)
+    return statistics.median(samples), statistics.quantiles(samples, n=20)[-1], statements / repeat
+
+
+async def main(repeat: int) -> None:
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL not set")
+    database.init_db()
+    user_id = uuid.uuid4()
+    async with database.AsyncSessionLocal() as db:
+        await db.execute(
+            text("INSERT INTO users (id, email, first_name, last_name) VALUES (:id, :email, 'Bench', 'User')"),
+            {"id": user_id, "email": f"bench-writes-{user_id}@example.com"},
+        )
+        await db.commit()
+    try:
+        async with database.AsyncSessionLocal() as db:
+            card_id = (await insert_with_returning(db, user_id, 0)).id
+        print(f"{'write':>22} {'p50 ms':>8} {'p95 ms':>8} {'statements':>11}")
+        cases = [
+            ("insert + refresh", insert_refresh, user_id),
+            ("insert returning", insert_with_returning, user_id),
+            ("update + refresh", update_refresh, card_id),
+            ("update returning", update_with_returning, card_id),
+        ]
+        for name, write, target in cases:
+            p50, p95, statements = await _timed(write, target, repeat)
+            print(f"{name:>22} {p50:>8.2f} {p95:>8.2f} {statements:>11.1f}")
+    finally:
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM payment_cards WHERE user_id = :id"), {"id": user_id})
+            await db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+            await db.commit()
+        await database.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
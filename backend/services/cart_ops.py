@@ -0,0 +1,240 @@
+"""
+Cart writes: the line upsert behind POST /cart/items and batched POST /cart/ops.
+
+A batch is applied in order, but each run of consecutive ops of the same kind is folded
+into one bulk statement (adds into one multi-row upsert, quantity sets into one UPDATE
+from unnest, ...), so a burst of debounced +/- taps costs a few statements, not one
+round trip per tap. Each op gets its own updated_at (a microsecond apart), so "most
+recently changed line" means the same as if the ops had been sent one by one.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import DateTime, Integer, bindparam, delete, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.cart import CartItem
+from schemas.cart import CartItemCreate, CartOp
+
+
+def cart_line_values(user_id: UUID, body: CartItemCreate, now: datetime) -> dict:
+    return {
+        "user_id": user_id,
+        "restaurant_id": UUID(body.restaurant_id),
+        "menu_item_id": UUID(body.menu_item_id),
+        "name": body.name,
+        "description": body.description,
+        "unit_price": body.unit_price,
+        "quantity": body.quantity,
+        "image_url": body.image_url,
+        "section": body.section,
+        "options_json": body.options_json,
+        "special_instructions": body.special_instructions,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def upsert_cart_lines(values: list[dict]):
+    """
+    INSERT lines; one matching an existing line (uq_cart_items_line) adds to its quantity
+    and takes the newer unit price.
+    """
+    stmt = insert(CartItem).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            CartItem.user_id,
+            CartItem.restaurant_id,
+            CartItem.menu_item_id,
+            CartItem.options_hash,
+        ],
+        set_={
+            "quantity": CartItem.quantity + stmt.excluded.quantity,
+            "unit_price": stmt.excluded.unit_price,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+SET_QUANTITIES_SQL = text(
+    """
+    UPDATE cart_items c SET quantity = v.quantity, updated_at = v.updated_at
+    FROM unnest(:ids, :quantities, :times) AS v(id, quantity, updated_at)
+    WHERE c.id = v.id AND c.user_id = :user_id
+    """
+).bindparams(
+    bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("quantities", type_=ARRAY(Integer)),
+    bindparam("times", type_=ARRAY(DateTime(timezone=True))),
+)
+
+# Same result as calling DELETE /cart/menu-items/{id} once per unit: units come off the
+# most recently changed line first, and spill onto the next line once it is emptied.
+REMOVE_UNITS_SQL = text(
+    """
+    WITH n AS (
+      SELECT * FROM unnest(:menu_item_ids, :units, :times) AS n(menu_item_id, units, updated_at)
+    ),
+    lines AS (
+      SELECT c.id, c.quantity, n.units, n.updated_at,
+             coalesce(sum(c.quantity) OVER (
+               PARTITION BY c.menu_item_id ORDER BY c.updated_at DESC, c.id DESC
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+             ), 0) AS before
+      FROM cart_items c
+      JOIN n ON n.menu_item_id = c.menu_item_id
+      WHERE c.user_id = :user_id
+    ),
+    take AS (
+      SELECT id, quantity, updated_at, least(quantity, units - before) AS taken
+      FROM lines WHERE units > before
+    ),
+    decremented AS (
+      UPDATE cart_items c SET quantity = c.quantity - t.taken, updated_at = t.updated_at
+      FROM take t
+      WHERE c.id = t.id AND t.taken < t.quantity
+    )
+    DELETE FROM cart_items c USING take t WHERE c.id = t.id AND t.taken >= t.quantity
+    """
+).bindparams(
+    bindparam("menu_item_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("units", type_=ARRAY(Integer)),
+    bindparam("times", type_=ARRAY(DateTime(timezone=True))),
+)
+
+
+def _uuid(value: str | None, field: str) -> UUID:
+    try:
+        return UUID(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field}") from None
+
+
+def parse_cart_op(user_id: UUID, op: CartOp, at: datetime) -> tuple[str, object]:
+    """(kind, argument) for one op. Raises ValueError with a client-facing message."""
+    if op.op == "add":
+        if op.item is None:
+            raise ValueError("add needs an item")
+        _uuid(op.item.restaurant_id, "restaurant_id")
+        _uuid(op.item.menu_item_id, "menu_item_id")
+        return "add", cart_line_values(user_id, op.item, at)
+    if op.op == "set_quantity":
+        if op.quantity is None:
+            raise ValueError("set_quantity needs a quantity")
+        return "set_quantity", (_uuid(op.item_id, "item_id"), op.quantity, at)
+    if op.item_id:
+        return "remove_line", _uuid(op.item_id, "item_id")
+    if op.menu_item_id:
+        units = 1 if op.quantity is None else op.quantity
+        return "remove_units", (_uuid(op.menu_item_id, "menu_item_id"), units, at)
+    raise ValueError("remove needs an item_id or a menu_item_id")
+
+
+def _has_servings(options_json: dict | None) -> bool:
+    """Lines with servings carry per-line charges (see services.cart_pricing)."""
+    servings = (options_json or {}).get("servings")
+    return isinstance(servings, list) and len(servings) > 0
+
+
+def line_key(values: dict):
+    """
+    What makes two lines the same line (uq_cart_items_line); None for lines that never
+    merge: lines whose menu item was deleted, and lines with servings, whose sauce and
+    extras are charged once per line, so adding to the quantity would drop a set of them.
+    """
+    if values["menu_item_id"] is None or _has_servings(values["options_json"]):
+        return None
+    return (
+        values["restaurant_id"],
+        values["menu_item_id"],
+        json.dumps(values["options_json"], sort_keys=True),
+        values["special_instructions"] or "",
+    )
+
+
+async def _add(db: AsyncSession, user_id: UUID, args: list) -> None:
+    # Fold repeats first: one upsert may not touch the same line twice
+    lines: dict = {}
+    for values in args:
+        key = line_key(values)
+        if key is None:
+            key = id(values)
+        if key in lines:
+            lines[key]["quantity"] += values["quantity"]
+            lines[key]["unit_price"] = values["unit_price"]
+            lines[key]["updated_at"] = values["updated_at"]
+        else:
+            lines[key] = dict(values)
+    await db.execute(upsert_cart_lines(list(lines.values())))
+
+
+async def _set_quantity(db: AsyncSession, user_id: UUID, args: list) -> None:
+    keep: dict[UUID, tuple[int, datetime]] = {}
+    drop: list[UUID] = []
+    for item_id, quantity, at in args:
+        if item_id in drop:
+            continue  # a removed line stays removed
+        if quantity == 0:
+            keep.pop(item_id, None)
+            drop.append(item_id)
+        else:
+            keep[item_id] = (quantity, at)  # last write wins
+    if keep:
+        await db.execute(
+            SET_QUANTITIES_SQL,
+            {
+                "ids": list(keep),
+                "quantities": [q for q, _ in keep.values()],
+                "times": [at for _, at in keep.values()],
+                "user_id": user_id,
+            },
+        )
+    if drop:
+        await _remove_line(db, user_id, drop)
+
+
+async def _remove_line(db: AsyncSession, user_id: UUID, args: list) -> None:
+    await db.execute(delete(CartItem).where(CartItem.user_id == user_id, CartItem.id.in_(args)))
+
+
+async def _remove_units(db: AsyncSession, user_id: UUID, args: list) -> None:
+    units: dict[UUID, list] = {}
+    for menu_item_id, n, at in args:
+        total = units.setdefault(menu_item_id, [0, at])
+        total[0] += n
+        total[1] = at
+    await db.execute(
+        REMOVE_UNITS_SQL,
+        {
+            "menu_item_ids": list(units),
+            "units": [n for n, _ in units.values()],
+            "times": [at for _, at in units.values()],
+            "user_id": user_id,
+        },
+    )
+
+
+_APPLY = {
+    "add": _add,
+    "set_quantity": _set_quantity,
+    "remove_line": _remove_line,
+    "remove_units": _remove_units,
+}
+
+
+async def apply_cart_ops(
+    db: AsyncSession, user_id: UUID, ops: Sequence[CartOp], now: datetime
+) -> None:
+    """
+    Apply ops in order without committing. Ops naming lines that are not (or no longer)
+    in the user's cart are skipped. Raises ValueError before writing if any op is invalid.
+    """
+    parsed = [parse_cart_op(user_id, op, now + timedelta(microseconds=i)) for i, op in enumerate(ops)]
+    for kind, run in groupby(parsed, key=lambda p: p[0]):
+        await _APPLY[kind](db, user_id, [arg for _, arg in run])
@@ -0,0 +1,161 @@
+"""
+Server-side cart pricing against the live menu.
+
+Cart lines store the unit price the client computed. Before showing totals or checking
+out, every line is re-priced from menu_items.price and the modifier price_delta of the
+options named in its options_json:
+
+  size_id                          per unit   (unit = price + delta)
+  servings[].sauce_id / extras_id  per line   (line = unit * quantity + sum of deltas)
+
+A line is charged its unit price (line / quantity, rounded to 2 decimals) times
+quantity, as the client computes it. Lines with servings are never merged (see
+services.cart_ops.line_key), so each add pays for its own servings.
+
+Lines are flagged "drifted" when the stored price no longer matches, "unavailable" when
+the item was deleted (menu_item_id cleared) or switched off, and "invalid_options" when
+an option does not belong to the item. Per-item pricing inputs are cached per restaurant catalog_version, so a
+cart whose restaurants have not changed is priced without querying its lines.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.cart import CartItem
+from services.catalog_cache import MENU_TTL_SECONDS, menu_item_cache, restaurant_tag
+
+PRICE_TOLERANCE = 0.01  # cart prices are stored with 2 decimals
+ORDERABLE = ("ok", "drifted")
+
+
+@dataclass(slots=True)
+class ItemPricing:
+    restaurant_id: UUID
+    price: float
+    is_available: bool
+    option_prices: dict[str, float]  # modifier option id -> price_delta
+
+
+@dataclass(slots=True)
+class PricedLine:
+    cart_item_id: UUID
+    restaurant_id: UUID
+    status: str  # "ok" | "drifted" | "unavailable" | "invalid_options"
+    unit_price: Optional[float] = None  # live price; set when the line can be ordered
+    line_total: Optional[float] = None
+
+
+@dataclass(slots=True)
+class CartPricing:
+    lines: dict[UUID, PricedLine]  # by cart item id
+    subtotals: dict[UUID, float]  # by restaurant id, over lines that can be ordered
+
+    def unorderable(self) -> list[PricedLine]:
+        return [line for line in self.lines.values() if line.status not in ORDERABLE]
+
+
+PRICING_INPUTS_SQL = text(
+    """
+    SELECT mi.id, mi.restaurant_id, mi.price, mi.is_available, r.catalog_version,
+           coalesce(
+             (SELECT json_object_agg(o.id::text, o.price_delta)
+              FROM menu_modifier_groups g
+              JOIN menu_modifier_options o ON o.group_id = g.id
+              WHERE g.menu_item_id = mi.id),
+             '{}'::json
+           ) AS option_prices
+    FROM menu_items mi
+    JOIN restaurants r ON r.id = mi.restaurant_id
+    WHERE mi.id = ANY(:ids)
+    """
+).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _cache_key(menu_item_id: UUID) -> tuple:
+    return ("pricing", menu_item_id)
+
+
+async def load_item_pricing(
+    db: AsyncSession, menu_item_ids: Sequence[UUID], versions: Mapping[UUID, int]
+) -> dict[UUID, ItemPricing]:
+    """
+    Pricing inputs per menu item. versions maps restaurant id -> current catalog_version;
+    cached entries are used only when they were loaded at that version. Misses are
+    loaded with one statement. Items that no longer exist are absent from the result.
+    """
+    found: dict[UUID, ItemPricing] = {}
+    misses = []
+    for item_id in dict.fromkeys(menu_item_ids):
+        entry = menu_item_cache.get(_cache_key(item_id))
+        if entry is not None:
+            version, pricing = entry
+            if versions.get(pricing.restaurant_id) == version:
+                found[item_id] = pricing
+                continue
+        misses.append(item_id)
+    if misses:
+        result = await db.execute(PRICING_INPUTS_SQL, {"ids": misses})
+        for row in result.all():
+            pricing = ItemPricing(
+                restaurant_id=row.restaurant_id,
+                price=float(row.price),
+                is_available=bool(row.is_available),
+                option_prices={oid: float(delta or 0) for oid, delta in row.option_prices.items()},
+            )
+            found[row.id] = pricing
+            menu_item_cache.set(
+                _cache_key(row.id),
+                (row.catalog_version, pricing),
+                ttl=MENU_TTL_SECONDS,
+                tags=[restaurant_tag(row.restaurant_id)],
+            )
+    return found
+
+
+def _price_line(row: CartItem, pricing: Optional[ItemPricing]) -> PricedLine:
+    line = PricedLine(cart_item_id=row.id, restaurant_id=row.restaurant_id, status="unavailable")
+    if pricing is None or not pricing.is_available or pricing.restaurant_id != row.restaurant_id:
+        return line
+    options = row.options_json or {}
+    per_unit = []
+    per_line = []
+    if options.get("size_id"):
+        per_unit.append(options["size_id"])
+    for serving in options.get("servings") or ():
+        per_line.extend(serving.get(key) for key in ("sauce_id", "extras_id") if serving.get(key))
+    if any(str(oid) not in pricing.option_prices for oid in per_unit + per_line):
+        line.status = "invalid_options"
+        return line
+
+    quantity = int(row.quantity)
+    unit = pricing.price + sum(pricing.option_prices[str(oid)] for oid in per_unit)
+    total = unit * quantity + sum(pricing.option_prices[str(oid)] for oid in per_line)
+    # Rounded per unit first, so unit_price * quantity is exactly what is charged
+    line.unit_price = round(total / quantity, 2)
+    line.line_total = round(line.unit_price * quantity, 2)
+    drifted = abs(line.unit_price - float(row.unit_price)) > PRICE_TOLERANCE
+    line.status = "drifted" if drifted else "ok"
+    return line
+
+
+async def price_cart(
+    db: AsyncSession, rows: Sequence[CartItem], versions: Mapping[UUID, int]
+) -> CartPricing:
+    """Price cart lines; versions maps each restaurant in the cart to its catalog_version."""
+    item_ids = [row.menu_item_id for row in rows if row.menu_item_id]
+    pricing = await load_item_pricing(db, item_ids, versions)
+    lines: dict[UUID, PricedLine] = {}
+    subtotals: dict[UUID, float] = {}
+    for row in rows:
+        line = _price_line(row, pricing.get(row.menu_item_id) if row.menu_item_id else None)
+        lines[row.id] = line
+        subtotal = subtotals.setdefault(row.restaurant_id, 0.0)
+        if line.status in ORDERABLE:
+            subtotals[row.restaurant_id] = round(subtotal + line.line_total, 2)
+    return CartPricing(lines=lines, subtotals=subtotals)
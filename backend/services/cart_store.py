@@ -0,0 +1,475 @@
+"""
+Cart storage behind the /cart routes and checkout.
+
+PostgresCartStore (the default) writes every change through to cart_items and commits
+it in the request that made it. MemoryCartStore (CART_STORE=memory) keeps active carts
+in process memory and writes behind: a change only marks its line dirty, and a
+background task persists every dirty cart each CART_FLUSH_SECONDS in one transaction,
+so a burst of +/- taps from many users costs one commit per interval instead of one per
+tap. Checkout forces a flush of the user's cart first, so orders are built from
+exactly what the user saw.
+
+The memory store is per process, so it is only used with a single worker (the default
+gunicorn setup); with WEB_CONCURRENCY above 1 the postgres store is used instead.
+Changes not yet flushed are lost if the process is killed; a clean shutdown flushes them.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from config import settings
+from models.cart import CartItem
+from models.restaurant import Restaurant
+from schemas.cart import CartItemCreate, CartOp
+from services.cart_ops import (
+    apply_cart_ops,
+    cart_line_values,
+    line_key,
+    parse_cart_op,
+    upsert_cart_lines,
+)
+from services.db_writes import update_returning
+
+log = logging.getLogger(__name__)
+
+IDLE_SECONDS = 600  # clean carts untouched this long are dropped from memory
+UPSERT_CHUNK = 500  # rows per INSERT; keeps a statement under the bind parameter limit
+DELETE_CHUNK = 2000
+
+# Written on flush; options_hash is generated by the database
+_COLUMNS = (
+    "id", "user_id", "restaurant_id", "menu_item_id", "name", "description", "unit_price",
+    "quantity", "image_url", "section", "options_json", "special_instructions",
+    "created_at", "updated_at",
+)
+
+
+def _cart_rows_query(user_id: UUID):
+    return (
+        select(
+            CartItem,
+            Restaurant.name,
+            Restaurant.logo_url,
+            Restaurant.image_url,
+            Restaurant.catalog_version,
+        )
+        .join(Restaurant, CartItem.restaurant_id == Restaurant.id)
+        .where(CartItem.user_id == user_id)
+        .order_by(CartItem.restaurant_id, CartItem.created_at)
+    )
+
+
+class PostgresCartStore:
+    """Every change is written and committed by the request that makes it."""
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def rows(self, db: AsyncSession, user_id: UUID) -> list[tuple]:
+        """
+        (cart line, restaurant name, logo_url, image_url, catalog_version) per line,
+        by restaurant and then in the order the lines were added.
+        """
+        return list((await db.execute(_cart_rows_query(user_id))).all())
+
+    async def add(
+        self, db: AsyncSession, user_id: UUID, body: CartItemCreate, now: datetime
+    ) -> CartItem:
+        stmt = upsert_cart_lines([cart_line_values(user_id, body, now)]).returning(CartItem)
+        item = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        return item
+
+    async def apply_ops(
+        self, db: AsyncSession, user_id: UUID, ops: Sequence[CartOp], now: datetime
+    ) -> None:
+        await apply_cart_ops(db, user_id, ops, now)
+        await db.commit()
+
+    async def set_quantity(
+        self, db: AsyncSession, user_id: UUID, item_id: UUID, quantity: int, now: datetime
+    ) -> Optional[CartItem]:
+        item = await update_returning(
+            db,
+            CartItem,
+            CartItem.id == item_id,
+            CartItem.user_id == user_id,
+            quantity=quantity,
+            updated_at=now,
+        )
+        await db.commit()
+        return item
+
+    async def remove_unit(
+        self, db: AsyncSession, user_id: UUID, menu_item_id: UUID, now: datetime
+    ) -> bool:
+        result = await db.execute(
+            select(CartItem)
+            .where(CartItem.user_id == user_id, CartItem.menu_item_id == menu_item_id)
+            .order_by(CartItem.updated_at.desc())
+            .limit(1)
+        )
+        item = result.scalar_one_or_none()
+        if not item:
+            return False
+        if item.quantity > 1:
+            item.quantity -= 1
+            item.updated_at = now
+        else:
+            await db.delete(item)
+        await db.commit()
+        return True
+
+    async def remove_line(self, db: AsyncSession, user_id: UUID, item_id: UUID) -> bool:
+        result = await db.execute(
+            delete(CartItem).where(CartItem.id == item_id, CartItem.user_id == user_id)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    async def remove_restaurant(
+        self, db: AsyncSession, user_id: UUID, restaurant_id: UUID
+    ) -> None:
+        await db.execute(
+            delete(CartItem).where(
+                CartItem.user_id == user_id,
+                CartItem.restaurant_id == restaurant_id,
+            )
+        )
+        await db.commit()
+
+    @asynccontextmanager
+    async def checkout(self, db: AsyncSession, user_id: UUID) -> AsyncIterator[None]:
+        """cart_items is already up to date."""
+        yield
+
+
+@dataclass(eq=False)
+class _HotCart:
+    lines: Optional[dict[UUID, CartItem]] = None  # None until loaded from cart_items
+    dirty: set[UUID] = field(default_factory=set)  # lines to upsert on the next flush
+    deleted: set[UUID] = field(default_factory=set)  # lines to delete on the next flush
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    touched: float = field(default_factory=time.monotonic)
+
+
+def _upsert_by_id(values: list[dict]):
+    stmt = insert(CartItem).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[CartItem.id],
+        set_={
+            "unit_price": stmt.excluded.unit_price,
+            "quantity": stmt.excluded.quantity,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+class MemoryCartStore:
+    """
+    Write-behind store: carts are read from cart_items once, then served and changed in
+    memory. Line semantics (merging identical lines, which line a unit comes off) match
+    PostgresCartStore.
+    """
+
+    def __init__(self, flush_seconds: float, idle_seconds: float = IDLE_SECONDS):
+        self.flush_seconds = flush_seconds
+        self.idle_seconds = idle_seconds
+        self._carts: dict[UUID, _HotCart] = {}
+        self._flush_lock = asyncio.Lock()  # one flush writing at a time
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None and database.AsyncSessionLocal:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background flush once a flush in progress is done, then flush the rest."""
+        task, self._task = self._task, None
+        if task is not None:
+            async with self._flush_lock:
+                task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await self.flush_all()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush_all()
+            except Exception as e:
+                log.error("Cart flush failed: %s", e)
+
+    @asynccontextmanager
+    async def _locked(self, user_id: UUID) -> AsyncIterator[_HotCart]:
+        """The user's cart, locked; not loaded yet if it was not in memory."""
+        while True:
+            cart = self._carts.setdefault(user_id, _HotCart())
+            async with cart.lock:
+                if self._carts.get(user_id) is not cart:
+                    continue  # evicted or dropped while we waited
+                cart.touched = time.monotonic()
+                yield cart
+                return
+
+    @asynccontextmanager
+    async def _cart(self, db: AsyncSession, user_id: UUID) -> AsyncIterator[_HotCart]:
+        async with self._locked(user_id) as cart:
+            if cart.lines is None:
+                result = await db.execute(select(CartItem).where(CartItem.user_id == user_id))
+                items = result.scalars().all()
+                for item in items:
+                    db.expunge(item)
+                cart.lines = {item.id: item for item in items}
+            yield cart
+
+    # -- reads -----------------------------------------------------------------
+
+    async def rows(self, db: AsyncSession, user_id: UUID) -> list[tuple]:
+        """As PostgresCartStore.rows; lines are copies, so later changes do not show through."""
+        async with self._cart(db, user_id) as cart:
+            lines = sorted(
+                (_copy(line) for line in cart.lines.values()),
+                key=lambda l: (l.restaurant_id, l.created_at),
+            )
+        if not lines:
+            return []
+        result = await db.execute(
+            select(
+                Restaurant.id,
+                Restaurant.name,
+                Restaurant.logo_url,
+                Restaurant.image_url,
+                Restaurant.catalog_version,
+            ).where(Restaurant.id.in_({line.restaurant_id for line in lines}))
+        )
+        restaurants = {row.id: tuple(row)[1:] for row in result.all()}
+        return [
+            (line, *restaurants[line.restaurant_id])
+            for line in lines
+            if line.restaurant_id in restaurants
+        ]
+
+    # -- changes (in memory) ---------------------------------------------------
+
+    @staticmethod
+    def _add(cart: _HotCart, values: dict) -> CartItem:
+        key = line_key(values)
+        if key is not None:
+            for line in cart.lines.values():
+                if line.menu_item_id is not None and line_key(_values(line)) == key:
+                    line.quantity += values["quantity"]
+                    line.unit_price = values["unit_price"]
+                    line.updated_at = values["updated_at"]
+                    cart.dirty.add(line.id)
+                    return line
+        line = CartItem(id=uuid.uuid4(), **values)
+        cart.lines[line.id] = line
+        cart.dirty.add(line.id)
+        return line
+
+    @staticmethod
+    def _remove_line(cart: _HotCart, item_id: UUID) -> bool:
+        if cart.lines.pop(item_id, None) is None:
+            return False
+        cart.dirty.discard(item_id)
+        cart.deleted.add(item_id)
+        return True
+
+    @classmethod
+    def _set_quantity(cls, cart: _HotCart, item_id: UUID, quantity: int, at: datetime):
+        line = cart.lines.get(item_id)
+        if line is None:
+            return None
+        if quantity == 0:
+            cls._remove_line(cart, item_id)
+            return None
+        line.quantity = quantity
+        line.updated_at = at
+        cart.dirty.add(item_id)
+        return line
+
+    @classmethod
+    def _remove_units(cls, cart: _HotCart, menu_item_id: UUID, units: int, at: datetime) -> bool:
+        """Units come off the most recently changed line first (see REMOVE_UNITS_SQL)."""
+        lines = sorted(
+            (line for line in cart.lines.values() if line.menu_item_id == menu_item_id),
+            key=lambda l: (l.updated_at, l.id),
+            reverse=True,
+        )
+        for line in lines:
+            if units <= 0:
+                break
+            if line.quantity > units:
+                line.quantity -= units
+                line.updated_at = at
+                cart.dirty.add(line.id)
+                break
+            units -= line.quantity
+            cls._remove_line(cart, line.id)
+        return bool(lines)
+
+    async def add(
+        self, db: AsyncSession, user_id: UUID, body: CartItemCreate, now: datetime
+    ) -> CartItem:
+        values = cart_line_values(user_id, body, now)
+        async with self._cart(db, user_id) as cart:
+            return _copy(self._add(cart, values))
+
+    async def apply_ops(
+        self, db: AsyncSession, user_id: UUID, ops: Sequence[CartOp], now: datetime
+    ) -> None:
+        parsed = [parse_cart_op(user_id, op, now + timedelta(microseconds=i)) for i, op in enumerate(ops)]
+        async with self._cart(db, user_id) as cart:
+            for kind, arg in parsed:
+                if kind == "add":
+                    self._add(cart, arg)
+                elif kind == "set_quantity":
+                    self._set_quantity(cart, *arg)
+                elif kind == "remove_line":
+                    self._remove_line(cart, arg)
+                else:
+                    self._remove_units(cart, *arg)
+
+    async def set_quantity(
+        self, db: AsyncSession, user_id: UUID, item_id: UUID, quantity: int, now: datetime
+    ) -> Optional[CartItem]:
+        async with self._cart(db, user_id) as cart:
+            line = self._set_quantity(cart, item_id, quantity, now)
+            return _copy(line) if line is not None else None
+
+    async def remove_unit(
+        self, db: AsyncSession, user_id: UUID, menu_item_id: UUID, now: datetime
+    ) -> bool:
+        async with self._cart(db, user_id) as cart:
+            return self._remove_units(cart, menu_item_id, 1, now)
+
+    async def remove_line(self, db: AsyncSession, user_id: UUID, item_id: UUID) -> bool:
+        async with self._cart(db, user_id) as cart:
+            return self._remove_line(cart, item_id)
+
+    async def remove_restaurant(
+        self, db: AsyncSession, user_id: UUID, restaurant_id: UUID
+    ) -> None:
+        async with self._cart(db, user_id) as cart:
+            for line in [l for l in cart.lines.values() if l.restaurant_id == restaurant_id]:
+                self._remove_line(cart, line.id)
+
+    # -- persistence -----------------------------------------------------------
+
+    async def _write(self, db: AsyncSession, carts: list[_HotCart]) -> None:
+        """Persist the pending changes of carts in one transaction. Caller holds _flush_lock."""
+        taken = []
+        upserts: list[dict] = []
+        deletes: list[UUID] = []
+        for cart in carts:
+            upserts.extend(_values(cart.lines[item_id]) for item_id in cart.dirty)
+            deletes.extend(cart.deleted)
+            taken.append((cart, cart.dirty, cart.deleted))
+            cart.dirty, cart.deleted = set(), set()
+        try:
+            # Deletes first: a re-added line may reuse the line key of a deleted one
+            for i in range(0, len(deletes), DELETE_CHUNK):
+                await db.execute(delete(CartItem).where(CartItem.id.in_(deletes[i:i + DELETE_CHUNK])))
+            for i in range(0, len(upserts), UPSERT_CHUNK):
+                await db.execute(_upsert_by_id(upserts[i:i + UPSERT_CHUNK]))
+            await db.commit()
+        except BaseException:
+            # Also on cancellation: the changes stay pending for the next flush
+            for cart, dirty, deleted in taken:
+                cart.dirty |= {item_id for item_id in dirty if item_id in cart.lines}
+                cart.deleted |= deleted
+            await db.rollback()
+            raise
+
+    async def flush_all(self) -> None:
+        """Persist every dirty cart in one transaction, then drop idle carts from memory."""
+        if not database.AsyncSessionLocal:
+            return
+        async with self._flush_lock:
+            pending = [(uid, c) for uid, c in self._carts.items() if c.dirty or c.deleted]
+            if pending:
+                try:
+                    async with database.AsyncSessionLocal() as db:
+                        await self._write(db, [cart for _, cart in pending])
+                except Exception as e:
+                    log.warning("Cart flush of %d carts failed, retrying each: %s", len(pending), e)
+                    await self._write_each(pending)
+        self._evict_idle()
+
+    async def _write_each(self, pending: list[tuple[UUID, _HotCart]]) -> None:
+        for user_id, cart in pending:
+            try:
+                async with database.AsyncSessionLocal() as db:
+                    await self._write(db, [cart])
+            except IntegrityError as e:
+                # e.g. the restaurant was deleted: cart_items stays as it is
+                log.error("Dropping unsaved cart changes for user %s: %s", user_id, e)
+                if self._carts.get(user_id) is cart:
+                    del self._carts[user_id]
+            except Exception as e:
+                log.error("Cart flush failed for user %s: %s", user_id, e)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        for user_id, cart in list(self._carts.items()):
+            if cart.touched < cutoff and not (cart.dirty or cart.deleted or cart.lock.locked()):
+                del self._carts[user_id]
+
+    @asynccontextmanager
+    async def checkout(self, db: AsyncSession, user_id: UUID) -> AsyncIterator[None]:
+        """
+        Durability flush: persist the user's cart (and wait out a flush in progress) so
+        checkout reads it from cart_items, and hold the cart until checkout is done. The
+        cart is then reloaded from cart_items on next use.
+        """
+        async with self._locked(user_id) as cart:
+            async with self._flush_lock:
+                if cart.dirty or cart.deleted:
+                    await self._write(db, [cart])
+            try:
+                yield
+            finally:
+                if self._carts.get(user_id) is cart and not (cart.dirty or cart.deleted):
+                    del self._carts[user_id]
+
+
+def _values(line: CartItem) -> dict:
+    return {column: getattr(line, column) for column in _COLUMNS}
+
+
+def _copy(line: CartItem) -> CartItem:
+    return CartItem(**_values(line))
+
+
+def _build_store():
+    if settings.CART_STORE == "memory":
+        if settings.WEB_CONCURRENCY > 1:
+            log.warning(
+                "CART_STORE=memory needs a single worker, WEB_CONCURRENCY is %d: using postgres",
+                settings.WEB_CONCURRENCY,
+            )
+            return PostgresCartStore()
+        return MemoryCartStore(settings.CART_FLUSH_SECONDS)
+    return PostgresCartStore()
+
+
+cart_store = _build_store()
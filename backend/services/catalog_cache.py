@@ -0,0 +1,98 @@
+"""In-process cache for public /menu catalog reads, tagged by restaurant for invalidation."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+from uuid import UUID
+
+# Tag carried by responses that span many restaurants (lists, search, …).
+# Any restaurant write can change them, so they are dropped on every invalidation.
+LIST_TAG = "restaurants:list"
+
+RESTAURANT_TTL_SECONDS = 60  # open/closed status is part of the payload
+MENU_TTL_SECONDS = 300
+# restaurants.catalog_version lookups; bounds how long another worker's write can go unseen
+CATALOG_VERSION_TTL_SECONDS = 5
+
+
+def restaurant_tag(restaurant_id: UUID | str) -> str:
+    return f"restaurant:{restaurant_id}"
+
+
+class TaggedTTLCache:
+    """Size-bounded LRU with per-entry TTL and tag-based invalidation."""
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any, frozenset[str]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, *, ttl: float, tags: Iterable[str] = ()) -> None:
+        if key in self._entries:
+            self._discard(key)
+        tag_set = frozenset(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tag_set)
+        for tag in tag_set:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        keys: set[Hashable] = set()
+        for tag in tags:
+            keys |= self._keys_by_tag.pop(tag, set())
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+catalog_cache = TaggedTTLCache()
+# Per-item payloads for /menu/items:batch; separate so a few large batches cannot evict
+# the response cache. Entries are tagged with their restaurant like everything else.
+menu_item_cache = TaggedTTLCache(maxsize=20000)
+
+
+def invalidate_restaurant(restaurant_id: Optional[UUID | str]) -> None:
+    """
+    Drop cached catalog responses for a restaurant.
+
+    Call after committing any write to the restaurant row, its menu items or its hours.
+    List responses are dropped as well since they may contain (or newly include) it.
+    """
+    tags = [LIST_TAG]
+    if restaurant_id is not None:
+        tags.append(restaurant_tag(restaurant_id))
+    catalog_cache.invalidate_tags(*tags)
+    menu_item_cache.invalidate_tags(*tags)
@@ -0,0 +1,266 @@
+"""
+Reader for the catalog_changes log (see /menu/changes and services.menu_search).
+
+The log only keeps CATALOG_CHANGES_RETENTION_DAYS of history: CatalogChangePruner deletes
+older rows, but never past the position of a follower in this process. A reader whose
+position is below the pruned part gets CatalogPositionExpired and starts over from a
+snapshot of the current catalog (read_catalog_snapshot, or a follower's rebuild).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import database
+from config import settings
+
+log = logging.getLogger(__name__)
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class CatalogPositionExpired(Exception):
+    """The log was pruned past this position; start over from a snapshot."""
+
+
+# A position in the log is (txid, id). Changes are read in that order and only below the
+# oldest transaction still in flight, so a write that commits late can never land behind
+# a position a reader has already passed.
+CATALOG_CHANGES_SQL = text(
+    """
+    WITH snap AS (
+      SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS upper
+    )
+    SELECT snap.upper, f.pruned_txid, f.pruned_id, c.txid, c.id, c.entity, c.entity_id
+    FROM snap
+    CROSS JOIN catalog_change_log_state f
+    LEFT JOIN LATERAL (
+      SELECT txid, id, entity, entity_id
+      FROM catalog_changes
+      WHERE (txid, id) > (:after_txid, :after_id) AND txid < snap.upper
+      ORDER BY txid, id
+      LIMIT :limit
+    ) c ON true
+    """
+)
+
+
+async def read_catalog_changes(
+    db: AsyncSession, after: tuple[int, int], limit: int
+) -> tuple[list, tuple[int, int], bool]:
+    """
+    Up to `limit` log rows (entity, entity_id, ...) after `after`.
+    Returns (rows, next position, has_more). Raises CatalogPositionExpired when rows
+    after `after` have been pruned.
+    """
+    result = await db.execute(
+        CATALOG_CHANGES_SQL,
+        {"after_txid": after[0], "after_id": after[1], "limit": limit + 1},
+    )
+    rows = result.all()
+    if tuple(after) < (rows[0].pruned_txid, rows[0].pruned_id):
+        raise CatalogPositionExpired()
+    upper = rows[0].upper
+    changes = [r for r in rows if r.id is not None]
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        position = (changes[-1].txid, changes[-1].id)
+    else:
+        # Everything below the snapshot horizon has been seen
+        position = (max(upper, after[0]), 0)
+    return changes, position, has_more
+
+
+async def current_catalog_position(db: AsyncSession) -> tuple[int, int]:
+    """Position just past every change already committed (for readers that load a snapshot)."""
+    result = await db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    return result.scalar_one(), 0
+
+
+# Snapshot of the current catalog in the shape of log rows, one entity after the other
+SNAPSHOT_ENTITIES = ("restaurant", "menu_item", "hours")
+SNAPSHOT_SQL = [
+    text(
+        f"""
+        SELECT DISTINCT '{entity}' AS entity, {column} AS entity_id FROM {table}
+        WHERE {column} > :after ORDER BY {column} LIMIT :limit
+        """
+    )
+    for entity, table, column in zip(
+        SNAPSHOT_ENTITIES,
+        ("restaurants", "menu_items", "restaurant_hours"),
+        ("id", "id", "restaurant_id"),
+    )
+]
+_SNAPSHOT_START = UUID(int=0)
+
+
+async def read_catalog_snapshot(
+    db: AsyncSession, cursor: tuple[int, Optional[UUID]], limit: int
+) -> tuple[list, Optional[tuple[int, UUID]], bool]:
+    """
+    Up to `limit` rows (entity, entity_id) of every restaurant, menu item and restaurant
+    with hours, after cursor (entity index, last id; (0, None) to start). Returns (rows,
+    next cursor, has_more). Take current_catalog_position before the first page and
+    read the log from there afterwards: changes made while paging are replayed.
+    """
+    index, after = cursor
+    rows: list = []
+    while index < len(SNAPSHOT_SQL):
+        want = limit + 1 - len(rows)
+        batch = (await db.execute(SNAPSHOT_SQL[index], {"after": after or _SNAPSHOT_START, "limit": want})).all()
+        rows.extend(batch)
+        if len(batch) == want:
+            break
+        index, after = index + 1, None
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not has_more:
+        return rows, None, False
+    last = rows[-1]
+    return rows, (SNAPSHOT_ENTITIES.index(last.entity), last.entity_id), True
+
+
+PRUNE_CATALOG_CHANGES_SQL = text(
+    """
+    WITH cut AS (
+      SELECT txid, id FROM catalog_changes
+      WHERE changed_at < now() - make_interval(days => :days)
+        AND (txid, id) <= (:keep_txid, :keep_id)
+        AND txid < pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+      ORDER BY txid DESC, id DESC
+      LIMIT 1
+    ),
+    state AS (
+      UPDATE catalog_change_log_state f SET pruned_txid = cut.txid, pruned_id = cut.id
+      FROM cut
+      WHERE (cut.txid, cut.id) > (f.pruned_txid, f.pruned_id)
+      RETURNING f.pruned_txid, f.pruned_id
+    )
+    DELETE FROM catalog_changes c
+    USING state
+    WHERE (c.txid, c.id) <= (state.pruned_txid, state.pruned_id)
+    """
+)
+
+_followers: "weakref.WeakSet[CatalogFollower]" = weakref.WeakSet()
+
+
+async def prune_catalog_changes(db: AsyncSession, days: int) -> int:
+    """
+    Delete log rows older than `days`, up to the oldest follower position in this
+    process (followers elsewhere rebuild when they fall behind). Returns rows deleted.
+    """
+    positions = [f._position for f in _followers if f._position is not None]
+    keep = min(positions, default=(2**62, 0))
+    result = await db.execute(
+        PRUNE_CATALOG_CHANGES_SQL, {"days": days, "keep_txid": keep[0], "keep_id": keep[1]}
+    )
+    await db.commit()
+    return result.rowcount
+
+
+class CatalogChangePruner:
+    """Runs prune_catalog_changes every PRUNE_INTERVAL_SECONDS (started in main.lifespan)."""
+
+    def __init__(self, days: int, interval: float = PRUNE_INTERVAL_SECONDS):
+        self.days = days
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None and database.AsyncSessionLocal:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with database.AsyncSessionLocal() as db:
+                    deleted = await prune_catalog_changes(db, self.days)
+                if deleted:
+                    log.info("Pruned %d catalog change log rows", deleted)
+            except Exception as e:
+                log.error("Catalog change log pruning failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+
+catalog_change_pruner = CatalogChangePruner(settings.CATALOG_CHANGES_RETENTION_DAYS)
+
+
+class CatalogFollower(ABC):
+    """
+    Base for process-wide in-memory catalog indexes. Builds on first use, then replays
+    the catalog_changes log at most every sync_interval seconds; falls back to a full
+    rebuild when the backlog is large, when its position was pruned from the log, or
+    every rebuild_interval seconds (when set).
+    """
+
+    sync_interval = 2.0
+    rebuild_after_changes = 5000  # a backlog this large is cheaper to rebuild than to replay
+    rebuild_interval: Optional[float] = None
+
+    def __init__(self) -> None:
+        self._position: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+        _followers.add(self)
+
+    @abstractmethod
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Load the index from the catalog tables."""
+
+    @abstractmethod
+    async def apply_changes(self, db: AsyncSession, changed: dict[str, set[UUID]]) -> None:
+        """changed maps entity ("restaurant", "menu_item", "hours") to the ids touched."""
+
+    def _fresh(self) -> bool:
+        return self._position is not None and time.monotonic() - self._checked_at < self.sync_interval
+
+    async def refresh(self, db: AsyncSession) -> None:
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            due = self.rebuild_interval is not None and time.monotonic() - self._built_at >= self.rebuild_interval
+            if self._position is None or due or not await self._catch_up(db):
+                # Position first: anything committed before it is in the load, anything
+                # after it is replayed on the next refresh.
+                position = await current_catalog_position(db)
+                await self.rebuild(db)
+                self._position = position
+                self._built_at = time.monotonic()
+            self._checked_at = time.monotonic()
+
+    async def _catch_up(self, db: AsyncSession) -> bool:
+        changed: dict[str, set[UUID]] = {"restaurant": set(), "menu_item": set(), "hours": set()}
+        position = self._position
+        has_more = True
+        while has_more:
+            try:
+                changes, position, has_more = await read_catalog_changes(db, position, 1000)
+            except CatalogPositionExpired:
+                return False
+            for change in changes:
+                changed[change.entity].add(change.entity_id)
+            if sum(map(len, changed.values())) > self.rebuild_after_changes:
+                return False
+        if any(changed.values()):
+            await self.apply_changes(db, changed)
+        self._position = position
+        return True
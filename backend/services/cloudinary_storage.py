@@ -1,12 +1,14 @@
 import logging
 import re
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import cloudinary
 import cloudinary.uploader
-from fastapi import HTTPException, UploadFile
+from fastapi import BackgroundTasks, HTTPException, UploadFile
 
 from config import settings
+from services.image_placeholders import store_image_placeholder
 
 log = logging.getLogger(__name__)
 
@@ -16,6 +18,25 @@ ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 ALLOWED_DOCUMENT_CONTENT_TYPES = ALLOWED_CONTENT_TYPES | {"application/pdf"}
 ALLOWED_KINDS = {"logo", "cover", "document", "menu"}
 
+CLOUDINARY_DELIVERY_HOST = "res.cloudinary.com"
+# Sized renditions per image kind. Photos are cropped around the subject; logos are
+# fitted whole. f_auto/q_auto let Cloudinary pick format (AVIF/WebP) and compression.
+IMAGE_DELIVERY = "f_auto,q_auto"
+IMAGE_VARIANTS = {
+    "photo": {
+        "thumbnail": "c_fill,g_auto,w_160,h_160",
+        "card": "c_fill,g_auto,w_480,h_320",
+        "hero": "c_fill,g_auto,w_1200,h_630",
+    },
+    "logo": {
+        "thumbnail": "c_fit,w_96,h_96",
+        "card": "c_fit,w_240,h_240",
+        "hero": "c_fit,w_480,h_480",
+    },
+}
+# Uncropped widths for srcset, so the browser can pick by layout size and DPR
+SRCSET_WIDTHS = {"photo": (320, 640, 960, 1280), "logo": (96, 192, 384)}
+
 
 def _normalize_cloudinary_url(raw: str) -> str:
     value = raw.strip()
@@ -118,6 +139,64 @@ def upload_folder_for(
     return f"{base}/{safe_user_id}/documents/{safe_key}"
 
 
+_IMAGE_FOLDER_KINDS = {"logo": "logo", "logos": "logo", "cover": "cover", "covers": "cover", "menu": "menu"}
+
+
+def _upload_base() -> str:
+    return settings.CLOUDINARY_UPLOAD_FOLDER.strip().strip("/")
+
+
+def image_kind_for_public_id(public_id: str) -> str | None:
+    """
+    Inverse of upload_folder_for for images: "logo", "cover" or "menu", or None for
+    documents and anything outside CLOUDINARY_UPLOAD_FOLDER.
+    """
+    base = _upload_base()
+    if not base or not public_id.startswith(base + "/"):
+        return None
+    parts = public_id[len(base) + 1:].split("/")
+    if parts[0] == "vendors":
+        parts = parts[1:]  # vendors/{restaurant_slug}/{kind}/...
+    # else {user_id}/{logos|covers|menu}/...
+    if len(parts) < 3:
+        return None
+    return _IMAGE_FOLDER_KINDS.get(parts[1])
+
+
+@lru_cache(maxsize=8192)
+def image_variants(url: str | None) -> dict[str, str] | None:
+    """
+    thumbnail/card/hero URLs and a srcset for an image uploaded by this module, derived
+    from the stored secure_url (no API call). None for other URLs. Callers must not
+    mutate the returned dict (it is cached).
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.hostname != CLOUDINARY_DELIVERY_HOST or "/image/upload/" not in parsed.path:
+        return None
+    cloud_path, rest = parsed.path.split("/image/upload/", 1)
+    # rest is [transformations/][v<version>/]<public_id>.<ext>; the public id starts at our folder
+    start = rest.find(_upload_base() + "/")
+    if start < 0 or (start > 0 and rest[start - 1] != "/"):
+        return None
+    public_path = rest[start:]
+    version = next((seg for seg in rest[:start].split("/") if re.fullmatch(r"v\d+", seg)), None)
+    kind = image_kind_for_public_id(public_path.rsplit(".", 1)[0])
+    if kind is None:
+        return None
+    style = "logo" if kind == "logo" else "photo"
+    root = f"https://{CLOUDINARY_DELIVERY_HOST}{cloud_path}/image/upload"
+    tail = f"{version}/{public_path}" if version else public_path
+
+    def build(transformation: str) -> str:
+        return f"{root}/{transformation},{IMAGE_DELIVERY}/{tail}"
+
+    variants = {name: build(t) for name, t in IMAGE_VARIANTS[style].items()}
+    variants["srcset"] = ", ".join(f"{build(f'c_limit,w_{w}')} {w}w" for w in SRCSET_WIDTHS[style])
+    return variants
+
+
 async def upload_restaurant_image(
     file: UploadFile,
     kind: str,
@@ -127,7 +206,12 @@ async def upload_restaurant_image(
     restaurant_id: str | None = None,
     restaurant_name: str | None = None,
     menu_item_name: str | None = None,
+    background_tasks: BackgroundTasks | None = None,
 ) -> dict[str, str]:
+    """
+    Upload into the vendor folder structure. For images, a blurhash/color placeholder is
+    computed after the response when background_tasks is given (services.image_placeholders).
+    """
     if kind not in ALLOWED_KINDS:
         raise HTTPException(status_code=400, detail="Invalid image kind")
 
@@ -192,6 +276,8 @@ async def upload_restaurant_image(
     if not secure_url or not public_id_result:
         raise HTTPException(status_code=502, detail="Upload succeeded but no URL was returned")
 
+    if background_tasks is not None and kind != "document":
+        background_tasks.add_task(store_image_placeholder, secure_url, data)
     return {"url": secure_url, "public_id": public_id_result}
 
 
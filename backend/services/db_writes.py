@@ -0,0 +1,36 @@
+"""
+Single round trip writes: INSERT / UPDATE ... RETURNING the whole row.
+
+Replaces add + commit + refresh, where the refresh is a second SELECT only to read back
+generated ids, server defaults and columns set by triggers. RETURNING hands back the
+row as stored, so the object is current without it. Returned objects are attached to
+the session like loaded rows; an object already in the session is updated in place.
+Nothing is committed here.
+"""
+from typing import Optional, TypeVar
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+async def insert_returning(db: AsyncSession, model: type[T], **values) -> T:
+    """INSERT one row; Python-side column defaults (ids, ...) apply as with db.add."""
+    stmt = insert(model).values(**values).returning(model)
+    return (await db.execute(stmt)).scalar_one()
+
+
+async def update_returning(db: AsyncSession, model: type[T], *where, **values) -> Optional[T]:
+    """
+    UPDATE the row matching where (a primary key or unique lookup) and return it, or
+    None if nothing matched. Values may be SQL expressions, e.g. balance=Wallet.balance + 5.
+    """
+    stmt = (
+        update(model)
+        .where(*where)
+        .values(**values)
+        .returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
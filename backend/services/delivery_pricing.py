@@ -0,0 +1,180 @@
+"""
+Delivery fee and ETA quotes from restaurant-to-customer distance.
+
+fee = fee curve at the estimated road distance (straight-line x DELIVERY_ROUTE_FACTOR),
+rounded up to DELIVERY_FEE_STEP. ETA = prep time + road distance at DELIVERY_SPEED_KMH.
+Prep time is the restaurant's median confirmed-to-dispatched time over recent orders
+(between the completed_at of the "Order confirmed" and "Out for delivery" tracking
+steps), else the average delivery_time on its menu, else DELIVERY_DEFAULT_PREP_MINUTES.
+Nothing in this backend completes the dispatch step yet (checkout only completes the
+confirmation step), so until a dispatch flow records it the prep time, and with it the
+ETA, comes from the menu and does not follow actual preparation times.
+
+Inputs for every restaurant in a cart are loaded in one statement and priced together;
+the same statement checks the restaurant's delivery zones (services.delivery_zones).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from services.geo import haversine_km
+
+PREP_WINDOW_DAYS = 14
+PREP_MIN_SAMPLES = 5
+CONFIRMED_STEP_ORDER = 1  # "Order confirmed" in order_checkout.TRACKING_STEP_TEMPLATE
+DISPATCH_STEP_ORDER = 3  # "Out for delivery"; see the module docstring
+
+
+@dataclass(slots=True)
+class DeliveryQuote:
+    restaurant_id: UUID
+    distance_km: Optional[float]  # straight-line; None when a location is unknown
+    fee: float
+    minutes: int
+    # False when the customer is outside all of the restaurant's zones; None when the
+    # restaurant has zones but the customer has no saved location to check them against
+    serviceable: Optional[bool] = True
+
+
+@lru_cache(maxsize=4)
+def fee_curve(raw: str) -> tuple[tuple[float, float], ...]:
+    """Parse "km:fee,km:fee,..." into points sorted by distance. Raises ValueError."""
+    points = []
+    for part in raw.split(","):
+        km, fee = part.split(":")
+        points.append((float(km), float(fee)))
+    points.sort()
+    if not points or points[0][0] < 0:
+        raise ValueError(f"Invalid DELIVERY_FEE_CURVE: {raw!r}")
+    return tuple(points)
+
+
+def _fee_at(km: float, curve: Sequence[tuple[float, float]]) -> float:
+    if km <= curve[0][0] or len(curve) == 1:
+        return curve[0][1]
+    for (x0, y0), (x1, y1) in zip(curve, curve[1:]):
+        if km <= x1:
+            return y0 + (y1 - y0) * (km - x0) / (x1 - x0)
+    # Past the last point: keep the last segment's per-km rate
+    (x0, y0), (x1, y1) = curve[-2], curve[-1]
+    return y1 + (y1 - y0) * (km - x1) / (x1 - x0)
+
+
+def price_deliveries(
+    distances_km: Sequence[Optional[float]], prep_minutes: Sequence[float]
+) -> list[tuple[float, int]]:
+    """(fee, minutes) for each (distance, prep time) pair; settings are read once per batch."""
+    curve = fee_curve(settings.DELIVERY_FEE_CURVE)
+    step = settings.DELIVERY_FEE_STEP
+    route_factor = settings.DELIVERY_ROUTE_FACTOR
+    minutes_per_km = 60.0 / settings.DELIVERY_SPEED_KMH
+    quotes = []
+    for km, prep in zip(distances_km, prep_minutes):
+        if km is None:
+            fee = settings.DELIVERY_FEE_FALLBACK
+            travel = settings.DELIVERY_FALLBACK_TRAVEL_MINUTES
+        else:
+            road_km = km * route_factor
+            fee = math.ceil(_fee_at(road_km, curve) / step) * step
+            travel = road_km * minutes_per_km
+        quotes.append((float(fee), math.ceil(prep + travel)))
+    return quotes
+
+
+DELIVERY_INPUTS_SQL = text(
+    """
+    WITH customer AS (
+      (SELECT latitude, longitude FROM user_roles
+       WHERE user_id = :user_id AND role = 'customer'
+         AND latitude IS NOT NULL AND longitude IS NOT NULL)
+      UNION ALL
+      (SELECT latitude, longitude FROM users
+       WHERE id = :user_id AND latitude IS NOT NULL AND longitude IS NOT NULL)
+      LIMIT 1
+    )
+    SELECT r.id, r.latitude, r.longitude,
+           c.latitude AS customer_latitude, c.longitude AS customer_longitude,
+           CASE WHEN r.delivery_time_count > 0
+                THEN r.delivery_time_sum::float8 / r.delivery_time_count END AS menu_minutes,
+           prep.minutes AS recent_prep_minutes, prep.samples,
+           CASE WHEN NOT EXISTS (SELECT 1 FROM restaurant_delivery_zones z WHERE z.restaurant_id = r.id)
+                THEN true
+                WHEN c.latitude IS NULL THEN NULL
+                ELSE EXISTS (
+                  SELECT 1 FROM restaurant_delivery_zones z
+                  WHERE z.restaurant_id = r.id
+                    AND z.area @> polygon(box(point(c.longitude, c.latitude), point(c.longitude, c.latitude)))
+                ) END AS serviceable
+    FROM restaurants r
+    LEFT JOIN customer c ON true
+    LEFT JOIN LATERAL (
+      SELECT percentile_cont(0.5) WITHIN GROUP (
+               ORDER BY extract(epoch FROM d.completed_at - c.completed_at) / 60
+             ) AS minutes,
+             count(*) AS samples
+      FROM orders o
+      JOIN order_tracking_steps c ON c.order_id = o.id AND c.step_order = :confirmed_step
+      JOIN order_tracking_steps d ON d.order_id = o.id AND d.step_order = :dispatch_step
+      WHERE o.restaurant_id = r.id
+        AND o.created_at > now() - make_interval(days => :days)
+        AND c.is_completed AND d.is_completed AND d.completed_at > c.completed_at
+    ) prep ON true
+    WHERE r.id = ANY(:ids)
+    """
+).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _prep_minutes(row) -> float:
+    if row is not None:
+        if row.samples >= PREP_MIN_SAMPLES and row.recent_prep_minutes is not None:
+            return float(row.recent_prep_minutes)
+        if row.menu_minutes is not None:
+            return float(row.menu_minutes)
+    return float(settings.DELIVERY_DEFAULT_PREP_MINUTES)
+
+
+def _distance_km(row) -> Optional[float]:
+    if row is None or None in (row.latitude, row.longitude, row.customer_latitude, row.customer_longitude):
+        return None
+    return haversine_km(row.customer_latitude, row.customer_longitude, row.latitude, row.longitude)
+
+
+async def quote_deliveries(
+    db: AsyncSession, user_id: UUID, restaurant_ids: Iterable[UUID]
+) -> dict[UUID, DeliveryQuote]:
+    """Quotes for delivering from each restaurant to the user's saved location (fallbacks for unknowns)."""
+    ids = list(dict.fromkeys(restaurant_ids))
+    if not ids:
+        return {}
+    result = await db.execute(
+        DELIVERY_INPUTS_SQL,
+        {
+            "user_id": user_id,
+            "ids": ids,
+            "confirmed_step": CONFIRMED_STEP_ORDER,
+            "dispatch_step": DISPATCH_STEP_ORDER,
+            "days": PREP_WINDOW_DAYS,
+        },
+    )
+    rows = {row.id: row for row in result.all()}
+    distances = [_distance_km(rows.get(rid)) for rid in ids]
+    priced = price_deliveries(distances, [_prep_minutes(rows.get(rid)) for rid in ids])
+    return {
+        rid: DeliveryQuote(
+            restaurant_id=rid,
+            distance_km=km,
+            fee=fee,
+            minutes=minutes,
+            serviceable=rows[rid].serviceable if rid in rows else True,
+        )
+        for rid, km, (fee, minutes) in zip(ids, distances, priced)
+    }
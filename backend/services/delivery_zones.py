@@ -0,0 +1,50 @@
+"""
+Delivery zones (restaurant_delivery_zones): which restaurants deliver to a location.
+
+A restaurant without zones delivers everywhere. Zones are polygons of (lat, lng)
+vertices; "restaurants serving this point" is one GiST lookup on the zone areas.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import func, or_, select
+
+from models.delivery_zone import RestaurantDeliveryZone
+
+MAX_ZONES = 20
+MAX_ZONE_VERTICES = 200
+
+
+def location_area(lat: float, lng: float):
+    """Zero-size polygon at (lat, lng): area @> it is indexable where area @> point is not."""
+    point = func.point(lng, lat)
+    return func.polygon(func.box(point, point))
+
+
+def serves_location_clause(restaurant_id_col, lat: float, lng: float):
+    """SQL condition: the restaurant has no zones, or one of them contains (lat, lng)."""
+    zone = RestaurantDeliveryZone
+    serving = select(zone.restaurant_id).where(zone.area.op("@>")(location_area(lat, lng)))
+    has_zones = select(zone.id).where(zone.restaurant_id == restaurant_id_col).exists()
+    return or_(restaurant_id_col.in_(serving), ~has_zones)
+
+
+def validate_zone(points: Sequence[Sequence[float]]) -> list[tuple[float, float]]:
+    """Check a zone's [lat, lng] vertices. Raises ValueError with a client-facing message."""
+    if not 3 <= len(points) <= MAX_ZONE_VERTICES:
+        raise ValueError(f"A zone needs between 3 and {MAX_ZONE_VERTICES} points")
+    vertices = []
+    for point in points:
+        if len(point) != 2:
+            raise ValueError("Zone points must be [latitude, longitude]")
+        lat, lng = float(point[0]), float(point[1])
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            raise ValueError("Zone point out of range")
+        vertices.append((lat, lng))
+    lngs = [lng for _, lng in vertices]
+    if max(lngs) - min(lngs) >= 180:
+        raise ValueError("Zones may not cross the antimeridian")
+    if len(set(vertices)) < 3:
+        raise ValueError("A zone needs at least 3 distinct points")
+    return vertices
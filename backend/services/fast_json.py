@@ -0,0 +1,30 @@
+"""
+JSON responses for trusted rows, skipping FastAPI's response_model round trip.
+
+When a route returns plain data, FastAPI validates it against response_model, runs
+jsonable_encoder over the result and then json.dumps. For list endpoints built from our own
+DB rows that is pure overhead. Build plain dicts that already have the response model's
+shape (every field present, values of the declared types; UUID/datetime are fine) and
+return trusted_json_response(...): pydantic-core encodes them to bytes in one pass.
+Keep response_model on the route for the OpenAPI schema.
+"""
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def encode_trusted(content: Any) -> bytes:
+    """Encode schema-shaped dicts/lists to JSON bytes without validating them."""
+    return to_json(content)
+
+
+def trusted_json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    return json_bytes_response(encode_trusted(content), headers)
+
+
+def json_bytes_response(body: bytes, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Wrap pre-encoded JSON (e.g. from the catalog cache) in a response."""
+    return Response(content=body, media_type="application/json", headers=headers)
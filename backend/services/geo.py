@@ -0,0 +1,65 @@
+"""Great-circle distances and bounding boxes for radius searches over latitude/longitude columns."""
+from __future__ import annotations
+
+import math
+
+from sqlalchemy import func
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = EARTH_RADIUS_KM * math.pi / 180
+
+# (min_lat, min_lng, max_lat, max_lng)
+Box = tuple[float, float, float, float]
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(lat: float, lng: float, radius_km: float) -> list[Box]:
+    """
+    Boxes that together contain every point within radius_km of (lat, lng). Usually one;
+    two when the circle crosses the antimeridian. Near a pole the box spans all longitudes.
+    """
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)]
+    # Widest longitude offset of the circle (reached north/south of the centre, not at it)
+    angular = radius_km / EARTH_RADIUS_KM
+    d_lng = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat)))))
+    min_lng, max_lng = lng - d_lng, lng + d_lng
+    if min_lng < -180:
+        return [(min_lat, min_lng + 360, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lng)]
+    if max_lng > 180:
+        return [(min_lat, min_lng, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lng - 360)]
+    return [(min_lat, min_lng, max_lat, max_lng)]
+
+
+def point_expr(lat_col, lng_col):
+    """point(lng, lat): must match the expression of the GiST indexes built on these columns."""
+    return func.point(lng_col, lat_col)
+
+
+def within_box_clause(lat_col, lng_col, box: Box):
+    """Index-backed containment test (GiST point_ops supports point <@ box)."""
+    min_lat, min_lng, max_lat, max_lng = box
+    return point_expr(lat_col, lng_col).op("<@")(
+        func.box(func.point(min_lng, min_lat), func.point(max_lng, max_lat))
+    )
+
+
+def distance_km_expr(lat_col, lng_col, lat: float, lng: float):
+    """SQL haversine distance in km from (lat, lng) to the row's coordinates."""
+    phi1 = math.radians(lat)
+    d_phi = (func.radians(lat_col) - phi1) / 2
+    d_lambda = (func.radians(lng_col) - math.radians(lng)) / 2
+    a = (
+        func.power(func.sin(d_phi), 2)
+        + math.cos(phi1) * func.cos(func.radians(lat_col)) * func.power(func.sin(d_lambda), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
@@ -0,0 +1,153 @@
+"""
+Blurhash + dominant color placeholders for uploaded restaurant and menu images.
+
+Computed in a background task after upload (decoding runs in a worker thread) and
+stored in image_placeholders keyed by the delivered URL. Triggers copy them onto the
+restaurants / menu_items rows that use the URL, so catalog reads return them for free.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import math
+
+from PIL import Image
+from sqlalchemy import text
+
+import database
+from services.catalog_cache import invalidate_restaurant
+
+log = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 32  # the image is reduced to at most this many pixels a side before encoding
+COMPONENTS_X = 4
+COMPONENTS_Y = 3
+DOMINANT_PALETTE = 8
+MAX_CONCURRENT = 2  # placeholder decodes running at once per process
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+_SRGB_TO_LINEAR = [
+    c / 255 / 12.92 if c / 255 <= 0.04045 else ((c / 255 + 0.055) / 1.055) ** 2.4 for c in range(256)
+]
+
+_slots = asyncio.Semaphore(MAX_CONCURRENT)
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - i)) % 83] for i in range(1, length + 1))
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = min(max(value, 0.0), 1.0)
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(abs(value) ** exp, value)
+
+
+def blurhash(pixels: list[tuple[int, int, int]], width: int, height: int) -> str:
+    """Blurhash (https://blurha.sh) of row-major RGB pixels."""
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(COMPONENTS_X)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(COMPONENTS_Y)]
+    linear = [(_SRGB_TO_LINEAR[r], _SRGB_TO_LINEAR[g], _SRGB_TO_LINEAR[b]) for r, g, b in pixels]
+
+    factors = []
+    for j in range(COMPONENTS_Y):
+        for i in range(COMPONENTS_X):
+            r = g = b = 0.0
+            for y in range(height):
+                cy = cos_y[j][y]
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * cy
+                    pr, pg, pb = linear[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((COMPONENTS_X - 1) + (COMPONENTS_Y - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, math.floor(max(abs(v) for f in ac for v in f) * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+    else:
+        quantised_max, max_value = 0, 1.0
+    result += _base83(quantised_max, 1)
+    result += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for f in ac:
+        q = [max(0, min(18, math.floor(_sign_pow(v / max_value, 0.5) * 9 + 9.5))) for v in f]
+        result += _base83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return result
+
+
+def compute_placeholder(data: bytes) -> tuple[str, str]:
+    """(blurhash, "#rrggbb" dominant color) for encoded image bytes. CPU-bound; call off the loop."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))  # JPEG: decode at reduced scale
+        img = img.convert("RGB")
+        img.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+    width, height = img.size
+    raw = img.tobytes()
+    hash_ = blurhash(list(zip(raw[0::3], raw[1::3], raw[2::3])), width, height)
+    paletted = img.quantize(DOMINANT_PALETTE)
+    _, index = max(paletted.getcolors())
+    r, g, b = paletted.getpalette()[index * 3:index * 3 + 3]
+    return hash_, f"#{r:02x}{g:02x}{b:02x}"
+
+
+SAVE_PLACEHOLDER_SQL = text(
+    """
+    WITH saved AS (
+      INSERT INTO image_placeholders (image_url, blurhash, color)
+      VALUES (:url, :blurhash, :color)
+      ON CONFLICT (image_url) DO UPDATE SET blurhash = EXCLUDED.blurhash, color = EXCLUDED.color
+      RETURNING jsonb_build_object('blurhash', blurhash, 'color', color) AS placeholder
+    ),
+    items AS (
+      UPDATE menu_items SET image_placeholder = (SELECT placeholder FROM saved)
+      WHERE image_url = :url
+      RETURNING restaurant_id
+    ),
+    restaurants_ AS (
+      UPDATE restaurants SET
+        image_placeholder = CASE WHEN image_url = :url THEN (SELECT placeholder FROM saved)
+                                 ELSE image_placeholder END,
+        logo_placeholder = CASE WHEN logo_url = :url THEN (SELECT placeholder FROM saved)
+                                ELSE logo_placeholder END
+      WHERE image_url = :url OR logo_url = :url
+      RETURNING id
+    )
+    SELECT restaurant_id FROM items UNION SELECT id FROM restaurants_
+    """
+)
+
+
+async def store_image_placeholder(image_url: str, data: bytes) -> None:
+    """Background task: compute and save the placeholder for an uploaded image. Never raises."""
+    try:
+        async with _slots:
+            blurhash_, color = await asyncio.to_thread(compute_placeholder, data)
+    except Exception as exc:
+        log.warning("Image placeholder failed for %s: %s", image_url, exc)
+        return
+
+    if not database.AsyncSessionLocal:
+        return
+    try:
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(
+                SAVE_PLACEHOLDER_SQL, {"url": image_url, "blurhash": blurhash_, "color": color}
+            )
+            restaurant_ids = [row[0] for row in result.all()]
+            await db.commit()
+    except Exception as exc:
+        log.error("Saving image placeholder failed for %s: %s", image_url, exc)
+        return
+    for rid in restaurant_ids:
+        invalidate_restaurant(rid)
@@ -0,0 +1,322 @@
+"""
+In-process ranked search over available menu items (/menu/search).
+
+Terms come from the item name, description and restaurant name. Each query word matches
+exact terms, prefixes of the last word (as-you-type) and, when the word is not in the
+vocabulary, similar terms by trigram similarity (typos). Items must match every query word;
+the score adds the best field weight per word, scaled down for prefix and fuzzy matches.
+
+The index is built from the DB on first use and then kept current from the
+catalog_changes log, so writes made by other processes (seed scripts, dashboard) are
+picked up within a couple of seconds (services.catalog_changes.CatalogFollower).
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from itertools import count, islice
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.menu_item import MenuItem
+from models.restaurant import Restaurant
+from services.catalog_changes import CatalogFollower
+from services.cloudinary_storage import image_variants
+
+NAME_WEIGHT = 4
+RESTAURANT_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+PREFIX_QUALITY = 0.9
+FUZZY_QUALITY = 0.8
+FUZZY_MIN_SIMILARITY = 0.3  # same default as pg_trgm
+MAX_PREFIX_TERMS = 50
+MAX_FUZZY_TERMS = 8
+MAX_EDIT_CANDIDATES = 200
+MAX_QUERY_WORDS = 8
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({"and", "the", "with", "of", "in", "on", "a", "an", "or"})
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode()
+    return [t for t in _WORD.findall(folded) if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())]
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once); > limit once it exceeds it."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+@dataclass(slots=True)
+class _Doc:
+    payload: dict  # MenuItemWithRestaurant shape
+    terms: tuple[str, ...]  # weights live in the postings
+
+
+class MenuSearchIndex:
+    """Inverted index over menu items. Not thread-safe; mutate from one task at a time."""
+
+    def __init__(self) -> None:
+        self._ids = count()
+        self._doc_by_item: dict[UUID, int] = {}
+        self._docs: dict[int, _Doc] = {}
+        self._sort_names: dict[int, str] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._sorted_terms: list[str] = []
+        self._terms_by_trigram: dict[str, set[str]] = {}
+        self._trigram_count: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @classmethod
+    def build(cls, items: Iterable[dict]) -> "MenuSearchIndex":
+        index = cls()
+        for item in items:
+            index._add(item, keep_sorted=False)
+        index._sorted_terms = sorted(index._postings)
+        return index
+
+    def upsert(self, item: dict) -> None:
+        self.remove(item["id"])
+        self._add(item, keep_sorted=True)
+
+    def remove(self, item_id: UUID) -> None:
+        doc_id = self._doc_by_item.pop(item_id, None)
+        if doc_id is None:
+            return
+        doc = self._docs.pop(doc_id)
+        del self._sort_names[doc_id]
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                self._drop_term(term)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> tuple[int, list[dict]]:
+        """(total matches, payloads of the requested page) best first."""
+        words = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_WORDS]
+        if not words:
+            return 0, []
+        combined: Optional[dict[int, float]] = None
+        for i, word in enumerate(words):
+            scores = self._word_scores(self._expand(word, prefix=i == len(words) - 1))
+            if combined is None:
+                combined = scores
+            else:
+                small, large = (scores, combined) if len(scores) < len(combined) else (combined, scores)
+                combined = {d: s + large[d] for d, s in small.items() if d in large}
+            if not combined:
+                return 0, []
+        ranked = self._rank(combined, offset + limit)
+        return len(combined), [self._docs[d].payload for d in ranked[offset:]]
+
+    def _word_scores(self, expansions: list[tuple[str, float]]) -> dict[int, float]:
+        """Best score per document over the terms one query word expanded to. Read-only result."""
+        scores: dict[int, float] = {}
+        shared = False  # scores is a postings dict and must be copied before writing
+        for n, (term, quality) in enumerate(expansions):
+            postings = self._postings[term]
+            if n == 0:
+                if quality == 1.0:
+                    scores, shared = postings, True
+                else:
+                    scores = {d: w * quality for d, w in postings.items()}
+                continue
+            if shared:
+                scores, shared = dict(scores), False
+            for doc_id, weight in postings.items():
+                score = weight * quality
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def _rank(self, scores: dict[int, float], k: int) -> list[int]:
+        """Top k documents by score, ties by name, without a Python-level key on every match."""
+        names = self._sort_names
+        if len(scores) > k:
+            cutoff = heapq.nlargest(k, scores.values())[-1]
+            above = [d for d, s in scores.items() if s > cutoff]
+            ties = [d for d, s in scores.items() if s == cutoff]
+            above.sort(key=lambda d: (-scores[d], names[d]))
+            return above + heapq.nsmallest(k - len(above), ties, key=names.__getitem__)
+        return sorted(scores, key=lambda d: (-scores[d], names[d]))
+
+    def _expand(self, word: str, prefix: bool) -> list[tuple[str, float]]:
+        matches: dict[str, float] = {}
+        if word in self._postings:
+            matches[word] = 1.0
+        if prefix:
+            start = bisect.bisect_left(self._sorted_terms, word)
+            for term in islice(self._sorted_terms, start, start + MAX_PREFIX_TERMS):
+                if not term.startswith(word):
+                    break
+                matches.setdefault(term, PREFIX_QUALITY)
+        if not matches and len(word) >= 3:
+            for term, similarity in self._similar_terms(word):
+                matches[term] = FUZZY_QUALITY * similarity
+        return list(matches.items())
+
+    def _similar_terms(self, word: str) -> list[tuple[str, float]]:
+        """
+        Vocabulary terms close to `word`: trigram similarity, or for short words (where
+        one typo wipes out most trigrams) an edit distance of 1, 2 from 7 letters on.
+        """
+        grams = _trigrams(word)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(self._terms_by_trigram.get(gram, ()))
+        max_edits = 1 if len(word) < 7 else 2
+        scored = []
+        for term, n in shared.most_common(MAX_EDIT_CANDIDATES):
+            similarity = n / (len(grams) + self._trigram_count[term] - n)
+            if similarity < FUZZY_MIN_SIMILARITY:
+                edits = _edit_distance(word, term, max_edits)
+                if edits > max_edits:
+                    continue
+                similarity = 1 - edits / max(len(word), len(term))
+            scored.append((term, similarity))
+        return heapq.nlargest(MAX_FUZZY_TERMS, scored, key=lambda ts: ts[1])
+
+    def _add(self, item: dict, keep_sorted: bool) -> None:
+        terms: dict[str, int] = {}
+        for text, weight in (
+            (item["description"], DESCRIPTION_WEIGHT),
+            (item["restaurant_name"], RESTAURANT_WEIGHT),
+            (item["name"], NAME_WEIGHT),
+        ):
+            for term in tokenize(text):
+                if weight > terms.get(term, 0):
+                    terms[term] = weight
+        doc_id = next(self._ids)
+        self._doc_by_item[item["id"]] = doc_id
+        self._docs[doc_id] = _Doc(payload=item, terms=tuple(terms))
+        self._sort_names[doc_id] = (item["name"] or "").lower()
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._add_term(term, keep_sorted)
+            postings[doc_id] = weight
+
+    def _add_term(self, term: str, keep_sorted: bool) -> None:
+        if keep_sorted:
+            bisect.insort(self._sorted_terms, term)
+        grams = _trigrams(term)
+        self._trigram_count[term] = len(grams)
+        for gram in grams:
+            self._terms_by_trigram.setdefault(gram, set()).add(term)
+
+    def _drop_term(self, term: str) -> None:
+        del self._postings[term]
+        i = bisect.bisect_left(self._sorted_terms, term)
+        if i < len(self._sorted_terms) and self._sorted_terms[i] == term:
+            del self._sorted_terms[i]
+        del self._trigram_count[term]
+        for gram in _trigrams(term):
+            terms = self._terms_by_trigram.get(gram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._terms_by_trigram[gram]
+
+
+def _items_query():
+    return (
+        select(
+            MenuItem.id,
+            MenuItem.name,
+            MenuItem.description,
+            MenuItem.price,
+            MenuItem.image_url,
+            MenuItem.is_available,
+            MenuItem.restaurant_id,
+            MenuItem.delivery_time,
+            MenuItem.image_placeholder,
+            Restaurant.name.label("restaurant_name"),
+        )
+        .outerjoin(Restaurant, MenuItem.restaurant_id == Restaurant.id)
+        .where(MenuItem.is_available == True)
+    )
+
+
+def _payload(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "price": float(row.price),
+        "image_url": row.image_url,
+        "is_available": row.is_available,
+        "restaurant_name": row.restaurant_name,
+        "restaurant_id": row.restaurant_id,
+        "delivery_time": row.delivery_time,
+        "image_variants": image_variants(row.image_url),
+        "image_placeholder": row.image_placeholder,
+    }
+
+
+class MenuSearch(CatalogFollower):
+    """Owns the process-wide index and keeps it in step with the catalog_changes log."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.index: Optional[MenuSearchIndex] = None
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int = 0) -> tuple[int, list[dict]]:
+        await self.refresh(db)
+        return self.index.search(query, limit, offset)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        rows = (await db.execute(_items_query())).all()
+        payloads = [_payload(row) for row in rows]
+        self.index = await asyncio.to_thread(MenuSearchIndex.build, payloads)
+
+    async def apply_changes(self, db: AsyncSession, changed: dict[str, set[UUID]]) -> None:
+        stale = set(changed["menu_item"])
+        if changed["restaurant"]:
+            # The restaurant name is indexed on each of its items
+            result = await db.execute(
+                select(MenuItem.id).where(MenuItem.restaurant_id.in_(changed["restaurant"]))
+            )
+            stale |= set(result.scalars().all())
+        if not stale:
+            return
+        fresh = (await db.execute(_items_query().where(MenuItem.id.in_(stale)))).all()
+        for item_id in stale:
+            self.index.remove(item_id)
+        for row in fresh:
+            self.index.upsert(_payload(row))
+
+
+menu_search = MenuSearch()
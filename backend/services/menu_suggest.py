@@ -0,0 +1,295 @@
+"""
+Type-ahead suggestions for restaurant and dish names (/menu/suggest).
+
+Every name is indexed from each of its first few word starts ("jollof rice" is found by
+"jol" and by "ri"). Prefixes up to NODE_DEPTH characters are trie nodes holding their
+top-k suggestions by popularity, so short prefixes (the common, expensive case) are a
+dict lookup. Longer prefixes bisect a sorted key list whose matching range is small by
+then. Memory is capped by max_entries: only the most popular suggestions are kept.
+
+Popularity is recent orders (plus a little per listing, so new dishes still show up).
+Catalog edits are applied incrementally from the catalog_changes log; order counts are
+refreshed by a periodic full rebuild.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.catalog_changes import CatalogFollower
+
+NODE_DEPTH = 4
+TOP_K = 10
+MAX_WORD_STARTS = 4
+MAX_KEY_LENGTH = 32
+MAX_ENTRIES = 50000
+LISTING_WEIGHT = 0.5
+POPULARITY_WINDOW_DAYS = 30
+POPULARITY_REFRESH_SECONDS = 600
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    folded = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode()
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+@dataclass(slots=True)
+class Suggestion:
+    key: str  # "r:<restaurant id>" or "d:<normalized dish name>"
+    kind: str  # "restaurant" | "dish"
+    text: str
+    restaurant_id: Optional[UUID]
+    score: float
+
+
+def _rank_key(s: Suggestion) -> tuple[float, str, str]:
+    return (-s.score, s.text.lower(), s.key)
+
+
+def _index_keys(name: str) -> list[str]:
+    norm = normalize(name)
+    keys = []
+    start = 0
+    for _ in range(MAX_WORD_STARTS):
+        keys.append(norm[start:start + MAX_KEY_LENGTH])
+        start = norm.find(" ", start) + 1
+        if start == 0:
+            break
+    return [k for k in dict.fromkeys(keys) if k]
+
+
+class SuggestIndex:
+    """Popularity-ranked prefix index. Not thread-safe; mutate from one task at a time."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: dict[str, Suggestion] = {}
+        self._keys: list[tuple[str, str]] = []  # sorted (index key, entry key)
+        self._nodes: dict[str, tuple[str, ...]] = {}  # prefix -> top-k entry keys
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def build(cls, suggestions: Iterable[Suggestion], max_entries: int = MAX_ENTRIES) -> "SuggestIndex":
+        index = cls(max_entries)
+        kept = heapq.nsmallest(max_entries, suggestions, key=_rank_key)
+        index._entries = {s.key: s for s in kept}
+        index._keys = sorted((k, s.key) for s in kept for k in _index_keys(s.text))
+        # kept is in rank order, so the first TOP_K entries reaching a node are its top-k
+        candidates: dict[str, list[str]] = {}
+        for s in kept:
+            for k in _index_keys(s.text):
+                for depth in range(1, min(NODE_DEPTH, len(k)) + 1):
+                    node = candidates.setdefault(k[:depth], [])
+                    if len(node) < TOP_K and (not node or node[-1] != s.key):
+                        node.append(s.key)
+        index._nodes = {prefix: tuple(keys) for prefix, keys in candidates.items()}
+        return index
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> list[Suggestion]:
+        p = normalize(prefix)
+        if not p:
+            return []
+        if len(p) <= NODE_DEPTH:
+            return [self._entries[key] for key in self._nodes.get(p, ())[:limit]]
+        return [self._entries[key] for key in self._scan(p, limit)]
+
+    def upsert(self, suggestion: Suggestion) -> None:
+        old = self._entries.get(suggestion.key)
+        if old is None and len(self._entries) >= self.max_entries:
+            return  # at the cap; the next full rebuild decides what stays
+        if old is not None and old.text != suggestion.text:
+            self.remove(old.key)
+            old = None
+        self._entries[suggestion.key] = suggestion
+        if old is None:
+            for k in _index_keys(suggestion.text):
+                bisect.insort(self._keys, (k, suggestion.key))
+        lowered = old is not None and suggestion.score < old.score
+        for prefix in self._prefixes(suggestion.text):
+            node = self._nodes.get(prefix, ())
+            if lowered and suggestion.key in node:
+                self._nodes[prefix] = self._scan(prefix, TOP_K)
+            else:
+                merged = {key: self._entries[key] for key in node}
+                merged[suggestion.key] = suggestion
+                self._nodes[prefix] = tuple(
+                    s.key for s in heapq.nsmallest(TOP_K, merged.values(), key=_rank_key)
+                )
+
+    def remove(self, key: str) -> Optional[Suggestion]:
+        old = self._entries.pop(key, None)
+        if old is None:
+            return None
+        for k in _index_keys(old.text):
+            i = bisect.bisect_left(self._keys, (k, key))
+            if i < len(self._keys) and self._keys[i] == (k, key):
+                del self._keys[i]
+        for prefix in self._prefixes(old.text):
+            if key in self._nodes.get(prefix, ()):
+                node = self._scan(prefix, TOP_K)
+                if node:
+                    self._nodes[prefix] = node
+                else:
+                    del self._nodes[prefix]
+        return old
+
+    def get(self, key: str) -> Optional[Suggestion]:
+        return self._entries.get(key)
+
+    def _prefixes(self, name: str) -> set[str]:
+        return {
+            k[:depth]
+            for k in _index_keys(name)
+            for depth in range(1, min(NODE_DEPTH, len(k)) + 1)
+        }
+
+    def _scan(self, prefix: str, limit: int) -> tuple[str, ...]:
+        start = bisect.bisect_left(self._keys, (prefix,))
+        end = bisect.bisect_left(self._keys, (prefix + "\x7f",))
+        matches = {self._keys[i][1] for i in range(start, end)}
+        best = heapq.nsmallest(limit, (self._entries[key] for key in matches), key=_rank_key)
+        return tuple(s.key for s in best)
+
+
+RESTAURANT_POPULARITY_SQL = text(
+    """
+    SELECT r.id, r.name, count(o.id) AS orders
+    FROM restaurants r
+    LEFT JOIN orders o
+      ON o.restaurant_id = r.id AND o.created_at > now() - make_interval(days => :days)
+    WHERE :ids IS NULL OR r.id = ANY(:ids)
+    GROUP BY r.id
+    """
+).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+DISH_POPULARITY_SQL = text(
+    """
+    SELECT mi.id, mi.name, count(oi.id) AS orders
+    FROM menu_items mi
+    LEFT JOIN order_items oi
+      ON oi.menu_item_id = mi.id AND oi.created_at > now() - make_interval(days => :days)
+    WHERE mi.is_available = true AND (:ids IS NULL OR mi.id = ANY(:ids))
+    GROUP BY mi.id
+    """
+).bindparams(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _restaurant_suggestion(row) -> Suggestion:
+    return Suggestion(
+        key=f"r:{row.id}",
+        kind="restaurant",
+        text=row.name,
+        restaurant_id=row.id,
+        score=float(row.orders),
+    )
+
+
+class MenuSuggest(CatalogFollower):
+    """
+    Process-wide suggestion index. Dishes with the same normalized name across
+    restaurants are one suggestion; per-item contributions are tracked so an edit to
+    one listing adjusts the shared entry.
+    """
+
+    rebuild_interval = POPULARITY_REFRESH_SECONDS
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.index: Optional[SuggestIndex] = None
+        self._item_contrib: dict[UUID, tuple[str, str, int]] = {}  # item -> (dish key, text, orders)
+        self._dish_totals: dict[str, list] = {}  # dish key -> [text, listings, orders]
+
+    async def suggest(self, db: AsyncSession, prefix: str, limit: int) -> list[Suggestion]:
+        await self.refresh(db)
+        return self.index.suggest(prefix, limit)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        params = {"days": POPULARITY_WINDOW_DAYS, "ids": None}
+        restaurants = (await db.execute(RESTAURANT_POPULARITY_SQL, params)).all()
+        items = (await db.execute(DISH_POPULARITY_SQL, params)).all()
+        self._item_contrib = {}
+        self._dish_totals = {}
+        for row in items:
+            self._add_item(row.id, row.name, int(row.orders))
+        suggestions = [_restaurant_suggestion(r) for r in restaurants if normalize(r.name)]
+        suggestions += [self._dish_suggestion(key) for key in self._dish_totals]
+        self.index = await asyncio.to_thread(SuggestIndex.build, suggestions, self.max_entries)
+
+    async def apply_changes(self, db: AsyncSession, changed: dict[str, set[UUID]]) -> None:
+        params = {"days": POPULARITY_WINDOW_DAYS}
+        if changed["restaurant"]:
+            ids = list(changed["restaurant"])
+            rows = (await db.execute(RESTAURANT_POPULARITY_SQL, {**params, "ids": ids})).all()
+            found = set()
+            for row in rows:
+                found.add(row.id)
+                if normalize(row.name):
+                    self.index.upsert(_restaurant_suggestion(row))
+                else:
+                    self.index.remove(f"r:{row.id}")
+            for rid in set(ids) - found:
+                self.index.remove(f"r:{rid}")
+        if changed["menu_item"]:
+            ids = list(changed["menu_item"])
+            rows = (await db.execute(DISH_POPULARITY_SQL, {**params, "ids": ids})).all()
+            touched = {self._remove_item(item_id) for item_id in ids}
+            for row in rows:
+                touched.add(self._add_item(row.id, row.name, int(row.orders)))
+            for key in touched - {None}:
+                if key in self._dish_totals:
+                    self.index.upsert(self._dish_suggestion(key))
+                else:
+                    self.index.remove(key)
+
+    def _add_item(self, item_id: UUID, name: str, orders: int) -> Optional[str]:
+        norm = normalize(name)
+        if not norm:
+            return None
+        key = f"d:{norm}"
+        self._item_contrib[item_id] = (key, name, orders)
+        totals = self._dish_totals.setdefault(key, [name, 0, 0])
+        totals[1] += 1
+        totals[2] += orders
+        return key
+
+    def _remove_item(self, item_id: UUID) -> Optional[str]:
+        contrib = self._item_contrib.pop(item_id, None)
+        if contrib is None:
+            return None
+        key, _, orders = contrib
+        totals = self._dish_totals[key]
+        totals[1] -= 1
+        totals[2] -= orders
+        if totals[1] <= 0:
+            del self._dish_totals[key]
+        return key
+
+    def _dish_suggestion(self, key: str) -> Suggestion:
+        text_, listings, orders = self._dish_totals[key]
+        return Suggestion(
+            key=key,
+            kind="dish",
+            text=text_,
+            restaurant_id=None,
+            score=orders + listings * LISTING_WEIGHT,
+        )
+
+
+menu_suggest = MenuSuggest()
@@ -8,10 +8,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.cart import CartItem
 from models.order import Order, OrderItem, OrderTrackingStep
+from models.restaurant import Restaurant
+from services.cart_pricing import price_cart
+from services.cart_store import cart_store
+from services.db_writes import insert_returning, update_returning
+from services.delivery_pricing import quote_deliveries
 from services.restaurant_hours_util import APP_TZ
 
-DEFAULT_DELIVERY_FEE = 1500.0
-DEFAULT_ESTIMATED_MINUTES = 20
 ORDER_ACTIVE_MINUTES = 5
 
 ACTIVE_ORDER_STATUSES = ("pending", "confirmed", "preparing", "in_transit")
@@ -82,43 +85,61 @@ async def create_order_from_cart(
     restaurant_id: UUID,
 ) -> Order:
     await expire_stale_orders(db, user_id)
+    # Persist cart changes still held in memory (CART_STORE=memory) and keep the cart
+    # locked until its lines have moved into the order
+    async with cart_store.checkout(db, user_id):
+        return await _order_from_cart(db, user_id, restaurant_id)
 
+
+async def _order_from_cart(db: AsyncSession, user_id: UUID, restaurant_id: UUID) -> Order:
     result = await db.execute(
-        select(CartItem)
+        select(CartItem, Restaurant.catalog_version)
+        .join(Restaurant, CartItem.restaurant_id == Restaurant.id)
         .where(CartItem.user_id == user_id, CartItem.restaurant_id == restaurant_id)
         .order_by(CartItem.created_at)
     )
-    cart_rows = result.scalars().all()
-    if not cart_rows:
+    rows = result.all()
+    if not rows:
         raise ValueError("No items in cart for this restaurant")
-
-    subtotal = sum(float(row.unit_price) * int(row.quantity) for row in cart_rows)
-    delivery_fee = DEFAULT_DELIVERY_FEE
+    cart_rows = [row[0] for row in rows]
+
+    # Charge live menu prices, never the prices stored with the cart lines
+    pricing = await price_cart(db, cart_rows, {restaurant_id: rows[0].catalog_version})
+    if pricing.unorderable():
+        raise ValueError("Some items in your cart are no longer available")
+    subtotal = pricing.subtotals[restaurant_id]
+    quote = (await quote_deliveries(db, user_id, [restaurant_id]))[restaurant_id]
+    if quote.serviceable is None:
+        raise ValueError("Add a delivery address with a map location to order from this restaurant")
+    if not quote.serviceable:
+        raise ValueError("This restaurant does not deliver to your address")
+    delivery_fee = quote.fee
     total = subtotal + delivery_fee
     now = datetime.now(timezone.utc)
 
-    order = Order(
+    order = await insert_returning(
+        db,
+        Order,
         user_id=user_id,
         restaurant_id=restaurant_id,
         status="pending",
         subtotal=subtotal,
         delivery_fee=delivery_fee,
         total_amount=total,
-        estimated_delivery_minutes=DEFAULT_ESTIMATED_MINUTES,
+        estimated_delivery_minutes=quote.minutes,
         created_at=now,
         updated_at=now,
     )
-    db.add(order)
-    await db.flush()
 
     for row in cart_rows:
+        unit_price = pricing.lines[row.id].unit_price
         db.add(
             OrderItem(
                 order_id=order.id,
                 menu_item_id=row.menu_item_id,
                 quantity=row.quantity,
-                price_at_order=row.unit_price,
-                unit_price=row.unit_price,
+                price_at_order=unit_price,
+                unit_price=unit_price,
                 name=row.name,
                 description=row.description,
                 image_url=row.image_url,
@@ -134,7 +155,6 @@ async def create_order_from_cart(
         )
     )
     await db.commit()
-    await db.refresh(order)
     return order
 
 
@@ -155,14 +175,11 @@ async def confirm_order_checkout(
         raise ValueError("Order is not awaiting checkout")
 
     now = datetime.now(timezone.utc)
-    order.status = "confirmed"
-    order.updated_at = now
+    order = await update_returning(db, Order, Order.id == order.id, status="confirmed", updated_at=now)
 
-    order_created = _ensure_utc(order.created_at) if order.created_at else now
+    # Steps completed here (the confirmation) are stamped with the confirmation time; the
+    # UI shows the order time for step 1 (format_order_step_time)
     for step_order, label, description, completed, show_view in TRACKING_STEP_TEMPLATE:
-        step_completed_at = None
-        if completed:
-            step_completed_at = order_created if step_order == 1 else now
         db.add(
             OrderTrackingStep(
                 order_id=order.id,
@@ -170,11 +187,10 @@ async def confirm_order_checkout(
                 label=label,
                 description=description,
                 is_completed=completed,
-                completed_at=step_completed_at,
+                completed_at=now if completed else None,
                 show_view_action=show_view,
             )
         )
 
     await db.commit()
-    await db.refresh(order)
     return order
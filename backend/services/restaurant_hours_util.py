@@ -1,9 +1,12 @@
 """Compute open/closed status and display strings from restaurant_hours rows."""
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta, timezone
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
 
 try:
     from zoneinfo import ZoneInfo
@@ -23,9 +26,11 @@ FULL_DAY_LABELS = (
     "Saturday",
     "Sunday",
 )
+DAY_SECONDS = 24 * 60 * 60
+WEEK_SECONDS = 7 * DAY_SECONDS
 
 
-@dataclass
+@dataclass(frozen=True)
 class HoursRow:
     day_of_week: int
     open_time: Optional[time]
@@ -103,32 +108,136 @@ def format_operating_hours_text(rows: Iterable[HoursRow]) -> str:
     return "\n".join(lines)
 
 
-def _row_for_weekday(rows: list[HoursRow], weekday: int) -> Optional[HoursRow]:
-    for row in rows:
-        if row.day_of_week == weekday:
-            return row
-    return None
+def _seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _is_open_row(row: Optional[HoursRow]) -> bool:
+    return bool(row and not row.is_closed and row.open_time and row.close_time)
 
 
-def _is_open_at(rows: list[HoursRow], at: datetime) -> bool:
-    row = _row_for_weekday(rows, at.weekday())
-    if not row or row.is_closed or not row.open_time or not row.close_time:
-        return False
-    now_t = at.time()
-    if row.close_time > row.open_time:
-        return row.open_time <= now_t < row.close_time
-    # Overnight window (e.g. 22:00 – 02:00)
-    return now_t >= row.open_time or now_t < row.close_time
+def _can_open(row: Optional[HoursRow]) -> bool:
+    return bool(row and not row.is_closed and row.open_time)
+
+
+@dataclass(frozen=True)
+class CompiledSchedule:
+    """
+    A restaurant's week of hours, precomputed once from its restaurant_hours rows.
 
+    open_bounds is a sorted, merged [open, close, open, close, …] array of seconds
+    since Monday 00:00, so "open now" is a single bisect. Each day's row only covers
+    that calendar day: an overnight row (e.g. 22:00 – 02:00) is open from midnight
+    until close and again from open until midnight.
+    """
 
-def _next_opening(rows: list[HoursRow], at: datetime) -> tuple[datetime, HoursRow] | None:
+    has_rows: bool
+    operating_text: str
+    open_bounds: tuple[int, ...]
+    # Per weekday (Monday=0): status while open, and when opening later that day.
+    closes_status: tuple[Optional[str], ...]
+    opens_today: tuple[Optional[tuple[int, str]], ...]
+    # Per weekday: status when closed for the rest of that day.
+    next_opening_status: tuple[str, ...]
+
+    def is_open_at_second(self, week_second: int) -> bool:
+        return bisect_right(self.open_bounds, week_second) % 2 == 1
+
+    def status_at(self, at: datetime) -> tuple[bool, str]:
+        """(is_open, status_line) for an APP_TZ-aware datetime."""
+        weekday = at.weekday()
+        day_second = _seconds(at.time())
+        is_open = self.is_open_at_second(weekday * DAY_SECONDS + day_second)
+        return is_open, self.status_line(is_open, weekday, day_second)
+
+    def status_line(self, is_open: bool, weekday: int, day_second: int) -> str:
+        if is_open:
+            return self.closes_status[weekday] or "Open"
+        later = self.opens_today[weekday]
+        if later and day_second < later[0]:
+            return later[1]
+        return self.next_opening_status[weekday]
+
+
+def _merge_intervals(intervals: list[tuple[int, int]]) -> tuple[int, ...]:
+    bounds: list[int] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if bounds and start <= bounds[-1]:
+            bounds[-1] = max(bounds[-1], end)
+        else:
+            bounds.extend((start, end))
+    return tuple(bounds)
+
+
+def _next_opening_status(by_day: dict[int, HoursRow], weekday: int) -> str:
     for offset in range(1, 8):
-        candidate_day = at + timedelta(days=offset)
-        row = _row_for_weekday(rows, candidate_day.weekday())
-        if row and not row.is_closed and row.open_time:
-            open_dt = datetime.combine(candidate_day.date(), row.open_time, tzinfo=at.tzinfo)
-            return open_dt, row
-    return None
+        row = by_day.get((weekday + offset) % 7)
+        if not _can_open(row):
+            continue
+        opens = format_time_12h(row.open_time)
+        if offset == 1:
+            return f"Opens at {opens} tomorrow"
+        if offset <= 6:
+            return f"Opens {FULL_DAY_LABELS[(weekday + offset) % 7]} at {opens}"
+        return f"Opens at {opens}"
+    return "Closed"
+
+
+@lru_cache(maxsize=4096)
+def _compile(rows: tuple[HoursRow, ...]) -> CompiledSchedule:
+    by_day: dict[int, HoursRow] = {}
+    for row in rows:
+        # First row wins when a weekday appears twice
+        by_day.setdefault(row.day_of_week, row)
+
+    intervals: list[tuple[int, int]] = []
+    closes_status: list[Optional[str]] = []
+    opens_today: list[Optional[tuple[int, str]]] = []
+    for weekday in range(7):
+        row = by_day.get(weekday)
+        day_start = weekday * DAY_SECONDS
+        if _is_open_row(row):
+            open_s = _seconds(row.open_time)
+            close_s = _seconds(row.close_time)
+            if close_s > open_s:
+                intervals.append((day_start + open_s, day_start + close_s))
+            else:
+                # Overnight window (e.g. 22:00 – 02:00)
+                intervals.append((day_start, day_start + close_s))
+                intervals.append((day_start + open_s, day_start + DAY_SECONDS))
+            closes_status.append(f"Closes at {format_time_12h(row.close_time)}")
+        else:
+            closes_status.append(None)
+        if _can_open(row):
+            opens_today.append(
+                (_seconds(row.open_time), f"Opens at {format_time_12h(row.open_time)}")
+            )
+        else:
+            opens_today.append(None)
+
+    return CompiledSchedule(
+        has_rows=bool(rows),
+        operating_text=format_operating_hours_text(rows),
+        open_bounds=_merge_intervals(intervals),
+        closes_status=tuple(closes_status),
+        opens_today=tuple(opens_today),
+        next_opening_status=tuple(_next_opening_status(by_day, d) for d in range(7)),
+    )
+
+
+def compile_schedule(rows: Iterable[HoursRow]) -> CompiledSchedule:
+    """Compiled schedule for these rows, cached by their contents."""
+    # A stable sort keeps the first-row-wins rule while letting equal schedules share an entry.
+    return _compile(tuple(sorted(rows, key=lambda r: r.day_of_week)))
+
+
+def to_app_tz(now: Optional[datetime] = None) -> datetime:
+    at = now or datetime.now(APP_TZ)
+    if at.tzinfo is None:
+        return at.replace(tzinfo=APP_TZ)
+    return at.astimezone(APP_TZ)
 
 
 def compute_hours_display(
@@ -141,45 +250,119 @@ def compute_hours_display(
     Returns (is_open_now, status_line, operating_hours_text).
     status_line examples: "Closes at 10:00 PM", "Opens at 9:00 AM tomorrow"
     """
-    operating_text = format_operating_hours_text(rows)
-    if not rows:
-        if fallback_is_open is True:
-            return True, "Open", operating_text
-        if fallback_is_open is False:
-            return False, "Closed", operating_text
-        return None, "Hours not available", operating_text
+    schedule = compile_schedule(rows)
+    operating_text = schedule.operating_text
+    if not schedule.has_rows:
+        return _fallback_display(fallback_is_open, operating_text)
+
+    is_open, status = schedule.status_at(to_app_tz(now))
+    return is_open, status, operating_text
 
-    at = now or datetime.now(APP_TZ)
-    if at.tzinfo is None:
-        at = at.replace(tzinfo=APP_TZ)
-    else:
-        at = at.astimezone(APP_TZ)
-
-    open_now = _is_open_at(rows, at)
-    today = _row_for_weekday(rows, at.weekday())
-
-    if open_now and today and today.close_time:
-        status = f"Closes at {format_time_12h(today.close_time)}"
-        return True, status, operating_text
-
-    if not open_now:
-        # Same-day opening later today
-        if today and not today.is_closed and today.open_time and at.time() < today.open_time:
-            status = f"Opens at {format_time_12h(today.open_time)}"
-            return False, status, operating_text
-
-        nxt = _next_opening(rows, at)
-        if nxt:
-            open_dt, row = nxt
-            day_delta = (open_dt.date() - at.date()).days
-            if day_delta == 1:
-                status = f"Opens at {format_time_12h(row.open_time)} tomorrow"
-            elif day_delta <= 6:
-                status = f"Opens {FULL_DAY_LABELS[open_dt.weekday()]} at {format_time_12h(row.open_time)}"
-            else:
-                status = f"Opens at {format_time_12h(row.open_time)}"
-            return False, status, operating_text
 
+def _fallback_display(
+    fallback_is_open: Optional[bool], operating_text: str
+) -> tuple[Optional[bool], str, str]:
+    """Display for a restaurant without hours rows: its manual is_open flag, if any."""
+    if fallback_is_open is True:
+        return True, "Open", operating_text
+    if fallback_is_open is False:
         return False, "Closed", operating_text
+    return None, "Hours not available", operating_text
+
+
+class ScheduleBatch:
+    """
+    Open-status evaluation for many restaurants against a single clock reading.
+
+    The compiled boundary arrays of all N schedules are packed into one flat array
+    with per-restaurant offsets, so evaluating a batch is one C-level bisect per
+    restaurant over shared, precomputed data.
+    """
 
-    return open_now, "Open", operating_text
+    def __init__(
+        self,
+        hours: Sequence[Iterable[HoursRow]],
+        fallback_is_open: Optional[Sequence[Optional[bool]]] = None,
+    ):
+        self.schedules = [compile_schedule(rows) for rows in hours]
+        self.size = len(self.schedules)
+        self.bounds = array("q")
+        self.offsets = array("q", [0])
+        self.has_rows = [s.has_rows for s in self.schedules]
+        for schedule in self.schedules:
+            self.bounds.extend(schedule.open_bounds)
+            self.offsets.append(len(self.bounds))
+        self.fallback_is_open = list(fallback_is_open or [None] * self.size)
+
+    def evaluate(
+        self, now: Optional[datetime] = None
+    ) -> tuple[list[Optional[bool]], list[Optional[datetime]]]:
+        """
+        Returns (is_open_now, next_transition) lists aligned with the input order.
+
+        next_transition is when the restaurant next opens or closes (None when it
+        never changes). Restaurants without hours rows get their fallback and None.
+        """
+        at = to_app_tz(now)
+        week_start = datetime.combine(
+            at.date() - timedelta(days=at.weekday()), time(0), tzinfo=at.tzinfo
+        )
+        t = at.weekday() * DAY_SECONDS + _seconds(at.time())
+        bounds, offsets = self.bounds, self.offsets
+
+        is_open: list[Optional[bool]] = []
+        transitions: list[Optional[datetime]] = []
+        for i in range(self.size):
+            if not self.has_rows[i]:
+                is_open.append(self.fallback_is_open[i])
+                transitions.append(None)
+                continue
+            lo, hi = offsets[i], offsets[i + 1]
+            if lo == hi:
+                is_open.append(False)
+                transitions.append(None)
+                continue
+            idx = bisect_right(bounds, t, lo, hi)
+            open_now = (idx - lo) % 2 == 1
+            wraps = bounds[lo] == 0 and bounds[hi - 1] == WEEK_SECONDS
+            if open_now:
+                nxt = bounds[idx]
+                if nxt == WEEK_SECONDS and wraps:
+                    # Open through Sunday midnight into Monday: closes at the end of
+                    # the first interval next week, unless it never closes.
+                    nxt = None if hi - lo == 2 else WEEK_SECONDS + bounds[lo + 1]
+            else:
+                nxt = bounds[idx] if idx < hi else WEEK_SECONDS + bounds[lo]
+            is_open.append(open_now)
+            transitions.append(None if nxt is None else week_start + timedelta(seconds=nxt))
+        return is_open, transitions
+
+    def display(self, now: Optional[datetime] = None) -> list[tuple[Optional[bool], str, str]]:
+        """compute_hours_display for every restaurant, aligned with the input order."""
+        at = to_app_tz(now)
+        weekday = at.weekday()
+        day_second = _seconds(at.time())
+        t = weekday * DAY_SECONDS + day_second
+        bounds, offsets = self.bounds, self.offsets
+
+        out: list[tuple[Optional[bool], str, str]] = []
+        for i, schedule in enumerate(self.schedules):
+            if not schedule.has_rows:
+                out.append(_fallback_display(self.fallback_is_open[i], schedule.operating_text))
+                continue
+            lo = offsets[i]
+            is_open = (bisect_right(bounds, t, lo, offsets[i + 1]) - lo) % 2 == 1
+            out.append(
+                (is_open, schedule.status_line(is_open, weekday, day_second), schedule.operating_text)
+            )
+        return out
+
+
+def evaluate_open_status_batch(
+    hours: Sequence[Iterable[HoursRow]],
+    *,
+    now: Optional[datetime] = None,
+    fallback_is_open: Optional[Sequence[Optional[bool]]] = None,
+) -> tuple[list[Optional[bool]], list[Optional[datetime]]]:
+    """is_open_now and next transition for N restaurants' hours at one instant."""
+    return ScheduleBatch(hours, fallback_is_open).evaluate(now)
@@ -1,6 +1,7 @@
 """Credit wallet balance and record a transaction when a deposit is confirmed."""
 import logging
 from datetime import datetime, timezone
+from decimal import Decimal
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +10,7 @@ from models.payment import Deposit, DepositAccount
 from models.user import User
 from models.wallet import Wallet, WalletTransaction
 from routers.wallet import get_or_create_wallet
+from services.db_writes import insert_returning, update_returning
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +38,9 @@ async def ensure_deposit_account(user_id: UUID, db: AsyncSession) -> DepositAcco
         owner = f"{user.first_name} {user.last_name}".strip() or owner
 
     account_number = str(wallet.id).replace("-", "")[:10]
-    row = DepositAccount(
+    row = await insert_returning(
+        db,
+        DepositAccount,
         user_id=user_id,
         owner_name=owner,
         wallet_id=str(wallet.id)[:8].upper(),
@@ -46,9 +50,7 @@ async def ensure_deposit_account(user_id: UUID, db: AsyncSession) -> DepositAcco
         recipient_name="FAST BITES",
         is_active=True,
     )
-    db.add(row)
     await db.commit()
-    await db.refresh(row)
     log.info("Created virtual deposit account for user %s", user_id)
     return row
 
@@ -58,9 +60,10 @@ async def complete_deposit(deposit: Deposit, wallet: Wallet, db: AsyncSession) -
     if status == "successful":
         return wallet
 
-    amount = float(deposit.amount)
-    wallet.balance = float(wallet.balance or 0) + amount
-    deposit.status = "successful"
+    amount = Decimal(str(deposit.amount))  # balance is Numeric; a float would add binary rounding
+    # Credit in SQL so concurrent credits to one wallet cannot overwrite each other
+    wallet = await update_returning(db, Wallet, Wallet.id == wallet.id, balance=Wallet.balance + amount)
+    deposit = await update_returning(db, Deposit, Deposit.id == deposit.id, status="successful")
 
     method = str(deposit.method).lower()
     title = "Bank transfer" if method == "bank" else "Card deposit" if method == "card" else "Deposit"
@@ -77,7 +80,5 @@ async def complete_deposit(deposit: Deposit, wallet: Wallet, db: AsyncSession) -
     )
     db.add(tx)
     await db.commit()
-    await db.refresh(wallet)
-    await db.refresh(deposit)
     log.info("Completed deposit %s: +₦%s for user %s", deposit.id, amount, deposit.user_id)
     return wallet
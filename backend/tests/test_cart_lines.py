@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from schemas.cart import CartItemCreate
+from services.cart_ops import cart_line_values, line_key
+from services.cart_pricing import ItemPricing, _price_line
+from services.cart_store import MemoryCartStore, _HotCart
+
+SAUCE, EXTRAS, LARGE = str(uuid4()), str(uuid4()), str(uuid4())
+RESTAURANT, DISH = uuid4(), uuid4()
+PRICING = ItemPricing(
+    restaurant_id=RESTAURANT,
+    price=2000.0,
+    is_available=True,
+    option_prices={SAUCE: 300.0, EXTRAS: 500.0, LARGE: 400.0},
+)
+SERVINGS = {
+    "size_id": LARGE,
+    "servings": [{"sauce_id": SAUCE, "extras_id": EXTRAS}, {"sauce_id": SAUCE}],
+}
+
+
+def _values(options: dict, unit_price: float, at: datetime) -> dict:
+    body = CartItemCreate(
+        restaurant_id=str(RESTAURANT),
+        menu_item_id=str(DISH),
+        name="Rice and stew (+1)",
+        unit_price=unit_price,
+        options_json=options,
+    )
+    return cart_line_values(uuid4(), body, at)
+
+
+def _cart_total(adds: list[dict]) -> float:
+    cart = _HotCart(lines={})
+    for values in adds:
+        MemoryCartStore._add(cart, values)
+    return sum(_price_line(line, PRICING).line_total for line in cart.lines.values())
+
+
+def test_servings_lines_never_merge():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    assert line_key(_values(SERVINGS, 3500.0, now)) is None
+    assert line_key(_values({"size_id": LARGE}, 2400.0, now)) is not None
+
+
+def test_adding_a_servings_line_twice_costs_two_lines():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    one = _cart_total([_values(SERVINGS, 3500.0, now)])
+    assert one == 2000 + 400 + 300 + 500 + 300
+    twice = _cart_total([_values(SERVINGS, 3500.0, now), _values(SERVINGS, 3500.0, now + timedelta(seconds=1))])
+    assert twice == 2 * one
+
+
+def test_plain_lines_still_merge():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    cart = _HotCart(lines={})
+    for i in range(2):
+        MemoryCartStore._add(cart, _values({"size_id": LARGE}, 2400.0, now + timedelta(seconds=i)))
+    (line,) = cart.lines.values()
+    assert line.quantity == 2
+    assert _price_line(line, PRICING).line_total == 2 * 2400.0
+
+
+def test_unit_price_times_quantity_is_the_line_total():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    cart = _HotCart(lines={})
+    line = MemoryCartStore._add(cart, _values(SERVINGS, 2766.67, now))
+    line.quantity = 3
+    priced = _price_line(line, PRICING)
+    assert priced.unit_price == 2766.67  # (3 * 2400 + 1100) / 3
+    assert priced.line_total == round(priced.unit_price * 3, 2)
+    assert priced.status == "ok"
@@ -0,0 +1,119 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import database
+from schemas.cart import CartItemCreate
+from services.cart_ops import cart_line_values
+from services.cart_store import MemoryCartStore, _HotCart
+
+RESTAURANT = uuid4()
+RestaurantRow = namedtuple("RestaurantRow", "id name logo_url image_url catalog_version")
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    """Stands in for AsyncSessionLocal(); execute() waits on `gate` when one is set."""
+
+    def __init__(self, log: list, gate: asyncio.Event | None = None, rows=()):
+        self.log = log
+        self.gate = gate
+        self.rows = list(rows)
+        self.started = asyncio.Event()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, *args):
+        self.started.set()
+        if self.gate is not None:
+            await self.gate.wait()
+        self.log.append("execute")
+        return _Result(self.rows)
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+def _cart_with_line(quantity: int = 1) -> _HotCart:
+    body = CartItemCreate(
+        restaurant_id=str(RESTAURANT), menu_item_id=str(uuid4()), name="Suya", unit_price=1200, quantity=quantity
+    )
+    cart = _HotCart(lines={})
+    MemoryCartStore._add(cart, cart_line_values(uuid4(), body, datetime.now(timezone.utc)))
+    return cart
+
+
+def test_cancelled_write_keeps_changes_pending():
+    async def run():
+        cart = _cart_with_line()
+        pending = set(cart.dirty)
+        db = _Session([], gate=asyncio.Event())
+        task = asyncio.create_task(MemoryCartStore(60)._write(db, [cart]))
+        await db.started.wait()
+        assert not cart.dirty
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return cart.dirty, pending, db.log
+
+    dirty, pending, log = asyncio.run(run())
+    assert dirty == pending
+    assert log == ["rollback"]
+
+
+def test_close_lets_a_running_flush_finish(monkeypatch):
+    async def run():
+        log: list = []
+        gate = asyncio.Event()
+        sessions = []
+
+        def session_factory():
+            sessions.append(_Session(log, gate))
+            return sessions[-1]
+
+        monkeypatch.setattr(database, "AsyncSessionLocal", session_factory)
+        store = MemoryCartStore(0.01)
+        store._carts[uuid4()] = _cart_with_line()
+        await store.start()
+        while not sessions:
+            await asyncio.sleep(0.01)
+        await sessions[0].started.wait()  # the background flush is writing
+        closing = asyncio.create_task(store.close())
+        await asyncio.sleep(0.05)
+        gate.set()
+        await closing
+        return log, store
+
+    log, store = asyncio.run(run())
+    assert log == ["execute", "commit"]
+    assert not any(cart.dirty or cart.deleted for cart in store._carts.values())
+
+
+def test_rows_are_copies():
+    async def run():
+        store = MemoryCartStore(60)
+        user_id = uuid4()
+        store._carts[user_id] = _cart_with_line(quantity=2)
+        db = _Session([], rows=[RestaurantRow(RESTAURANT, "Mama Put", None, None, 1)])
+        rows = await store.rows(db, user_id)
+        (line,) = store._carts[user_id].lines.values()
+        line.quantity = 5
+        return rows
+
+    (row,) = asyncio.run(run())
+    assert row[0].quantity == 2
+    assert row[1:] == ("Mama Put", None, None, 1)
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from services import catalog_changes
+from services.catalog_changes import CatalogFollower, CatalogPositionExpired
+
+
+class _Follower(CatalogFollower):
+    def __init__(self):
+        super().__init__()
+        self.rebuilds = 0
+        self.applied = []
+
+    async def rebuild(self, db):
+        self.rebuilds += 1
+
+    async def apply_changes(self, db, changed):
+        self.applied.append(changed)
+
+
+def test_follower_must_implement_rebuild_and_apply_changes():
+    class Partial(CatalogFollower):
+        async def rebuild(self, db):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_follower_rebuilds_when_its_position_was_pruned(monkeypatch):
+    async def position(db):
+        return 100, 0
+
+    async def pruned(db, after, limit):
+        raise CatalogPositionExpired()
+
+    monkeypatch.setattr(catalog_changes, "current_catalog_position", position)
+    monkeypatch.setattr(catalog_changes, "read_catalog_changes", pruned)
+    follower = _Follower()
+    follower._position = (42, 7)
+    asyncio.run(follower.refresh(None))
+    assert follower.rebuilds == 1
+    assert follower.applied == []
+    assert follower._position == (100, 0)
@@ -0,0 +1,216 @@
+"""
+Routes answering with services.fast_json skip response_model validation, so their dicts
+must already have the model's exact shape. Each test runs a fast-path route on in-memory
+rows and checks its body against what the declared response_model would serialize.
+"""
+import asyncio
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+import routers.cart as cart_router
+import routers.menu as menu_router
+import routers.orders_api as orders_router
+from models.cart import CartItem
+from models.order import Order, OrderItem, OrderTrackingStep
+from models.restaurant import Restaurant
+from services.cart_pricing import CartPricing, PricedLine
+from services.catalog_cache import catalog_cache
+from services.delivery_pricing import DeliveryQuote
+from services.menu_search import _payload as search_payload
+from services.menu_suggest import Suggestion
+
+UPLOADS = "https://res.cloudinary.com/demo/image/upload/v1700000000/fast_bites/restaurants/vendors/mama-put"
+DISH_IMAGE = f"{UPLOADS}/menu/jollof.jpg"
+LOGO = f"{UPLOADS}/logo/logo.png"
+PLACEHOLDER = {"blurhash": "LEHV6nWB2yk8pyo0adR*.7kCMdnj", "color": "#c0392b"}
+
+MenuRow = namedtuple(
+    "MenuRow",
+    "id name description price image_url is_available restaurant_id delivery_time "
+    "image_placeholder restaurant_name catalog_version",
+)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class _DB:
+    """Answers execute() with the queued row lists, in order."""
+
+    def __init__(self, *results, objects=None):
+        self.results = list(results)
+        self.objects = objects or {}
+
+    async def execute(self, *args, **kwargs):
+        return _Result(self.results.pop(0))
+
+    async def get(self, model, key):
+        return self.objects.get(key)
+
+
+def _response_model(router, path: str):
+    return next(r.response_model for r in router.routes if r.path == path)
+
+
+def _assert_matches_model(response, model) -> None:
+    body = json.loads(response.body)
+    adapter = TypeAdapter(model)
+    assert body == json.loads(adapter.dump_json(adapter.validate_python(body)))
+
+
+def _menu_rows() -> list[MenuRow]:
+    rid = uuid4()
+    return [
+        MenuRow(uuid4(), "Jollof", "Smoky", Decimal("2500.00"), DISH_IMAGE, True, rid, 25, PLACEHOLDER, "Mama Put", 3),
+        MenuRow(uuid4(), "Water", None, Decimal("300.50"), None, False, rid, None, None, "Mama Put", 3),
+        MenuRow(uuid4(), "Puff puff", "", Decimal("500"), "https://example.com/p.jpg", True, None, 10, None, None, None),
+    ]
+
+
+def test_menu_items_list_and_page():
+    path = "/menu/items"
+    model = _response_model(menu_router.router, path)
+    for paging in ("offset", "cursor"):
+        catalog_cache.clear()
+        rows = _menu_rows()
+        response = asyncio.run(
+            menu_router.get_menu_items(
+                None, limit=2, offset=0, restaurant_id=None, cursor=None, paging=paging, db=_DB(rows)
+            )
+        )
+        _assert_matches_model(response, model)
+
+
+def test_menu_items_batch():
+    rows = _menu_rows()
+    ids = [row.id for row in rows] + [uuid4()]
+    response = asyncio.run(
+        menu_router.get_menu_items_batch(",".join(str(i) for i in ids), db=_DB(rows))
+    )
+    _assert_matches_model(response, _response_model(menu_router.router, "/menu/items:batch"))
+    assert len(json.loads(response.body)["missing"]) == 1
+
+
+def test_menu_search(monkeypatch):
+    async def search(db, q, limit, offset=0):
+        return 3, [search_payload(row) for row in _menu_rows()]
+
+    monkeypatch.setattr(menu_router.menu_search, "search", search)
+    response = asyncio.run(menu_router.search_menu("jollof", limit=20, offset=0, db=None))
+    _assert_matches_model(response, _response_model(menu_router.router, "/menu/search"))
+
+
+def test_menu_suggest(monkeypatch):
+    async def suggest(db, prefix, limit):
+        return [
+            Suggestion("r:1", "restaurant", "Mama Put", uuid4(), 9.0),
+            Suggestion("d:jollof", "dish", "Jollof", None, 4.0),
+        ]
+
+    monkeypatch.setattr(menu_router.menu_suggest, "suggest", suggest)
+    response = asyncio.run(menu_router.suggest_menu("ma", limit=8, db=None))
+    _assert_matches_model(response, _response_model(menu_router.router, "/menu/suggest"))
+
+
+def test_cart(monkeypatch):
+    user_id = uuid4()
+    rid, other = uuid4(), uuid4()
+    lines = [
+        CartItem(
+            id=uuid4(), user_id=user_id, restaurant_id=rid, menu_item_id=uuid4(), name="Jollof",
+            description="Smoky", unit_price=Decimal("2500.00"), quantity=2, image_url=DISH_IMAGE,
+            section="Mains", options_json={"note": "spicy"},
+        ),
+        CartItem(
+            id=uuid4(), user_id=user_id, restaurant_id=rid, menu_item_id=None, name="Custom",
+            description=None, unit_price=Decimal("100"), quantity=1, image_url=None,
+            section=None, options_json=None,
+        ),
+        CartItem(
+            id=uuid4(), user_id=user_id, restaurant_id=other, menu_item_id=uuid4(), name="Suya",
+            description=None, unit_price=Decimal("1200"), quantity=1, image_url="https://example.com/s.jpg",
+            section=None, options_json={},
+        ),
+    ]
+    rows = [
+        (lines[0], "Mama Put", LOGO, None, 3),
+        (lines[1], "Mama Put", LOGO, None, 3),
+        (lines[2], None, None, "https://example.com/cover.jpg", 1),
+    ]
+    pricing = CartPricing(
+        lines={
+            lines[0].id: PricedLine(lines[0].id, rid, "drifted", 2600.0, 5200.0),
+            lines[1].id: PricedLine(lines[1].id, rid, "ok", 100.0, 100.0),
+            lines[2].id: PricedLine(lines[2].id, other, "unavailable"),
+        },
+        subtotals={rid: 5300.0, other: 0.0},
+    )
+
+    class Store:
+        async def rows(self, db, uid):
+            return rows
+
+    async def price_cart(db, cart_rows, versions):
+        return pricing
+
+    async def quote_deliveries(db, uid, restaurant_ids):
+        return {
+            r: DeliveryQuote(r, 2.5 if r == rid else None, 800.0, 35, r == rid)
+            for r in restaurant_ids
+        }
+
+    monkeypatch.setattr(cart_router, "cart_store", Store())
+    monkeypatch.setattr(cart_router, "price_cart", price_cart)
+    monkeypatch.setattr(cart_router, "quote_deliveries", quote_deliveries)
+    response = asyncio.run(cart_router.list_cart(current_user={"id": str(user_id)}, db=None))
+    _assert_matches_model(response, _response_model(cart_router.router, "/cart"))
+    assert [len(group["items"]) for group in json.loads(response.body)["orders"]] == [2, 1]
+
+
+def test_order_summary(monkeypatch):
+    async def expire_stale_orders(db, user_id):
+        return None
+
+    monkeypatch.setattr(orders_router, "expire_stale_orders", expire_stale_orders)
+    created = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    restaurant = Restaurant(id=uuid4(), name="Mama Put")
+    confirmed = Order(
+        id=uuid4(), status="confirmed", restaurant_id=restaurant.id, delivery_fee=Decimal("750.00"),
+        estimated_delivery_minutes=None, created_at=created,
+    )
+    pending = Order(id=uuid4(), status="pending", restaurant_id=None, created_at=created - timedelta(hours=1))
+    items = [
+        OrderItem(
+            id=uuid4(), name="Jollof", description="Smoky", unit_price=Decimal("2500.00"), quantity=2,
+            image_url=DISH_IMAGE, options_json={"note": "spicy"},
+        ),
+        OrderItem(id=uuid4(), name=None, description=None, unit_price=None, price_at_order=Decimal("300"), quantity=None),
+    ]
+    steps = [
+        OrderTrackingStep(
+            label="Order confirmed", description="We got it", step_order=1, is_completed=True,
+            completed_at=created + timedelta(minutes=1), show_view_action=False,
+        ),
+        OrderTrackingStep(
+            label="On the way", description="Rider is coming", step_order=3, is_completed=False,
+            completed_at=None, show_view_action=True,
+        ),
+    ]
+    db = _DB([confirmed, pending], items, steps, objects={restaurant.id: restaurant})
+    response = asyncio.run(orders_router.order_summary(current_user={"id": str(uuid4())}, db=db))
+    _assert_matches_model(response, _response_model(orders_router.router, "/orders/summary"))
+    body = json.loads(response.body)
+    assert body["ongoing"] is not None and body["pending_order_id"] == str(pending.id)
@@ -0,0 +1,59 @@
+from datetime import datetime, time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select
+
+from models.restaurant import Restaurant
+from routers.menu import _after_cursor, _open_now_clause
+from services.catalog_paging import encode_cursor
+from services.restaurant_hours_util import APP_TZ
+
+NOW = datetime(2026, 10, 12, 13, 0, tzinfo=APP_TZ)  # a Monday
+OPEN, UNKNOWN, CLOSED, HOURS = uuid4(), uuid4(), uuid4(), uuid4()
+
+
+def _engine():
+    """restaurants and restaurant_hours, reduced to the columns the open-now clause reads."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE restaurants (id CHAR(32) PRIMARY KEY, name TEXT, is_open BOOLEAN)")
+        conn.exec_driver_sql(
+            "CREATE TABLE restaurant_hours (id CHAR(32) PRIMARY KEY, restaurant_id CHAR(32),"
+            " day_of_week INTEGER, open_time TIME, close_time TIME, is_closed BOOLEAN)"
+        )
+        for id_, name, is_open in (
+            (OPEN, "Amala Spot", True),
+            (UNKNOWN, "Bukka Hut", None),
+            (CLOSED, "Chop Bar", False),
+            (HOURS, "Dodo Place", None),
+        ):
+            conn.exec_driver_sql("INSERT INTO restaurants VALUES (?, ?, ?)", (id_.hex, name, is_open))
+        conn.exec_driver_sql(
+            "INSERT INTO restaurant_hours VALUES (?, ?, ?, ?, ?, 0)",
+            (uuid4().hex, HOURS.hex, NOW.weekday(), time(9).isoformat("microseconds"), time(21).isoformat("microseconds")),
+        )
+    return engine
+
+
+def test_restaurant_without_hours_or_is_open_is_not_open():
+    with _engine().connect() as conn:
+        rows = conn.execute(select(Restaurant.name, _open_now_clause(NOW)).order_by(Restaurant.name)).all()
+    assert rows == [("Amala Spot", True), ("Bukka Hut", False), ("Chop Bar", False), ("Dodo Place", True)]
+
+
+def test_open_first_cursor_pages_reach_every_restaurant():
+    open_expr = _open_now_clause(NOW)
+    seen, cursor = [], None
+    with _engine().connect() as conn:
+        while True:
+            query = select(Restaurant.id, Restaurant.name, open_expr).order_by(
+                open_expr.desc(), Restaurant.name, Restaurant.id
+            )
+            query = _after_cursor(query, Restaurant.name, Restaurant.id, cursor, open_expr=open_expr)
+            row = conn.execute(query.limit(1)).first()
+            if row is None:
+                break
+            seen.append(row.name)
+            cursor = encode_cursor(bool(row[2]), row.name, row.id)
+    assert seen == ["Amala Spot", "Dodo Place", "Bukka Hut", "Chop Bar"]
+
@@ -0,0 +1,33 @@
+import random
+from datetime import datetime, time, timedelta
+
+from services.restaurant_hours_util import (
+    APP_TZ,
+    HoursRow,
+    ScheduleBatch,
+    compute_hours_display,
+)
+
+
+def _random_hours(rng: random.Random) -> list[HoursRow]:
+    rows = []
+    for day in rng.sample(range(7), rng.randint(0, 7)):
+        open_t = time(rng.randrange(24), rng.choice((0, 30))) if rng.random() > 0.1 else None
+        close_t = time(rng.randrange(24), rng.choice((0, 30))) if rng.random() > 0.1 else None
+        rows.append(HoursRow(day, open_t, close_t, rng.random() < 0.2))
+    return rows
+
+
+def test_batch_display_matches_per_restaurant_display():
+    rng = random.Random(5)
+    hours = [_random_hours(rng) for _ in range(300)]
+    fallback = [rng.choice((True, False, None)) for _ in hours]
+    batch = ScheduleBatch(hours, fallback)
+    start = datetime(2026, 10, 12, tzinfo=APP_TZ)  # a Monday
+    for _ in range(200):
+        now = start + timedelta(minutes=rng.randrange(7 * 24 * 60))
+        expected = [
+            compute_hours_display(rows, fallback_is_open=f, now=now)
+            for rows, f in zip(hours, fallback)
+        ]
+        assert batch.display(now) == expected